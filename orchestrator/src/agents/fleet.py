@@ -12,28 +12,36 @@ META_DEPARTMENTS = {
     "Revenue_Systems": 100          # Fintech Architects, Pricing Game Theorists
 }
 
-def generate_grand_fleet() -> List[AgentConfig]:
-    fleet = []
-    
+class FleetEntry:
+    """
+    One unit of the fleet. The id is known up front, so cells can be partitioned and agents
+    looked up without building anything; the AgentConfig is only built by config().
+    """
+    __slots__ = ("id", "department", "number")
+
+    def __init__(self, department: str, number: int):
+        self.id = f"agent_{department.lower()}_{number}"
+        self.department = department
+        self.number = number
+
+    def config(self) -> AgentConfig:
+        # Deterministic hash for identity verification
+        identity_hash = hashlib.sha256(self.id.encode()).hexdigest()[:8]
+        return AgentConfig(
+            id=self.id,
+            name=f"{self.department} Specialist Unit {self.number}",
+            role=f"Deep Specialization {self.number} in {self.department}",
+            description=f"Unit {identity_hash} of the {self.department} Grand Fleet.",
+            system_prompt=f"You are Sovereign Unit {identity_hash}. Mission: Hyper-specialized execution in {self.department}.",
+            allowed_tool_ids=["universal_action_multiplexer"],
+            handoff_targets=["forge_orchestrator"],
+            governance_level="critical"
+        )
+
+def fleet_manifest() -> List[FleetEntry]:
     # Core Expert Base (from previous 100)
     # Plus new programmatically generated specializations
-    for meta_dept, count in META_DEPARTMENTS.items():
-        for i in range(count):
-            # Unique Specialization Generation
-            spec_name = f"{meta_dept}_{i+1}"
-            agent_id = f"agent_{meta_dept.lower()}_{i+1}"
-            
-            # Deterministic hash for identity verification
-            identity_hash = hashlib.sha256(agent_id.encode()).hexdigest()[:8]
-            
-            fleet.append(AgentConfig(
-                id=agent_id,
-                name=f"{meta_dept} Specialist Unit {i+1}",
-                role=f"Deep Specialization {i+1} in {meta_dept}",
-                description=f"Unit {identity_hash} of the {meta_dept} Grand Fleet.",
-                system_prompt=f"You are Sovereign Unit {identity_hash}. Mission: Hyper-specialized execution in {meta_dept}.",
-                allowed_tool_ids=["universal_action_multiplexer"],
-                handoff_targets=["forge_orchestrator"],
-                governance_level="critical"
-            ))
-    return fleet
+    return [FleetEntry(meta_dept, i + 1) for meta_dept, count in META_DEPARTMENTS.items() for i in range(count)]
+
+def generate_grand_fleet() -> List[AgentConfig]:
+    return [entry.config() for entry in fleet_manifest()]
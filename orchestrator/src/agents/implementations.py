@@ -6,10 +6,10 @@ from orchestrator.src.validation.schemas import AgentConfig
 # For now, the configuration-driven Agent class in core/agent.py suffices.
 
 class ProjectManagerAgent(Agent):
-    pass
+    __slots__ = ()
 
 class DeveloperAgent(Agent):
-    pass
+    __slots__ = ()
 
 class DevOpsAgent(Agent):
-    pass
+    __slots__ = ()
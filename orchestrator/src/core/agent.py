@@ -1,78 +1,188 @@
-from typing import List, Dict, Any, Optional
-import json
+from typing import List, Dict, Any, Optional, AsyncIterator, Tuple, Union
+import asyncio
 import hashlib
 from datetime import datetime
 from orchestrator.src.validation.schemas import AgentConfig, TaskSpec, ToolInvocation
 from orchestrator.src.tools.base import BaseTool
+from orchestrator.src.tools.registry import ToolRegistry
 from orchestrator.src.memory.vector_store import VectorStore
-from orchestrator.src.core.llm_provider import BaseLLMProvider
+from orchestrator.src.core.llm_provider import BaseLLMProvider, MockResponse
+from orchestrator.src.core.plan_cache import PlanCache
+from orchestrator.src.core.plan_dag import execute_steps
+from orchestrator.src.core.plan_parser import parse_plan, PlanParseError
+from orchestrator.src.core.prompt_builder import PromptBuilder
+from orchestrator.src.core.tokenizer import count_tokens
+from orchestrator.src.core.config import settings
 from orchestrator.src.logging.logger import get_logger
 
 logger = get_logger(__name__)
 
 class Agent:
-    def __init__(self, config: AgentConfig, tools: List[BaseTool], memory: VectorStore, llm_provider: BaseLLMProvider):
+    # A fleet holds a thousand of these: slots keep each one to its own state, and the
+    # tools (with everything derived from them) live in a ToolRegistry shared by all
+    __slots__ = ("config", "tools", "memory", "llm_provider", "plan_cache", "history", "token_usage")
+
+    def __init__(
+        self,
+        config: AgentConfig,
+        tools: Union[ToolRegistry, List[BaseTool]],
+        memory: VectorStore,
+        llm_provider: BaseLLMProvider,
+        plan_cache: Optional[PlanCache] = None
+    ):
         self.config = config
-        self.tools = {t.config.tool_id: t for t in tools}
+        self.tools = tools if isinstance(tools, ToolRegistry) else ToolRegistry(tools)
         self.memory = memory
         self.llm_provider = llm_provider
+        self.plan_cache = plan_cache
         self.history: List[Dict[str, str]] = []
+        self.token_usage = {"calls": 0, "prompt_tokens": 0, "completion_tokens": 0, "snippets_dropped": 0, "duplicates": 0}
 
-    def process_task(self, task: TaskSpec) -> Dict[str, Any]:
+    def process_task(self, task: TaskSpec, model: Optional[str] = None) -> Dict[str, Any]:
+        """`model` picks the planning model (a tier's); None uses the provider's default."""
         logger.info(f"Agent {self.config.name} processing task: {task.description}")
         
         try:
             # 1. RAG Context Injection
-            context_docs = self.memory.search(task.description, limit=3)
-            context_text = "\n".join([f"- {doc['text']}" for doc in context_docs]) if context_docs else "No specific context found."
-            
-            # Record this task in RAG for future recursive learning
-            self.memory.add(f"Task: {task.description}", {"agent": self.config.id, "type": "task_log"})
+            context = self._recall(task)
 
             # 2. Formulate plan with injected context
-            plan = self._call_llm(task.description, context_text)
-            reasoning = plan.get("reasoning", "Executing swarm logic...")
+            plan = self._call_llm(task.description, context, model)
             
             # 3. Execute tools based on plan
-            results = []
-            for step in plan.get("steps", []):
-                tool_id = step.get("tool_id")
-                if tool_id in self.tools:
-                    invocation = ToolInvocation(
-                        tool_id=tool_id,
-                        agent_id=self.config.id,
-                        input_data=step.get("inputs", {})
-                    )
-                    result = self.tools[tool_id].run(invocation)
-                    
-                    # Cryptographic Integrity: Hash the output
-                    result_data = result.model_dump_json()
-                    result.integrity_hash = hashlib.sha256(result_data.encode()).hexdigest()
-                    
-                    results.append(result.model_dump(mode="json"))
-                else:
-                    if tool_id:
-                        logger.warning(f"Tool {tool_id} not found or allowed for {self.config.name}")
-
-            return {
-                "status": "completed", 
-                "results": results, 
-                "reasoning": reasoning,
-                "agent_id": self.config.id,
-                "timestamp": datetime.utcnow().isoformat()
-            }
+            results, timings = self._execute_plan(plan)
+            return self._completed(plan, results, timings)
+        except Exception as e:
+            logger.error(f"Agent {self.config.name} failed task: {e}")
+            return {"status": "failed", "error": str(e), "agent_id": self.config.id}
+
+    async def aprocess_task(self, task: TaskSpec, model: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Same pipeline as process_task for event-loop callers. The LLM round trip is awaited;
+        only the short local steps (memory, tool execution) borrow a worker thread.
+        """
+        logger.info(f"Agent {self.config.name} processing task: {task.description}")
+
+        try:
+            context = await asyncio.to_thread(self._recall, task)
+            plan = await self._acall_llm(task.description, context, model)
+            results, timings = await asyncio.to_thread(self._execute_plan, plan)
+            return self._completed(plan, results, timings)
         except Exception as e:
             logger.error(f"Agent {self.config.name} failed task: {e}")
             return {"status": "failed", "error": str(e), "agent_id": self.config.id}
 
-    def _call_llm(self, prompt: str, context: str) -> Dict[str, Any]:
-        # Build Tool Definition Block
-        tools_desc = "\n".join([f"- {t.config.tool_id}: {t.config.description}" for t in self.tools.values()])
+    async def astream_task(self, task: TaskSpec, model: Optional[str] = None) -> AsyncIterator[Dict[str, Any]]:
+        """
+        aprocess_task with the plan streamed as it is written: yields {"status": "token", "delta": ...}
+        per completion chunk, {"status": "executing", ...} once the plan is parsed, and finally
+        {"status": "result", "result": ...} holding what aprocess_task would have returned.
+        """
+        logger.info(f"Agent {self.config.name} streaming task: {task.description}")
+
+        try:
+            context = await asyncio.to_thread(self._recall, task)
+            plan = self._cached_plan(task.description)
+            if plan is None:
+                chunks: List[str] = []
+                async for delta in self.llm_provider.astream_response(self._plan_messages(task.description, context, model), model=model):
+                    chunks.append(delta)
+                    yield {"status": "token", "delta": delta, "agent_id": self.config.id}
+                response_text = "".join(chunks)
+                if chunks and isinstance(chunks[0], MockResponse):
+                    response_text = MockResponse(response_text)
+                plan = self._planned(task.description, response_text)
+            yield {"status": "executing", "steps": len(plan.get("steps", [])), "agent_id": self.config.id}
+            results, timings = await asyncio.to_thread(self._execute_plan, plan)
+            result = self._completed(plan, results, timings)
+        except Exception as e:
+            logger.error(f"Agent {self.config.name} failed task: {e}")
+            result = {"status": "failed", "error": str(e), "agent_id": self.config.id}
+        yield {"status": "result", "result": result}
+
+    def _recall(self, task: TaskSpec) -> List[str]:
+        """Memory snippets for the task, best match first. The prompt builder decides how many fit."""
+        context_docs = self.memory.search(task.description, limit=settings.LLM_CONTEXT_SNIPPETS)
         
+        # Record this task in RAG for future recursive learning
+        self.memory.add(f"Task: {task.description}", {"agent": self.config.id, "type": "task_log"})
+        return [doc["text"] for doc in context_docs]
+
+    def _execute_plan(self, plan: Dict[str, Any]) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+        """Results in plan order and step timings. Steps declaring `depends_on` run concurrently where independent."""
+        return execute_steps(plan.get("steps", []), self._run_step)
+
+    def _run_step(self, step: Dict[str, Any], failed_dependencies: List[str]) -> Optional[Dict[str, Any]]:
+        tool_id = step.get("tool_id")
+        if tool_id not in self.tools:
+            if tool_id:
+                logger.warning(f"Tool {tool_id} not found or allowed for {self.config.name}")
+            return None
+        invocation = ToolInvocation(
+            tool_id=tool_id,
+            agent_id=self.config.id,
+            input_data=step.get("inputs", {})
+        )
+        if failed_dependencies:
+            invocation.status = "failure"
+            invocation.error_message = f"Skipped: depends on failed step(s) {', '.join(failed_dependencies)}"
+            result = invocation
+        else:
+            result = self.tools[tool_id].run(invocation)
+
+        # Cryptographic Integrity: Hash the output
+        result_data = result.model_dump_json()
+        result.integrity_hash = hashlib.sha256(result_data.encode()).hexdigest()
+        return result.model_dump(mode="json")
+
+    def _completed(self, plan: Dict[str, Any], results: List[Dict[str, Any]], timings: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        completed = {
+            "status": "completed", 
+            "results": results, 
+            "reasoning": plan.get("reasoning", "Executing swarm logic..."),
+            "agent_id": self.config.id,
+            "timestamp": datetime.utcnow().isoformat()
+        }
+        if timings is not None:
+            completed["timings"] = timings
+        return completed
+
+    def _call_llm(self, prompt: str, context: List[str], model: Optional[str] = None) -> Dict[str, Any]:
+        plan = self._cached_plan(prompt)
+        if plan is not None:
+            return plan
+        response_text = self.llm_provider.generate_response(self._plan_messages(prompt, context, model), model=model)
+        return self._planned(prompt, response_text)
+
+    async def _acall_llm(self, prompt: str, context: List[str], model: Optional[str] = None) -> Dict[str, Any]:
+        plan = self._cached_plan(prompt)
+        if plan is not None:
+            return plan
+        response_text = await self.llm_provider.agenerate_response(self._plan_messages(prompt, context, model), model=model)
+        return self._planned(prompt, response_text)
+
+    @property
+    def plan_scope(self) -> str:
+        return self.tools.scope
+
+    def _cached_plan(self, prompt: str) -> Optional[Dict[str, Any]]:
+        if self.plan_cache is None or not settings.LLM_PLAN_CACHE_ENABLED:
+            return None
+        return self.plan_cache.get(self.plan_scope, prompt)
+
+    def _planned(self, prompt: str, response_text: str) -> Dict[str, Any]:
+        """Parses a fresh plan and caches it, unless it is mock output or failed to parse."""
+        self.token_usage["completion_tokens"] += count_tokens(response_text)
+        plan = self._parse_plan(response_text)
+        if self.plan_cache is not None and not isinstance(response_text, MockResponse) and plan.get("steps"):
+            self.plan_cache.put(self.plan_scope, prompt, plan)
+        return plan
+
+    def _plan_messages(self, prompt: str, context: List[str], model: Optional[str] = None) -> List[Dict[str, str]]:
         system_msg = f"""{self.config.system_prompt}
 
 You have access to the following tool IDs:
-{tools_desc}
+{self.tools.catalog}
 
 RULES:
 1. If the user asks to create a file or project, YOU MUST use the 'file' tool.
@@ -84,41 +194,27 @@ RULES:
   "reasoning": "explanation of plan",
   "steps": [
     {{
+      "id": "short_step_name",
       "tool_id": "tool_id_from_list_above",
-      "inputs": {{ "param_name": "value" }}
+      "inputs": {{ "param_name": "value" }},
+      "depends_on": ["ids of steps that must finish first"]
     }}
   ]
 }}
-
-Context:
-{context}"""
+6. Steps with an empty depends_on run in parallel; only list the steps whose output a step really needs."""
         
         user_msg = f"Task: {prompt}"
-        
-        messages = [
-            {"role": "system", "content": system_msg},
-            {"role": "user", "content": user_msg}
-        ]
-        
-        response_text = self.llm_provider.generate_response(messages)
-        
+
+        # Context goes last in the system message, trimmed to the model's budget
+        messages, report = PromptBuilder(model=model or getattr(self.llm_provider, "default_model", None)).build(system_msg, user_msg, context)
+        self.token_usage["calls"] += 1
+        for key in ("prompt_tokens", "snippets_dropped", "duplicates"):
+            self.token_usage[key] += report[key]
+        return messages
+
+    def _parse_plan(self, response_text: str) -> Dict[str, Any]:
         try:
-            # Robust JSON extraction
-            # Find the first { and last }
-            start_idx = response_text.find('{')
-            end_idx = response_text.rfind('}')
-            
-            if start_idx != -1 and end_idx != -1 and end_idx > start_idx:
-                json_str = response_text[start_idx : end_idx + 1]
-                return json.loads(json_str)
-            else:
-                # Basic cleanup in case of markdown blocks if not caught above
-                if "```json" in response_text:
-                    response_text = response_text.split("```json")[1].split("```")[0].strip()
-                elif "```" in response_text:
-                    response_text = response_text.split("```")[1].split("```")[0].strip()
-                    
-                return json.loads(response_text)
-        except Exception as e:
+            return parse_plan(response_text)
+        except PlanParseError as e:
             logger.error(f"Failed to parse LLM response as JSON: {e}. Raw: {response_text}")
             return {"steps": [], "reasoning": "Failed to parse plan."}
@@ -0,0 +1,81 @@
+from typing import List, Dict, Any, Optional, Callable, Iterator, Sequence, Mapping, Tuple
+import threading
+from orchestrator.src.core.agent import Agent
+
+class AgentPool(Sequence[Agent]):
+    """
+    A cell's agents, each built on first use. The pool holds one entry per agent (anything
+    with an `id`, e.g. a FleetEntry) and hands it to `factory` the first time that agent is
+    indexed, so an idle unit costs a list slot rather than an Agent and its config.
+    """
+    __slots__ = ("entries", "_factory", "_agents", "_index", "_lock")
+
+    def __init__(self, entries: Sequence[Any], factory: Optional[Callable[[Any], Agent]]):
+        self.entries = list(entries)
+        self._factory = factory
+        self._agents: List[Optional[Agent]] = [None] * len(self.entries)
+        self._index: Optional[Dict[str, int]] = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def of(cls, agents: Sequence[Agent]) -> "AgentPool":
+        """A pool over agents that already exist."""
+        pool = cls([agent.config for agent in agents], None)
+        pool._agents = list(agents)
+        return pool
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        agent = self._agents[index]
+        if agent is None:
+            with self._lock:
+                agent = self._agents[index]
+                if agent is None:
+                    agent = self._agents[index] = self._factory(self.entries[index])
+        return agent
+
+    def index_of(self, agent_id: str) -> Optional[int]:
+        if self._index is None:
+            self._index = {entry.id: i for i, entry in enumerate(self.entries)}
+        return self._index.get(agent_id)
+
+    def materialized(self) -> List[Agent]:
+        """The agents built so far; the rest have no state worth reporting."""
+        return [agent for agent in self._agents if agent is not None]
+
+class AgentDirectory(Mapping[str, Agent]):
+    """Read-only agent_id -> Agent view over the cells' pools. Looking an agent up builds it."""
+
+    def __init__(self, pools: Sequence[AgentPool]):
+        self.pools = list(pools)
+
+    def _locate(self, agent_id: str) -> Tuple[Optional[AgentPool], Optional[int]]:
+        for pool in self.pools:
+            index = pool.index_of(agent_id)
+            if index is not None:
+                return pool, index
+        return None, None
+
+    def __getitem__(self, agent_id: str) -> Agent:
+        pool, index = self._locate(agent_id)
+        if pool is None:
+            raise KeyError(agent_id)
+        return pool[index]
+
+    def __contains__(self, agent_id: object) -> bool:
+        return isinstance(agent_id, str) and self._locate(agent_id)[0] is not None
+
+    def __iter__(self) -> Iterator[str]:
+        for pool in self.pools:
+            for entry in pool.entries:
+                yield entry.id
+
+    def __len__(self) -> int:
+        return sum(len(pool) for pool in self.pools)
+
+    def materialized(self) -> Dict[str, Agent]:
+        return {agent.config.id: agent for pool in self.pools for agent in pool.materialized()}
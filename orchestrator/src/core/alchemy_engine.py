@@ -1,56 +1,84 @@
 import os
 import json
 import re
+import asyncio
 import hashlib
 from datetime import datetime
+from orchestrator.src.core.config import settings
+from orchestrator.src.core.blog.dedupe import get_duplicate_index, report_substance
+from orchestrator.src.core.blog.index import get_post_index, shard_for
+from orchestrator.src.core.blog.render import get_render_cache
+from orchestrator.src.core.blog.search import get_search_index
 from orchestrator.src.logging.logger import get_logger
 
 logger = get_logger(__name__)
 
-def parse_markdown_metadata(content: str) -> dict:
-    """Extracts yaml-like frontmatter from markdown strings."""
-    meta = {}
-    match = re.search(r'---\s+(.*?)\s+---', content, re.DOTALL)
-    if match:
-        lines = match.group(1).split('\n')
-        for line in lines:
-            if ':' in line:
-                k, v = line.split(':', 1)
-                meta[k.strip()] = v.strip().strip('"')
-    return meta
-
 def get_all_posts(blog_dir: str = "data/blog"):
-    posts = []
-    if not os.path.exists(blog_dir): return posts
-    
-    for filename in os.listdir(blog_dir):
-        if filename.endswith(".md"):
-            with open(os.path.join(blog_dir, filename), 'r', encoding='utf-8') as f:
-                content = f.read()
-                meta = parse_markdown_metadata(content)
-                posts.append({
-                    "slug": filename.replace(".md", ""),
-                    "title": meta.get("title", filename),
-                    "date": meta.get("date", "2026-02-20"),
-                    "summary": meta.get("summary", "Autonomous report."),
-                    "tags": meta.get("tags", [])
-                })
-    return sorted(posts, key=lambda x: x['date'], reverse=True)
-
-def generate_autonomous_blog_post(task_result: dict, image_url: str = None):
-    blog_dir = "data/blog"
+    """Newest-first post metadata, served from the persistent post index."""
+    return get_post_index(blog_dir).list()
+
+MAX_SLUG_SUFFIX = 100
+
+def _write_post_atomic(blog_dir: str, shard: str, base_slug: str, content: str, taken=None) -> tuple:
+    """
+    Writes a new post into its `YYYY/MM` shard and returns (slug, relative path).
+
+    The fully written temp file is hard-linked into place, so readers see either no post
+    or the whole post, and an existing post is never replaced: if the name is taken (by
+    this or another process, or per `taken`), `-2`, `-3`, ... are tried instead.
+    """
+    shard_dir = os.path.join(blog_dir, shard)
+    os.makedirs(shard_dir, exist_ok=True)
+    tmp_path = os.path.join(shard_dir, f".{base_slug}.{os.getpid()}.md.tmp")
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(content)
+        f.flush()
+        os.fsync(f.fileno())
+    try:
+        for n in range(1, MAX_SLUG_SUFFIX + 1):
+            slug = base_slug if n == 1 else f"{base_slug}-{n}"
+            if taken and taken(slug):
+                continue
+            try:
+                os.link(tmp_path, os.path.join(shard_dir, f"{slug}.md"))
+                return slug, f"{shard}/{slug}.md"
+            except FileExistsError:
+                continue
+        raise FileExistsError(f"No free slug for {base_slug} in {shard_dir}")
+    finally:
+        os.remove(tmp_path)
+
+def _merge_into_post(blog_dir: str, index, slug: str, agent_id: str, date: str):
+    """Folds a near-duplicate report into the published one as a dated corroboration note."""
+    rel_path = index.get(slug)["path"]
+    path = os.path.join(blog_dir, rel_path)
+    with open(path, 'r', encoding='utf-8') as f:
+        content = f.read()
+    content += f"\n## Corroborating Signal: {date}\n**{agent_id}** independently reached the same assessment.\n"
+    tmp_path = os.path.join(os.path.dirname(path), f".{slug}.md.tmp")
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(content)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+    index.upsert(slug, rel_path)
+
+def generate_autonomous_blog_post(task_result: dict, image_url: str = None, blog_dir: str = "data/blog"):
     os.makedirs(blog_dir, exist_ok=True)
-    slug = f"report-{datetime.utcnow().strftime('%Y%m%d-%H%M%S')}"
+    now = datetime.utcnow()
+    base_slug = f"report-{now.strftime('%Y%m%d-%H%M%S')}"
+    date = now.strftime('%Y-%m-%d')
     
     agent_id = task_result.get('agent_id', 'TITAN_CORE_1')
     reasoning = task_result.get('reasoning', 'Sovereign Matrix operations are proceeding within expected parameters.')
     
     image_section = f"![Neural Visualization]({image_url})" if image_url else ""
+    quoted_reasoning = "\n".join(f"> {line}" for line in reasoning.splitlines()) or ">"
     
     # Structure a more "Platinum" looking report
     content = f"""---
 title: "Neural Pulse: {agent_id.replace('_', ' ').upper()}"
-date: "{datetime.utcnow().strftime('%Y-%m-%d')}"
+date: "{date}"
 summary: "{reasoning[:120]}..."
 tags: ["autonomous", "intelligence", "matrix"]
 ---
@@ -63,7 +91,7 @@ tags: ["autonomous", "intelligence", "matrix"]
 The Sovereign Matrix has completed a high-level recursive scan. This report details the architectural insights captured during the most recent swarm iteration.
 
 ## Architectural Reasoning
-> {reasoning}
+{quoted_reasoning}
 
 ## Core Observations
 1. **Symmetry Check**: System integrity remains at 99.9% across all 1000 specialized units.
@@ -86,16 +114,48 @@ Bypass the waitlist. Secure your Sovereign assets immediately:
         for p in products:
             # Handle both ProductSchema and dict types
             p_data = p.model_dump() if hasattr(p, "model_dump") else p
-            link = p_data.get("checkout_url", f"/api/checkout/session?priceId={p_data.get('id')}")
-            content += f"- **[{p_data['name']} (${p_data['price']})]({link})**: {p_data['description']}\n"
+            # DB products carry these keys as None: fall back rather than print "None"
+            link = p_data.get("checkout_url") or f"/api/checkout/session?priceId={p_data.get('id')}"
+            price = p_data.get("price")
+            if price is None and p_data.get("prices"):
+                price = p_data["prices"][0]["price"]
+            label = f"{p_data['name']} (${price})" if price is not None else p_data["name"]
+            content += f"- **[{label}]({link})**: {p_data.get('description') or ''}\n"
     except Exception as e:
         content += "\n*Market uplink temporarily unavailable.*\n"
 
-    content += """
+    content += f"""
 ---
 *Generated by TITAN ORCHESTRATOR.*
 *Hash: {hashlib.sha256(reasoning.encode()).hexdigest()[:16]}*
 """
-    with open(os.path.join(blog_dir, f"{slug}.md"), 'w', encoding='utf-8') as f:
-        f.write(content)
+    index = get_post_index(blog_dir)
+    duplicates = get_duplicate_index(blog_dir)
+    substance = report_substance(quoted_reasoning)
+    policy = settings.BLOG_DUPLICATE_POLICY
+    with index.lock:
+        match = duplicates.find_duplicate(substance, settings.BLOG_DUPLICATE_THRESHOLD) if policy != "publish" else None
+        if match and policy == "skip":
+            logger.info(f"Report skipped: near-duplicate of {match[0]} (similarity {match[1]:.2f})")
+            return match[0]
+        if match:
+            slug = match[0]
+            _merge_into_post(blog_dir, index, slug, agent_id, date)
+            logger.info(f"Report merged into {slug} (similarity {match[1]:.2f})")
+        else:
+            slug, path = _write_post_atomic(blog_dir, shard_for(date), base_slug, content, taken=lambda s: index.get(s) is not None)
+            index.upsert(slug, path)
+        duplicates.add_post(slug, substance)
+    try:
+        get_render_cache(blog_dir).render(slug)
+    except Exception as e:
+        logger.warning(f"Pre-render skipped for {slug}: {e}")
+    try:
+        get_search_index(blog_dir).add_post(slug)
+    except Exception as e:
+        logger.warning(f"Search indexing deferred for {slug}: {e}")
     return slug
+
+async def publish_autonomous_blog_post(task_result: dict, image_url: str = None, blog_dir: str = "data/blog") -> str:
+    """Publishing stage for async callers: file I/O and the catalog lookup run off the event loop."""
+    return await asyncio.to_thread(generate_autonomous_blog_post, task_result, image_url, blog_dir)
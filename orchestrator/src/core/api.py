@@ -1,15 +1,20 @@
-from fastapi import FastAPI, WebSocket, WebSocketDisconnect, HTTPException, Request, Depends, Security
+from fastapi import FastAPI, WebSocket, WebSocketDisconnect, HTTPException, Request, Depends, Security, Query
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response, StreamingResponse
 from fastapi.security import APIKeyHeader
 from fastapi.staticfiles import StaticFiles
-from orchestrator.src.core.orchestrator import Orchestrator
+from orchestrator.src.core.orchestrator import get_orchestrator
 from orchestrator.src.core.config import settings
-from orchestrator.src.core.alchemy_engine import get_all_posts, generate_autonomous_blog_post
+from orchestrator.src.core.alchemy_engine import get_all_posts, publish_autonomous_blog_post
+from orchestrator.src.core.blog.index import get_post_index
+from orchestrator.src.core.blog.render import get_render_cache
+from orchestrator.src.core.blog.search import get_search_index
 from orchestrator.src.core.catalog.api import catalog_api
+from orchestrator.src.core.catalog.index import checkout_mode
 from orchestrator.src.core.voice.router import VoiceRouter
 from orchestrator.src.core.voice.mock_adapters import MockSTTAdapter, MockTTSAdapter
 from orchestrator.src.core.licensing import license_manager
+from orchestrator.src.tools.result_cache import get_tool_cache
 from orchestrator.src.logging.logger import get_logger
 from orchestrator.src.validation.schemas import TaskSpec
 import asyncio
@@ -20,6 +25,7 @@ import os
 import hashlib
 import stripe
 from datetime import datetime
+from typing import Optional
 
 logger = get_logger(__name__)
 
@@ -68,7 +74,7 @@ async def skip_ngrok_warning(request: Request, call_next):
     return response
 
 # Shared Core Instances
-orchestrator = Orchestrator()
+orchestrator = get_orchestrator()
 voice_router = VoiceRouter(orchestrator, orchestrator.stt, orchestrator.tts)
 
 activity_log = []
@@ -123,7 +129,7 @@ async def autonomous_loop():
                                 if results:
                                     img_url = results[0].get("output_data", {}).get("url")
                         
-                        slug = generate_autonomous_blog_post(final_result, image_url=img_url) 
+                        slug = await publish_autonomous_blog_post(final_result, image_url=img_url)
                         log_activity("TITAN_ORCHESTRATOR", "CONTENT_GEN", f"Published Blog: {slug}")
 
             except Exception as e:
@@ -157,6 +163,11 @@ async def startup_event():
     asyncio.create_task(log_heartbeat())
     asyncio.create_task(autonomous_loop())
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    # Release pooled keep-alive connections to the LLM API
+    await orchestrator.llm_provider.aclose()
+
 # --- SERVICES ---
 class LeadDeliveryService:
     def __init__(self):
@@ -205,6 +216,14 @@ async def integrations():
 async def get_stats():
     return telemetry_data
 
+@app.get("/api/telemetry/llm")
+async def get_llm_stats():
+    return {**orchestrator.llm_provider.stats(), "tokens": orchestrator.get_token_usage(), "routing": orchestrator.classifier.stats(), "plans": orchestrator.plan_cache.stats()}
+
+@app.get("/api/telemetry/tools")
+async def get_tool_stats():
+    return get_tool_cache().stats()
+
 @app.get("/api/activity")
 async def get_activity():
     return activity_log
@@ -230,24 +249,87 @@ async def capture_lead(request: Request):
     return {"status": "captured", "message": "Directive transmitted.", "guide_url": delivery_result["asset_url"]}
 
 @app.get("/products")
-async def get_products():
-    products = catalog_api.get_products()
+async def get_products(
+    category: Optional[str] = None,
+    min_price: Optional[float] = Query(None, alias="min"),
+    max_price: Optional[float] = Query(None, alias="max")
+):
+    if category or min_price is not None or max_price is not None:
+        products = catalog_api.query_products(category=category, min_price=min_price, max_price=max_price)
+    else:
+        products = catalog_api.get_products()
     return [p.model_dump() if hasattr(p, "model_dump") else p for p in products]
 
+@app.get("/products/{product_id}")
+async def get_product(product_id: str):
+    product = catalog_api.index.get(product_id)
+    if not product:
+        raise HTTPException(status_code=404, detail=f"Unknown product: {product_id}")
+    return product.model_dump()
+
+@app.get("/api/blog")
+async def list_blog_posts(
+    cursor: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=100),
+    tag: Optional[str] = None,
+    since: Optional[str] = None
+):
+    try:
+        return get_post_index().page(cursor=cursor, limit=limit, tag=tag, since=since)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@app.get("/api/blog/search")
+async def search_blog_posts(q: str = Query(..., min_length=1), limit: int = Query(10, ge=1, le=50)):
+    started = time.perf_counter()
+    # search() syncs the index first, which re-reads changed posts: keep that off the event loop
+    results = await asyncio.to_thread(get_search_index().search, q, limit=limit)
+    return {"query": q, "results": results, "took_ms": round((time.perf_counter() - started) * 1000, 3)}
+
+@app.get("/api/blog/{slug}")
+async def get_blog_post(slug: str):
+    # File reads and markdown rendering stay off the event loop
+    post = await asyncio.to_thread(get_post_index().read, slug)
+    if not post:
+        raise HTTPException(status_code=404, detail=f"Unknown post: {slug}")
+    rendered = await asyncio.to_thread(get_render_cache().render, slug)
+    if rendered:
+        post["reading_time"] = rendered[0]["reading_time"]
+        post["toc"] = rendered[0]["toc"]
+    return post
+
+@app.get("/api/blog/{slug}/html")
+async def get_blog_post_html(slug: str, request: Request):
+    rendered = await asyncio.to_thread(get_render_cache().render, slug)
+    if not rendered:
+        raise HTTPException(status_code=404, detail=f"Unknown post: {slug}")
+    sidecar, body = rendered
+    etag = f'"{sidecar["hash"]}"'
+    headers = {"ETag": etag, "X-Reading-Time": str(sidecar["reading_time"])}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="text/html; charset=utf-8", headers=headers)
+
 @app.post("/api/checkout/session")
 async def checkout(request: Request):
     data = await request.json()
     price_id = data.get("priceId") 
     email = data.get("email", "anonymous@sovereign.ai")
+    resolved = catalog_api.resolve_price(price_id)
+    if not resolved:
+        raise HTTPException(status_code=404, detail=f"Unknown priceId: {price_id}")
+    product, price = resolved
     if not settings.STRIPE_API_KEY or settings.STRIPE_API_KEY == "placeholder":
-        provision_license(email, price_id)
+        provision_license(email, product.id)
         return {"url": f"{settings.FRONTEND_URL}/success"}
+    if not price.stripe_price_id or price.stripe_price_id == "pending":
+        raise HTTPException(status_code=409, detail=f"Product {product.id} has no live Stripe price")
     try:
         stripe.api_key = settings.STRIPE_API_KEY
         checkout_session = stripe.checkout.Session.create(
             customer_email=email,
-            line_items=[{'price': price_id, 'quantity': 1}],
-            mode='subscription' if "price" in price_id else 'payment',
+            line_items=[{'price': price.stripe_price_id, 'quantity': 1}],
+            mode=checkout_mode(price),
             success_url=f"{settings.FRONTEND_URL}/success?session_id={{CHECKOUT_SESSION_ID}}",
             cancel_url=f"{settings.FRONTEND_URL}/cancel",
         )
@@ -265,6 +347,19 @@ async def submit_task(request: Request):
         if step["status"] == "completed": result = step["result"]
     return {"status": "completed", "result": result}
 
+@app.get("/api/tasks/stream")
+async def stream_task(description: str = Query(..., min_length=1)):
+    """Server-sent events for one task: routing, plan tokens as they are generated, then the result. GET so EventSource can consume it."""
+    async def events():
+        async for step in orchestrator.submit_task_stream(description, "adhoc", stream=True):
+            yield f"event: {step['status']}\ndata: {json.dumps(step, default=str)}\n\n"
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
 @app.post("/api/admin/trigger-content")
 async def trigger_content(request: Request):
     task_desc = "Analyze AI market shifts."
@@ -272,7 +367,7 @@ async def trigger_content(request: Request):
     async for step in orchestrator.submit_task_stream(task_desc, "manual_trigger"):
         if step.get("status") == "completed": final_result = step.get("result", {})
     if final_result:
-        slug = generate_autonomous_blog_post(final_result)
+        slug = await publish_autonomous_blog_post(final_result)
         return {"status": "published", "slug": slug}
     return {"status": "failed"}
 
@@ -0,0 +1,154 @@
+import os
+import re
+import random
+import hashlib
+import numpy as np
+from typing import Dict, List, Any, Optional, Tuple
+from orchestrator.src.core.blog.frontmatter import split_frontmatter
+from orchestrator.src.core.blog.index import PostIndex
+from orchestrator.src.core.blog.incremental import IncrementalPostIndex, shared_index
+
+SNAPSHOT_VERSION = 1
+SHINGLE_SIZE = 3
+NUM_PERM = 64
+# 8 bands of 8 rows: pairs above ~0.77 Jaccard almost always share a bucket
+BANDS = 8
+ROWS = NUM_PERM // BANDS
+DEFAULT_THRESHOLD = 0.8
+
+_rng = random.Random(0x5EED)
+# Multiply-shift hash family, one (odd a, b) pair per permutation. Fixed seed: signatures
+# must stay comparable across processes and restarts.
+_A = np.array([_rng.getrandbits(64) | 1 for _ in range(NUM_PERM)], dtype=np.uint64)[:, None]
+_B = np.array([_rng.getrandbits(64) for _ in range(NUM_PERM)], dtype=np.uint64)[:, None]
+_SHIFT = np.uint64(32)
+_TOKEN_RE = re.compile(r'[a-z0-9]+')
+_QUOTE_RE = re.compile(r'^\s*>\s?(.*)$', re.M)
+
+def report_substance(body: str) -> str:
+    """
+    The part of a post worth comparing. Generated reports are one template around a quoted
+    reasoning block, so that block is the report; posts without quotes are compared whole.
+    """
+    quoted = _QUOTE_RE.findall(body)
+    return "\n".join(quoted) if quoted else body
+
+def shingles(text: str) -> set:
+    tokens = _TOKEN_RE.findall(text.lower())
+    if len(tokens) < SHINGLE_SIZE:
+        grams = {" ".join(tokens)} if tokens else set()
+    else:
+        grams = {" ".join(tokens[i:i + SHINGLE_SIZE]) for i in range(len(tokens) - SHINGLE_SIZE + 1)}
+    return {int.from_bytes(hashlib.blake2b(g.encode("utf-8"), digest_size=8).digest(), "little") for g in grams}
+
+def minhash(text: str) -> Tuple[int, ...]:
+    hashes = shingles(text)
+    if not hashes:
+        return ()
+    h = np.fromiter(hashes, dtype=np.uint64, count=len(hashes))
+    # uint64 arithmetic wraps, which is the mod 2^64 the hash family wants
+    return tuple(((_A * h + _B) >> _SHIFT).min(axis=1).tolist())
+
+def similarity(sig_a: Tuple[int, ...], sig_b: Tuple[int, ...]) -> float:
+    """Estimated Jaccard similarity of two signatures."""
+    if not sig_a or not sig_b:
+        return 0.0
+    return sum(1 for x, y in zip(sig_a, sig_b) if x == y) / NUM_PERM
+
+class DuplicateIndex(IncrementalPostIndex):
+    """
+    MinHash/LSH sketch index over post substance. A lookup hashes the candidate text once
+    and only compares signatures that share an LSH band, so its cost does not grow with
+    the number of posts.
+
+    Each post's payload is its signature; persistence and syncing come from IncrementalPostIndex.
+    """
+    LABEL = "Sketch"
+    STORE_SUFFIX = "sketches"
+    SNAPSHOT_VERSION = SNAPSHOT_VERSION
+    LOG_FIELD = "sig"
+
+    def __init__(self, post_index: Optional[PostIndex] = None, threshold: float = DEFAULT_THRESHOLD):
+        self.threshold = threshold
+        super().__init__(post_index)
+
+    def _reset(self):
+        super()._reset()
+        # slug -> {"stamp", "sig"}
+        self.sketches: Dict[str, Dict[str, Any]] = {}
+        self.buckets: List[Dict[Tuple[int, ...], set]] = [{} for _ in range(BANDS)]
+
+    @property
+    def records(self) -> Dict[str, Dict[str, Any]]:
+        return self.sketches
+
+    # --- persistence ---
+
+    def _snapshot_state(self) -> Dict[str, Any]:
+        return {"sketches": self.sketches}
+
+    def _restore(self, state: Dict[str, Any]):
+        for slug, sketch in state["sketches"].items():
+            self._apply_add(slug, sketch["stamp"], sketch["sig"])
+
+    def _encode(self, sig: Tuple[int, ...]) -> List[int]:
+        return list(sig)
+
+    def _decode(self, raw: List[int]) -> Tuple[int, ...]:
+        return tuple(raw)
+
+    # --- mutation ---
+
+    def _apply_add(self, slug: str, stamp: List[int], sig: Tuple[int, ...]):
+        self._apply_remove(slug)
+        self.sketches[slug] = {"stamp": stamp, "sig": sig}
+        if sig:
+            for band, key in enumerate(self._band_keys(sig)):
+                self.buckets[band].setdefault(key, set()).add(slug)
+
+    def _apply_remove(self, slug: str):
+        sketch = self.sketches.pop(slug, None)
+        if not sketch or not sketch["sig"]:
+            return
+        for band, key in enumerate(self._band_keys(sketch["sig"])):
+            bucket = self.buckets[band].get(key)
+            if bucket is not None:
+                bucket.discard(slug)
+                if not bucket:
+                    del self.buckets[band][key]
+
+    @staticmethod
+    def _band_keys(sig: Tuple[int, ...]) -> List[Tuple[int, ...]]:
+        return [sig[i * ROWS:(i + 1) * ROWS] for i in range(BANDS)]
+
+    def _payload(self, entry: Dict[str, Any]) -> Tuple[int, ...]:
+        with open(os.path.join(self.post_index.blog_dir, entry["path"]), "r", encoding="utf-8") as f:
+            _, body = split_frontmatter(f.read())
+        return minhash(report_substance(body))
+
+    def add_post(self, slug: str, substance: Optional[str] = None):
+        """Sketches one post right after it is published; pass `substance` to skip re-reading it."""
+        super().add_post(slug, minhash(substance) if substance is not None else None)
+
+    # --- query ---
+
+    def find_duplicate(self, substance: str, threshold: Optional[float] = None) -> Optional[Tuple[str, float]]:
+        """Returns (slug, estimated similarity) of the closest published post at or above the threshold."""
+        self.sync()
+        sig = minhash(substance)
+        if not sig:
+            return None
+        threshold = self.threshold if threshold is None else threshold
+        with self._lock:
+            candidates = set()
+            for band, key in enumerate(self._band_keys(sig)):
+                candidates.update(self.buckets[band].get(key, ()))
+            best = None
+            for slug in candidates:
+                score = similarity(sig, self.sketches[slug]["sig"])
+                if score >= threshold and (best is None or score > best[1]):
+                    best = (slug, score)
+        return best
+
+def get_duplicate_index(blog_dir: str = "data/blog") -> DuplicateIndex:
+    return shared_index(DuplicateIndex, blog_dir)
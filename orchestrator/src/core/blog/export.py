@@ -0,0 +1,265 @@
+import os
+import re
+import json
+import html
+import hashlib
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from email.utils import format_datetime
+from typing import Dict, List, Any, Optional, Tuple
+from orchestrator.src.core.blog.frontmatter import split_frontmatter
+from orchestrator.src.core.blog.index import get_post_index
+from orchestrator.src.core.blog.render import markdown_to_html, reading_time_minutes
+from orchestrator.src.logging.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Bump to force a full rebuild when page markup changes
+TEMPLATE_VERSION = "1"
+PAGE_SIZE = 20
+RSS_ITEMS = 20
+MANIFEST_NAME = ".manifest.json"
+# Below this many changed posts, forking a pool costs more than it saves
+POOL_THRESHOLD = 8
+
+def _digest(payload: Any) -> str:
+    data = payload if isinstance(payload, bytes) else json.dumps(payload, sort_keys=True).encode("utf-8")
+    return hashlib.sha256(TEMPLATE_VERSION.encode() + data).hexdigest()[:16]
+
+def _tag_slug(tag: str) -> str:
+    return re.sub(r'[^a-z0-9]+', '-', tag.lower()).strip('-') or "tag"
+
+def _write_atomic(path: str, data: bytes):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+def _layout(title: str, body: str) -> str:
+    return f"""<!doctype html>
+<html lang="en">
+<head><meta charset="utf-8"><meta name="viewport" content="width=device-width, initial-scale=1">
+<title>{html.escape(title)}</title>
+<link rel="alternate" type="application/rss+xml" href="/rss.xml"></head>
+<body>
+<nav><a href="/index.html">Intelligence Reports</a></nav>
+<main>
+{body}
+</main>
+</body>
+</html>
+"""
+
+def _post_list(posts: List[Dict[str, Any]]) -> str:
+    items = []
+    for p in posts:
+        tags = " ".join(f'<a href="/tags/{_tag_slug(t)}.html">#{html.escape(t)}</a>' for t in p["tags"])
+        items.append(
+            f'<article><h2><a href="/posts/{p["slug"]}.html">{html.escape(p["title"])}</a></h2>'
+            f'<time>{html.escape(p["date"])}</time><p>{html.escape(p["summary"])}</p>{tags}</article>'
+        )
+    return "\n".join(items)
+
+def render_post_page(job: Tuple[str, str]) -> str:
+    """Pool worker: renders one post page from its markdown source. Returns the output path."""
+    source, target = job
+    with open(source, "r", encoding="utf-8") as f:
+        meta, markdown = split_frontmatter(f.read())
+    body, toc = markdown_to_html(markdown)
+    title = meta.get("title", os.path.basename(source)[:-3])
+    toc_html = "".join(f'<li class="toc-{t["level"]}"><a href="#{t["id"]}">{html.escape(t["text"])}</a></li>' for t in toc)
+    page = _layout(title, (
+        f'<header><time>{html.escape(meta.get("date", ""))}</time> · {reading_time_minutes(markdown)} min read</header>'
+        f'<nav class="toc"><ul>{toc_html}</ul></nav>\n<article>{body}</article>'
+    ))
+    _write_atomic(target, page.encode("utf-8"))
+    return target
+
+class SiteExporter:
+    """
+    Incremental static export of the blog and catalog.
+
+    Every output file is recorded in a manifest with the hash of its inputs. A run only
+    rewrites outputs whose input hash changed (or which are missing) and deletes outputs
+    that are no longer produced. Post sources are only re-hashed when their size/mtime moved.
+    """
+
+    def __init__(self, out_dir: str = "dist/site", blog_dir: str = "data/blog", base_url: Optional[str] = None, workers: Optional[int] = None):
+        self.out_dir = out_dir
+        self.index = get_post_index(blog_dir)
+        self.base_url = (base_url or "").rstrip("/")
+        self.workers = workers or os.cpu_count() or 1
+        self.manifest_path = os.path.join(out_dir, MANIFEST_NAME)
+        self.manifest: Dict[str, Dict[str, Any]] = {}
+        self.stats = {"written": 0, "skipped": 0, "removed": 0}
+        self.force = False
+
+    def _load_manifest(self):
+        try:
+            with open(self.manifest_path, "r", encoding="utf-8") as f:
+                self.manifest = json.load(f)
+        except (OSError, ValueError):
+            self.manifest = {}
+
+    def _fresh(self, rel_path: str, digest: str) -> bool:
+        if self.force:
+            return False
+        entry = self.manifest.get(rel_path)
+        return bool(entry) and entry.get("hash") == digest and os.path.exists(os.path.join(self.out_dir, rel_path))
+
+    def _emit(self, rel_path: str, inputs: Any, build) -> Dict[str, Any]:
+        digest = _digest(inputs)
+        if self._fresh(rel_path, digest):
+            self.stats["skipped"] += 1
+        else:
+            _write_atomic(os.path.join(self.out_dir, rel_path), build().encode("utf-8"))
+            self.stats["written"] += 1
+        return {"hash": digest}
+
+    # --- page groups ---
+
+    def _post_pages(self, posts: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+        produced, jobs = {}, []
+        for p in posts:
+            rel_path = f"posts/{p['slug']}.html"
+            source = os.path.join(self.index.blog_dir, p["path"])
+            # The template version is part of the stamp so a markup change invalidates the shortcut
+            stamp = [TEMPLATE_VERSION, p["size"], p["mtime"]]
+            previous = self.manifest.get(rel_path, {})
+            exists = os.path.exists(os.path.join(self.out_dir, rel_path))
+            if not self.force and exists and previous.get("stamp") == stamp:
+                produced[rel_path] = previous
+                self.stats["skipped"] += 1
+                continue
+            with open(source, "rb") as f:
+                digest = _digest(f.read())
+            produced[rel_path] = {"hash": digest, "stamp": stamp}
+            if not self.force and exists and previous.get("hash") == digest:
+                self.stats["skipped"] += 1
+                continue
+            jobs.append((source, os.path.join(self.out_dir, rel_path)))
+
+        if len(jobs) >= POOL_THRESHOLD and self.workers > 1:
+            with ProcessPoolExecutor(max_workers=self.workers) as pool:
+                list(pool.map(render_post_page, jobs, chunksize=max(1, len(jobs) // (self.workers * 4))))
+        else:
+            for job in jobs:
+                render_post_page(job)
+        self.stats["written"] += len(jobs)
+        return produced
+
+    def _listing_pages(self, posts: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+        produced = {}
+        pages = [posts[i:i + PAGE_SIZE] for i in range(0, len(posts), PAGE_SIZE)] or [[]]
+        for n, chunk in enumerate(pages, start=1):
+            rel_path = "index.html" if n == 1 else f"page/{n}.html"
+            prev_link = "" if n == 1 else ('<a href="/index.html">Newer</a>' if n == 2 else f'<a href="/page/{n - 1}.html">Newer</a>')
+            next_link = f'<a href="/page/{n + 1}.html">Older</a>' if n < len(pages) else ""
+            summary = [{k: p[k] for k in ("slug", "title", "date", "summary", "tags")} for p in chunk]
+            produced[rel_path] = self._emit(rel_path, [summary, n, len(pages)], lambda chunk=chunk, prev_link=prev_link, next_link=next_link: _layout(
+                "Intelligence Reports", f"{_post_list(chunk)}\n<nav class=\"pager\">{prev_link} {next_link}</nav>"
+            ))
+
+        tags: Dict[str, List[Dict[str, Any]]] = {}
+        for p in posts:
+            for t in p["tags"]:
+                tags.setdefault(_tag_slug(t), []).append(p)
+        for tag, tagged in tags.items():
+            rel_path = f"tags/{tag}.html"
+            summary = [{k: p[k] for k in ("slug", "title", "date", "summary", "tags")} for p in tagged]
+            produced[rel_path] = self._emit(rel_path, summary, lambda tag=tag, tagged=tagged: _layout(
+                f"#{tag}", f"<h1>#{html.escape(tag)}</h1>\n{_post_list(tagged)}"
+            ))
+        return produced
+
+    def _feeds(self, posts: List[Dict[str, Any]], listing_paths: List[str]) -> Dict[str, Dict[str, Any]]:
+        produced = {}
+        latest = [{k: p[k] for k in ("slug", "title", "date", "summary")} for p in posts[:RSS_ITEMS]]
+
+        def rss():
+            items = []
+            for p in latest:
+                try:
+                    pub = format_datetime(datetime.strptime(p["date"], "%Y-%m-%d"))
+                except ValueError:
+                    pub = ""
+                link = f"{self.base_url}/posts/{p['slug']}.html"
+                items.append(
+                    f"<item><title>{html.escape(p['title'])}</title><link>{link}</link><guid>{link}</guid>"
+                    f"<pubDate>{pub}</pubDate><description>{html.escape(p['summary'])}</description></item>"
+                )
+            return (
+                '<?xml version="1.0" encoding="UTF-8"?>\n<rss version="2.0"><channel>'
+                f"<title>Intelligence Reports</title><link>{self.base_url}/</link>"
+                f"<description>Autonomous reports from the Sovereign Matrix.</description>{''.join(items)}</channel></rss>\n"
+            )
+        produced["rss.xml"] = self._emit("rss.xml", [latest, self.base_url], rss)
+
+        urls = [(f"posts/{p['slug']}.html", p["date"]) for p in posts] + [(p, None) for p in sorted(listing_paths)]
+
+        def sitemap():
+            entries = "".join(
+                f"<url><loc>{self.base_url}/{path}</loc>{f'<lastmod>{date}</lastmod>' if date else ''}</url>"
+                for path, date in urls
+            )
+            return f'<?xml version="1.0" encoding="UTF-8"?>\n<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">{entries}</urlset>\n'
+        produced["sitemap.xml"] = self._emit("sitemap.xml", [urls, self.base_url], sitemap)
+        return produced
+
+    def _products(self) -> Dict[str, Dict[str, Any]]:
+        try:
+            from orchestrator.src.core.catalog.api import catalog_api
+            products = [p.model_dump() if hasattr(p, "model_dump") else p for p in catalog_api.get_products()]
+        except Exception as e:
+            logger.warning(f"Static export: catalog unavailable, products.json skipped: {e}")
+            return {k: v for k, v in self.manifest.items() if k == "products.json"}
+        return {"products.json": self._emit("products.json", products, lambda: json.dumps(products, indent=2))}
+
+    # --- entry point ---
+
+    def export(self, force: bool = False, include_products: bool = True) -> Dict[str, int]:
+        self._load_manifest()
+        self.force = force
+        self.stats = {"written": 0, "skipped": 0, "removed": 0}
+        posts = self.index.list()
+
+        produced = self._post_pages(posts)
+        listings = self._listing_pages(posts)
+        produced.update(listings)
+        produced.update(self._feeds(posts, list(listings)))
+        if include_products:
+            produced.update(self._products())
+
+        for rel_path in set(self.manifest) - set(produced):
+            try:
+                os.remove(os.path.join(self.out_dir, rel_path))
+                self.stats["removed"] += 1
+            except FileNotFoundError:
+                pass
+
+        self.manifest = produced
+        _write_atomic(self.manifest_path, json.dumps(self.manifest).encode("utf-8"))
+        logger.info(f"Static export complete: {self.stats}")
+        return self.stats
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Incremental static export of the blog and catalog.")
+    parser.add_argument("--out", default="dist/site")
+    parser.add_argument("--blog-dir", default="data/blog")
+    parser.add_argument("--base-url", default=None, help="Absolute site URL for RSS and sitemap (defaults to FRONTEND_URL)")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--force", action="store_true", help="Rebuild every page")
+    parser.add_argument("--no-products", action="store_true")
+    args = parser.parse_args(argv)
+
+    base_url = args.base_url
+    if base_url is None:
+        from orchestrator.src.core.config import settings
+        base_url = settings.FRONTEND_URL
+    exporter = SiteExporter(args.out, args.blog_dir, base_url=base_url, workers=args.workers)
+    print(json.dumps(exporter.export(force=args.force, include_products=not args.no_products)))
+
+if __name__ == "__main__":
+    main()
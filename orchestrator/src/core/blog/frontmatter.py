@@ -0,0 +1,76 @@
+import re
+import json
+from typing import Any, Dict, Iterable, Tuple
+
+FENCE = "---"
+MAX_HEADER_LINES = 200
+# Read buffer for header scans; frontmatter blocks are a few hundred bytes
+HEADER_CHUNK = 1024
+
+_FIELD_RE = re.compile(r'^([A-Za-z0-9_\-]+)\s*:\s*(.*?)\s*$')
+_ITEM_RE = re.compile(r'^\s*-\s+(.*?)\s*$')
+
+def _parse_value(raw: str) -> Any:
+    """Scalar or inline-list frontmatter value. Quotes are stripped, `[a, b]` becomes a list."""
+    if raw.startswith("[") and raw.endswith("]"):
+        try:
+            value = json.loads(raw)
+            if isinstance(value, list):
+                return [str(v) for v in value]
+        except ValueError:
+            pass
+        return [v.strip().strip('"\'') for v in raw[1:-1].split(",") if v.strip()]
+    if len(raw) >= 2 and raw[0] == raw[-1] and raw[0] in "\"'":
+        return raw[1:-1]
+    return raw
+
+def _parse_header(lines: Iterable[str]) -> Tuple[Dict[str, Any], bool]:
+    """
+    Consumes lines after the opening fence up to the closing one.
+    Returns (metadata, closed). Supports `key: value`, inline lists and `- item` block lists.
+    """
+    meta: Dict[str, Any] = {}
+    list_key = None  # key with an empty value, collecting `- item` lines
+    for count, line in enumerate(lines):
+        line = line.rstrip("\r\n")
+        if line.strip() == FENCE:
+            return meta, True
+        if count >= MAX_HEADER_LINES:
+            break
+        item = _ITEM_RE.match(line)
+        if item and list_key:
+            meta[list_key] = (meta[list_key] or []) + [_parse_value(item.group(1))]
+            continue
+        field = _FIELD_RE.match(line)
+        if field:
+            key, value = field.group(1), _parse_value(field.group(2))
+            meta[key] = value
+            list_key = key if value == "" else None
+    return meta, False
+
+def parse_markdown_metadata(content: str) -> dict:
+    """Extracts yaml-like frontmatter from markdown strings."""
+    lines = iter(content.splitlines())
+    if next(lines, "").strip() != FENCE:
+        return {}
+    meta, _ = _parse_header(lines)
+    return meta
+
+def read_frontmatter(path: str) -> dict:
+    """Streams only the frontmatter block of a markdown file; the body is never read."""
+    with open(path, "rb", buffering=HEADER_CHUNK) as f:
+        if f.readline().decode("utf-8-sig").strip() != FENCE:
+            return {}
+        meta, _ = _parse_header(line.decode("utf-8", errors="replace") for line in f)
+    return meta
+
+def split_frontmatter(content: str) -> tuple:
+    """Returns (metadata, body) with the leading frontmatter block removed from the body."""
+    lines = content.splitlines(keepends=True)
+    if not lines or lines[0].strip() != FENCE:
+        return {}, content
+    meta, closed = _parse_header(lines[1:])
+    if not closed:
+        return meta, content
+    consumed = 1 + next(i for i, l in enumerate(lines[1:]) if l.strip() == FENCE) + 1
+    return meta, "".join(lines[consumed:]).lstrip("\n")
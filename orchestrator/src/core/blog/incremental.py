@@ -0,0 +1,194 @@
+import os
+import json
+import pickle
+import threading
+from typing import Dict, List, Any, Optional, Tuple, Type, TypeVar
+from orchestrator.src.core.blog.index import PostIndex, get_post_index
+from orchestrator.src.logging.logger import get_logger
+
+logger = get_logger(__name__)
+
+COMPACT_AFTER = 500
+
+class IncrementalPostIndex:
+    """
+    Base for derived indexes kept in step with the post index (search postings, duplicate
+    sketches). Each post contributes one payload computed from its file; publishers add
+    their post directly, anything else is found by diffing (size, mtime) stamps in sync().
+
+    State is a pickle snapshot plus an append-only JSON log of adds and deletes, folded into
+    a new snapshot every COMPACT_AFTER lines, so startup replays a few lines instead of
+    re-reading every post.
+
+    Subclasses set LABEL, STORE_SUFFIX, SNAPSHOT_VERSION and LOG_FIELD (the payload's key in
+    log lines), keep their per-post records (each with a "stamp") in `records`, and implement
+    the payload and state hooks below.
+    """
+    LABEL = "Post"
+    STORE_SUFFIX = "index"
+    SNAPSHOT_VERSION = 1
+    LOG_FIELD = "data"
+
+    def __init__(self, post_index: Optional[PostIndex] = None):
+        self.post_index = post_index if post_index is not None else get_post_index()
+        blog_dir = os.path.normpath(self.post_index.blog_dir)
+        self.store_dir = os.path.join(os.path.dirname(blog_dir), f".{os.path.basename(blog_dir)}_{self.STORE_SUFFIX}")
+        self.snapshot_path = os.path.join(self.store_dir, "snapshot.pkl")
+        self.log_path = os.path.join(self.store_dir, "log.jsonl")
+        self._lock = threading.RLock()
+        self._reset()
+        self._synced_version: Optional[int] = None
+        self._load()
+
+    # --- hooks ---
+
+    @property
+    def records(self) -> Dict[str, Dict[str, Any]]:
+        """slug -> record; every record carries the "stamp" it was computed from."""
+        raise NotImplementedError
+
+    def _reset(self):
+        self._log_lines = 0
+
+    def _snapshot_state(self) -> Dict[str, Any]:
+        raise NotImplementedError
+
+    def _restore(self, state: Dict[str, Any]):
+        raise NotImplementedError
+
+    def _payload(self, entry: Dict[str, Any]) -> Any:
+        """Reads the post and computes its payload. May raise OSError."""
+        raise NotImplementedError
+
+    def _encode(self, payload: Any) -> Any:
+        return payload
+
+    def _decode(self, raw: Any) -> Any:
+        return raw
+
+    def _apply_add(self, slug: str, stamp: List[int], payload: Any):
+        raise NotImplementedError
+
+    def _apply_remove(self, slug: str):
+        raise NotImplementedError
+
+    # --- persistence ---
+
+    def _load(self):
+        try:
+            with open(self.snapshot_path, "rb") as f:
+                state = pickle.load(f)
+            if state.get("version") == self.SNAPSHOT_VERSION:
+                self._restore(state)
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logger.error(f"{self.LABEL} snapshot unreadable, rebuilding: {e}")
+            self._reset()
+
+        if not os.path.exists(self.log_path):
+            return
+        try:
+            with open(self.log_path, "r", encoding="utf-8") as f:
+                for line in f:
+                    op = json.loads(line)
+                    if op["op"] == "add":
+                        self._apply_add(op["slug"], op["stamp"], self._decode(op[self.LOG_FIELD]))
+                    else:
+                        self._apply_remove(op["slug"])
+                    self._log_lines += 1
+        except Exception as e:
+            logger.error(f"{self.LABEL} log truncated, continuing from last good entry: {e}")
+
+    def _append_log(self, op: Dict[str, Any]):
+        try:
+            os.makedirs(self.store_dir, exist_ok=True)
+            with open(self.log_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(op) + "\n")
+            self._log_lines += 1
+            if self._log_lines >= COMPACT_AFTER:
+                self.compact()
+        except OSError as e:
+            logger.warning(f"{self.LABEL} log not persisted: {e}")
+
+    def compact(self):
+        """Folds the log into a fresh snapshot."""
+        with self._lock:
+            os.makedirs(self.store_dir, exist_ok=True)
+            tmp_path = f"{self.snapshot_path}.tmp"
+            with open(tmp_path, "wb") as f:
+                pickle.dump({"version": self.SNAPSHOT_VERSION, **self._snapshot_state()}, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, self.snapshot_path)
+            open(self.log_path, "w").close()
+            self._log_lines = 0
+
+    # --- mutation ---
+
+    def _add(self, slug: str, stamp: List[int], payload: Any):
+        self._apply_add(slug, stamp, payload)
+        self._append_log({"op": "add", "slug": slug, "stamp": stamp, self.LOG_FIELD: self._encode(payload)})
+
+    def add_post(self, slug: str, payload: Any = None):
+        """Indexes (or re-indexes) one post right after it is published; pass `payload` if already computed."""
+        entry = self.post_index.get(slug)
+        if not entry:
+            return
+        before = self.post_index.version
+        if payload is None:
+            payload = self._payload(entry)
+        stamp = [entry["size"], entry["mtime"]]
+        with self._lock:
+            self._add(slug, stamp, payload)
+            # Our own upsert is the only change since the last sync: stay in sync without a scan
+            if self._synced_version is not None and before == self._synced_version + 1:
+                self._synced_version = before
+
+    def remove_post(self, slug: str):
+        with self._lock:
+            if slug in self.records:
+                self._apply_remove(slug)
+                self._append_log({"op": "del", "slug": slug})
+
+    def sync(self) -> int:
+        """Diffs against the post index by (size, mtime) stamps. Returns the number of posts (re)indexed."""
+        self.post_index.reconcile()
+        if self.post_index.version == self._synced_version:
+            return 0
+        # Listed before taking our lock: publishers hold the post index lock while they call us
+        version = self.post_index.version
+        entries = {e["slug"]: e for e in self.post_index.list()}
+        with self._lock:
+            if version == self._synced_version:
+                return 0
+            for slug in [s for s in self.records if s not in entries]:
+                self.remove_post(slug)
+            changed = 0
+            for slug, entry in entries.items():
+                stamp = [entry["size"], entry["mtime"]]
+                record = self.records.get(slug)
+                if record and record["stamp"] == stamp:
+                    continue
+                try:
+                    payload = self._payload(entry)
+                except OSError as e:
+                    logger.warning(f"{self.LABEL} index skipped {slug}: {e}")
+                    continue
+                self._add(slug, stamp, payload)
+                changed += 1
+            self._synced_version = version
+            if changed:
+                logger.info(f"{self.LABEL} index synced: {changed} posts indexed, {len(self.records)} total")
+            return changed
+
+IndexT = TypeVar("IndexT", bound=IncrementalPostIndex)
+
+_shared: Dict[Tuple[type, str], IncrementalPostIndex] = {}
+_shared_lock = threading.Lock()
+
+def shared_index(cls: Type[IndexT], blog_dir: str = "data/blog") -> IndexT:
+    """One index of each kind per blog directory, sharing that directory's post index."""
+    key = (cls, os.path.abspath(blog_dir))
+    with _shared_lock:
+        if key not in _shared:
+            _shared[key] = cls(get_post_index(blog_dir))
+        return _shared[key]
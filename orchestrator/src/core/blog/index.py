@@ -0,0 +1,313 @@
+import os
+import re
+import json
+import base64
+import bisect
+import threading
+from typing import Dict, List, Any, Optional, Tuple
+from orchestrator.src.core.blog.frontmatter import read_frontmatter, split_frontmatter
+from orchestrator.src.logging.logger import get_logger
+
+logger = get_logger(__name__)
+
+INDEX_VERSION = 3
+PUBLIC_FIELDS = ("slug", "title", "date", "summary", "tags")
+
+_YEAR_RE = re.compile(r'^\d{4}$')
+_MONTH_RE = re.compile(r'^(0[1-9]|1[0-2])$')
+_DATE_RE = re.compile(r'^(\d{4})-(\d{2})')
+
+def shard_for(date: str) -> Optional[str]:
+    """`YYYY/MM` shard directory for a `YYYY-MM-DD` date, or None if the date doesn't parse."""
+    m = _DATE_RE.match(date or "")
+    if not m or not _MONTH_RE.match(m.group(2)):
+        return None
+    return f"{m.group(1)}/{m.group(2)}"
+
+def _is_shard(parent: str, name: str) -> bool:
+    """Only `YYYY` under the root and `MM` under a year are walked; `.rendered` and friends are not."""
+    if not parent:
+        return bool(_YEAR_RE.match(name))
+    return "/" not in parent and bool(_MONTH_RE.match(name))
+
+def index_path_for(blog_dir: str) -> str:
+    """The index lives beside the blog dir, not in it, so saving it never bumps the dir mtime."""
+    blog_dir = os.path.normpath(blog_dir)
+    return os.path.join(os.path.dirname(blog_dir), f".{os.path.basename(blog_dir)}_index.json")
+
+def _as_tag_list(value: Any) -> List[str]:
+    """Tags may arrive as a list or as the raw `["a", "b"]` / `a, b` frontmatter string."""
+    if isinstance(value, list):
+        return [str(t) for t in value]
+    if not value:
+        return []
+    return [t.strip().strip('"\'') for t in str(value).strip("[]").split(",") if t.strip()]
+
+def encode_cursor(key: Tuple[str, str]) -> str:
+    return base64.urlsafe_b64encode(json.dumps(list(key)).encode()).decode()
+
+def decode_cursor(cursor: str) -> Tuple[str, str]:
+    try:
+        date, slug = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return str(date), str(slug)
+    except Exception:
+        raise ValueError(f"Invalid cursor: {cursor}")
+
+class PostIndex:
+    """
+    Persistent metadata index over the markdown posts in a blog directory.
+
+    Posts live in `YYYY/MM/` shards (legacy posts may still sit flat in the root); slugs
+    are unique across the whole tree. Listing is served from memory. Each directory's
+    mtime tells us when something was added or removed behind our back; only the
+    directories that moved are listed again, and only files whose size/mtime changed
+    are re-read.
+    """
+
+    def __init__(self, blog_dir: str = "data/blog"):
+        self.blog_dir = blog_dir
+        self.index_path = index_path_for(blog_dir)
+        # Reentrant so writers can hold it across "write file + upsert" as one step
+        self.lock = threading.RLock()
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        # Relative dir ("" for the root, "2026", "2026/02") -> mtime_ns at its last listing
+        self._dirs: Dict[str, int] = {}
+        self._children: Optional[Dict[str, List[str]]] = None
+        # Ascending (date, slug) keys, overall and per tag; rebuilt lazily after any change
+        self._sorted: Optional[List[Tuple[str, str]]] = None
+        self._tag_keys: Dict[str, List[Tuple[str, str]]] = {}
+        # Bumped on every change to the entries; lets derived indexes detect drift cheaply
+        self.version = 0
+        self._load()
+
+    def _changed(self):
+        self._sorted = None
+        self.version += 1
+
+    # --- persistence ---
+
+    def _load(self):
+        if not os.path.exists(self.index_path):
+            return
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") != INDEX_VERSION:
+                return
+            self._entries = data.get("entries", {})
+            self._dirs = data.get("dirs", {})
+        except Exception as e:
+            logger.error(f"Post index corrupt, rebuilding: {e}")
+            self._entries = {}
+            self._dirs = {}
+
+    def _save(self):
+        tmp_path = f"{self.index_path}.tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"version": INDEX_VERSION, "dirs": self._dirs, "entries": self._entries}, f)
+            os.replace(tmp_path, self.index_path)
+        except OSError as e:
+            logger.warning(f"Post index not persisted: {e}")
+
+    # --- maintenance ---
+
+    def _read_entry(self, rel_path: str, st: os.stat_result) -> Dict[str, Any]:
+        meta = read_frontmatter(os.path.join(self.blog_dir, rel_path))
+        filename = rel_path.rpartition("/")[2]
+        return {
+            "slug": filename[:-3],
+            "title": meta.get("title", filename),
+            "date": meta.get("date", "2026-02-20"),
+            "summary": meta.get("summary", "Autonomous report."),
+            "tags": _as_tag_list(meta.get("tags")),
+            "path": rel_path,
+            "size": st.st_size,
+            "mtime": st.st_mtime_ns,
+        }
+
+    def _subdirs(self) -> Dict[str, List[str]]:
+        if self._children is None:
+            self._children = {}
+            for rel in self._dirs:
+                if rel:
+                    self._children.setdefault(rel.rpartition("/")[0], []).append(rel)
+        return self._children
+
+    def _scan_dir(self, rel: str, path: str, pending: List[str]) -> Tuple[set, int]:
+        """Lists one directory: queues shard subdirs, (re)reads changed posts. Returns (slugs seen, reads)."""
+        seen, reads = set(), 0
+        with os.scandir(path) as it:
+            for de in it:
+                name = de.name
+                if name.endswith(".md"):
+                    slug = name[:-3]
+                    rel_path = f"{rel}/{name}" if rel else name
+                    seen.add(slug)
+                    try:
+                        st = de.stat()
+                        entry = self._entries.get(slug)
+                        if entry and entry["path"] == rel_path and entry["size"] == st.st_size and entry["mtime"] == st.st_mtime_ns:
+                            continue
+                        if entry and entry["path"] != rel_path and os.path.exists(os.path.join(self.blog_dir, entry["path"])):
+                            logger.error(f"Post index: duplicate slug {slug} at {rel_path}, keeping {entry['path']}")
+                            continue
+                        self._entries[slug] = self._read_entry(rel_path, st)
+                        reads += 1
+                    except Exception as e:
+                        logger.error(f"Post index skipped {rel_path}: {e}")
+                elif _is_shard(rel, name) and de.is_dir():
+                    pending.append(f"{rel}/{name}" if rel else name)
+        return seen, reads
+
+    def reconcile(self, force: bool = False) -> int:
+        """Brings the index in line with the directory tree. Returns the number of files (re)read."""
+        with self.lock:
+            children = self._subdirs()
+            dirs: Dict[str, int] = {}
+            listed: Dict[str, set] = {}
+            reads = 0
+            pending = [""]
+            while pending:
+                rel = pending.pop()
+                path = os.path.join(self.blog_dir, rel) if rel else self.blog_dir
+                try:
+                    mtime = os.stat(path).st_mtime_ns
+                    dirs[rel] = mtime
+                    if not force and self._dirs.get(rel) == mtime:
+                        pending.extend(children.get(rel, ()))
+                        continue
+                    listed[rel], n = self._scan_dir(rel, path, pending)
+                    reads += n
+                except FileNotFoundError:
+                    dirs.pop(rel, None)
+
+            if not reads and not listed and dirs.keys() == self._dirs.keys():
+                return 0
+
+            removed = []
+            for slug, entry in self._entries.items():
+                parent = entry["path"].rpartition("/")[0]
+                if parent not in dirs or (parent in listed and slug not in listed[parent]):
+                    removed.append(slug)
+            for slug in removed:
+                del self._entries[slug]
+
+            self._dirs, self._children = dirs, None
+            if reads or removed:
+                self._changed()
+            self._save()
+            if reads:
+                logger.info(f"Post index reconciled: {reads} posts re-read, {len(self._entries)} total")
+            return reads
+
+    def upsert(self, slug: str, path: Optional[str] = None):
+        """
+        Indexes a single post right after it was written. `path` is relative to the blog
+        dir (`2026/02/slug.md`); it defaults to the post's known location, then the root.
+        """
+        with self.lock:
+            entry = self._entries.get(slug)
+            rel_path = path or (entry["path"] if entry else f"{slug}.md")
+            st = os.stat(os.path.join(self.blog_dir, rel_path))
+            self._entries[slug] = self._read_entry(rel_path, st)
+            self._changed()
+            self._save()
+
+    def relocate(self, moves: Dict[str, str]):
+        """Records posts that were renamed to new relative paths (content unchanged) with one save."""
+        with self.lock:
+            for slug, rel_path in moves.items():
+                entry = self._entries.get(slug)
+                if entry is None:
+                    continue
+                st = os.stat(os.path.join(self.blog_dir, rel_path))
+                entry.update(path=rel_path, size=st.st_size, mtime=st.st_mtime_ns)
+            if moves:
+                self._changed()
+                self._save()
+
+    def remove(self, slug: str):
+        with self.lock:
+            if self._entries.pop(slug, None) is not None:
+                self._changed()
+                self._save()
+
+    # --- queries ---
+
+    def _ensure_sorted(self) -> List[Tuple[str, str]]:
+        if self._sorted is None:
+            self._sorted = sorted((e["date"], e["slug"]) for e in self._entries.values())
+            self._tag_keys = {}
+            for key in self._sorted:
+                for tag in _as_tag_list(self._entries[key[1]].get("tags")):
+                    self._tag_keys.setdefault(tag.lower(), []).append(key)
+        return self._sorted
+
+    def get(self, slug: str) -> Optional[Dict[str, Any]]:
+        self.reconcile()
+        entry = self._entries.get(slug)
+        return dict(entry) if entry else None
+
+    def read(self, slug: str) -> Optional[Dict[str, Any]]:
+        """Loads one post (metadata + markdown body) without touching any other file."""
+        entry = self.get(slug)
+        if not entry:
+            return None
+        try:
+            with open(os.path.join(self.blog_dir, entry["path"]), "r", encoding="utf-8") as f:
+                meta, body = split_frontmatter(f.read())
+        except FileNotFoundError:
+            self.remove(slug)
+            return None
+        return {"slug": slug, "meta": meta, "content": body}
+
+    def list(self) -> List[Dict[str, Any]]:
+        """All posts, newest first."""
+        self.reconcile()
+        with self.lock:
+            keys = self._ensure_sorted()
+            return [dict(self._entries[k[1]]) for k in reversed(keys)]
+
+    def page(
+        self,
+        cursor: Optional[str] = None,
+        limit: int = 20,
+        tag: Optional[str] = None,
+        since: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Newest-first page of posts. The cursor encodes the (date, slug) key of the last
+        post served, so pages stay stable while new posts are being published.
+        """
+        upper = decode_cursor(cursor) if cursor else None
+        self.reconcile()
+        with self.lock:
+            keys = self._ensure_sorted()
+            if tag:
+                keys = self._tag_keys.get(tag.lower(), [])
+            lo = bisect.bisect_left(keys, (since, "")) if since else 0
+            hi = bisect.bisect_left(keys, upper) if upper else len(keys)
+            hi = max(hi, lo)
+            start = max(lo, hi - max(limit, 1))
+            window = keys[start:hi][::-1]
+            return {
+                "posts": [{f: self._entries[k[1]][f] for f in PUBLIC_FIELDS} for k in window],
+                "next_cursor": encode_cursor(window[-1]) if window and start > lo else None,
+                "total": len(keys) - lo,
+            }
+
+    def __len__(self) -> int:
+        self.reconcile()
+        return len(self._entries)
+
+_indexes: Dict[str, PostIndex] = {}
+_indexes_lock = threading.Lock()
+
+def get_post_index(blog_dir: str = "data/blog") -> PostIndex:
+    """One shared index per blog directory."""
+    key = os.path.abspath(blog_dir)
+    with _indexes_lock:
+        if key not in _indexes:
+            _indexes[key] = PostIndex(blog_dir)
+        return _indexes[key]
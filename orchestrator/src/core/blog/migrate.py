@@ -0,0 +1,83 @@
+import os
+import re
+import json
+import argparse
+from datetime import datetime
+from typing import Dict, List, Any, Optional
+from orchestrator.src.core.blog.index import get_post_index, shard_for
+from orchestrator.src.core.blog.render import RENDER_DIRNAME
+from orchestrator.src.logging.logger import get_logger
+
+logger = get_logger(__name__)
+
+_SLUG_DATE_RE = re.compile(r'(\d{4})(\d{2})\d{2}-\d{6}')
+
+def _target_shard(blog_dir: str, entry: Dict[str, Any]) -> str:
+    """Frontmatter date first, then the timestamp in `report-YYYYmmdd-HHMMSS` slugs, then the file mtime."""
+    shard = shard_for(entry["date"])
+    if shard:
+        return shard
+    m = _SLUG_DATE_RE.search(entry["slug"])
+    if m and shard_for(f"{m.group(1)}-{m.group(2)}"):
+        return f"{m.group(1)}/{m.group(2)}"
+    mtime = os.stat(os.path.join(blog_dir, entry["path"])).st_mtime
+    return datetime.utcfromtimestamp(mtime).strftime("%Y/%m")
+
+def _move_rendered(blog_dir: str, slug: str, shard: str):
+    """Carries the cached render along; renames keep size/mtime, so it stays valid."""
+    src_dir = os.path.join(blog_dir, RENDER_DIRNAME)
+    sidecar_path = os.path.join(src_dir, f"{slug}.json")
+    try:
+        with open(sidecar_path, "r", encoding="utf-8") as f:
+            digest = json.load(f).get("hash")
+    except (OSError, ValueError):
+        return
+    dst_dir = os.path.join(blog_dir, shard, RENDER_DIRNAME)
+    os.makedirs(dst_dir, exist_ok=True)
+    for name in (f"{slug}-{digest}.html", f"{slug}.json"):
+        try:
+            os.replace(os.path.join(src_dir, name), os.path.join(dst_dir, name))
+        except FileNotFoundError:
+            pass
+
+def migrate_to_shards(blog_dir: str = "data/blog", dry_run: bool = False) -> Dict[str, Any]:
+    """
+    Moves flat `blog_dir/slug.md` posts into `blog_dir/YYYY/MM/slug.md`. Slugs are kept, so
+    URLs, search and export state stay valid. Safe to re-run; posts already in a shard are
+    left alone and an occupied target is reported instead of overwritten.
+    """
+    index = get_post_index(blog_dir)
+    stats: Dict[str, Any] = {"moved": 0, "skipped": 0, "conflicts": []}
+    moves: Dict[str, str] = {}
+    with index.lock:
+        for entry in index.list():
+            if "/" in entry["path"]:
+                stats["skipped"] += 1
+                continue
+            shard = _target_shard(blog_dir, entry)
+            rel_path = f"{shard}/{entry['slug']}.md"
+            target = os.path.join(blog_dir, rel_path)
+            if os.path.exists(target):
+                stats["conflicts"].append(entry["slug"])
+                continue
+            if dry_run:
+                stats["moved"] += 1
+                continue
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            os.rename(os.path.join(blog_dir, entry["path"]), target)
+            _move_rendered(blog_dir, entry["slug"], shard)
+            moves[entry["slug"]] = rel_path
+            stats["moved"] += 1
+        index.relocate(moves)
+    logger.info(f"Blog shard migration{' (dry run)' if dry_run else ''}: {stats['moved']} moved, {len(stats['conflicts'])} conflicts")
+    return stats
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Move flat blog posts into YYYY/MM shards.")
+    parser.add_argument("--blog-dir", default="data/blog")
+    parser.add_argument("--dry-run", action="store_true", help="Report what would move without touching files")
+    args = parser.parse_args(argv)
+    print(json.dumps(migrate_to_shards(args.blog_dir, dry_run=args.dry_run)))
+
+if __name__ == "__main__":
+    main()
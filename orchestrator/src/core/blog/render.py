@@ -0,0 +1,293 @@
+import os
+import re
+import json
+import html
+import math
+import hashlib
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Any, Optional, Tuple
+from orchestrator.src.core.blog.frontmatter import split_frontmatter
+from orchestrator.src.core.blog.index import PostIndex, get_post_index
+from orchestrator.src.logging.logger import get_logger
+
+logger = get_logger(__name__)
+
+RENDER_DIRNAME = ".rendered"
+WORDS_PER_MINUTE = 200
+MEMORY_CACHE_SIZE = 256
+
+# --- markdown subset -> html ---
+
+_HEADING_RE = re.compile(r'^(#{1,6})\s+(.*?)\s*#*\s*$')
+_HR_RE = re.compile(r'^\s*([-*_])(\s*\1){2,}\s*$')
+_UL_RE = re.compile(r'^\s*[-*+]\s+(.*)$')
+_OL_RE = re.compile(r'^\s*\d+[.)]\s+(.*)$')
+_QUOTE_RE = re.compile(r'^\s*>\s?(.*)$')
+_FENCE_RE = re.compile(r'^\s*```(\w*)\s*$')
+
+_CODE_RE = re.compile(r'`([^`]+)`')
+_IMAGE_RE = re.compile(r'!\[([^\]]*)\]\(([^)\s]+)\)')
+_LINK_RE = re.compile(r'\[([^\]]+)\]\(([^)\s]+)\)')
+_BOLD_RE = re.compile(r'\*\*(.+?)\*\*')
+_ITALIC_RE = re.compile(r'(?<![\w*])[*_](?![\s*_])(.+?)(?<![\s*_])[*_](?![\w*])')
+_SLUG_RE = re.compile(r'[^a-z0-9]+')
+_WORD_RE = re.compile(r'\w+')
+
+def _safe_url(url: str) -> str:
+    """Drops script-capable schemes; posts are machine-written and rendered verbatim."""
+    if re.match(r'^\s*(javascript|vbscript|data):', html.unescape(url), re.I):
+        return "#"
+    return url
+
+def _inline(text: str) -> str:
+    text = html.escape(text, quote=True)
+    codes: List[str] = []
+
+    def stash_code(m):
+        codes.append(f"<code>{m.group(1)}</code>")
+        return f"\x00{len(codes) - 1}\x00"
+
+    text = _CODE_RE.sub(stash_code, text)
+    text = _IMAGE_RE.sub(lambda m: f'<img src="{_safe_url(m.group(2))}" alt="{m.group(1)}" loading="lazy">', text)
+    text = _LINK_RE.sub(lambda m: f'<a href="{_safe_url(m.group(2))}">{m.group(1)}</a>', text)
+    text = _BOLD_RE.sub(r'<strong>\1</strong>', text)
+    text = _ITALIC_RE.sub(r'<em>\1</em>', text)
+    return re.sub(r'\x00(\d+)\x00', lambda m: codes[int(m.group(1))], text)
+
+def _anchor(text: str, used: Dict[str, int]) -> str:
+    base = _SLUG_RE.sub("-", text.lower()).strip("-") or "section"
+    n = used.get(base, 0)
+    used[base] = n + 1
+    return base if n == 0 else f"{base}-{n}"
+
+def markdown_to_html(markdown: str) -> Tuple[str, List[Dict[str, Any]]]:
+    """Renders the markdown subset used by reports. Returns (html, toc)."""
+    out: List[str] = []
+    toc: List[Dict[str, Any]] = []
+    used: Dict[str, int] = {}
+    para: List[str] = []
+    list_tag: Optional[str] = None
+    quote: List[str] = []
+    code: Optional[List[str]] = None
+
+    def flush():
+        nonlocal list_tag
+        if para:
+            out.append(f"<p>{_inline(' '.join(para))}</p>")
+            para.clear()
+        if list_tag:
+            out.append(f"</{list_tag}>")
+            list_tag = None
+        if quote:
+            out.append(f"<blockquote><p>{_inline(' '.join(quote))}</p></blockquote>")
+            quote.clear()
+
+    for line in markdown.splitlines():
+        fence = _FENCE_RE.match(line)
+        if code is not None:
+            if fence:
+                out.append(f"<pre><code>{html.escape(chr(10).join(code))}</code></pre>")
+                code = None
+            else:
+                code.append(line)
+            continue
+        if fence:
+            flush()
+            code = []
+            continue
+        if not line.strip():
+            flush()
+            continue
+
+        heading = _HEADING_RE.match(line)
+        if heading:
+            flush()
+            level, text = len(heading.group(1)), heading.group(2)
+            anchor = _anchor(text, used)
+            if level <= 3:
+                toc.append({"level": level, "text": text, "id": anchor})
+            out.append(f'<h{level} id="{anchor}">{_inline(text)}</h{level}>')
+            continue
+        if _HR_RE.match(line):
+            flush()
+            out.append("<hr>")
+            continue
+
+        quoted = _QUOTE_RE.match(line)
+        if quoted:
+            if para or list_tag:
+                flush()
+            quote.append(quoted.group(1))
+            continue
+
+        item = _UL_RE.match(line)
+        tag = "ul"
+        if not item:
+            item, tag = _OL_RE.match(line), "ol"
+        if item:
+            if para or quote or (list_tag and list_tag != tag):
+                flush()
+            if not list_tag:
+                out.append(f"<{tag}>")
+                list_tag = tag
+            out.append(f"<li>{_inline(item.group(1))}</li>")
+            continue
+
+        if list_tag or quote:
+            flush()
+        para.append(line.strip())
+
+    if code is not None:
+        out.append(f"<pre><code>{html.escape(chr(10).join(code))}</code></pre>")
+    flush()
+    return "\n".join(out), toc
+
+def reading_time_minutes(markdown: str) -> int:
+    return max(1, math.ceil(len(_WORD_RE.findall(markdown)) / WORDS_PER_MINUTE))
+
+# --- render cache ---
+
+class RenderCache:
+    """
+    Renders each post version once. Output lives in a `.rendered/` folder next to the markdown:
+    `{slug}-{hash}.html` (immutable per version) plus a `{slug}.json` sidecar pointing at the
+    current hash with reading time and TOC. The source is only re-hashed when its size/mtime
+    differ from the sidecar, and only re-rendered when that hash changes.
+
+    Renders of one slug are serialized in-process; writes go through unique temp files, so
+    other processes rendering the same post can't trip over each other. The previous version's
+    HTML is kept until the one after it lands, for readers still holding the old sidecar.
+    """
+
+    def __init__(self, index: Optional[PostIndex] = None):
+        self.index = index if index is not None else get_post_index()
+        self._lock = threading.Lock()
+        self._memory: "OrderedDict[str, Tuple[Dict[str, Any], bytes]]" = OrderedDict()
+        self._slug_locks: Dict[str, threading.Lock] = {}
+
+    def _paths(self, entry: Dict[str, Any]) -> Tuple[str, str]:
+        source = os.path.join(self.index.blog_dir, entry["path"])
+        render_dir = os.path.join(os.path.dirname(source), RENDER_DIRNAME)
+        return source, render_dir
+
+    def _remember(self, slug: str, sidecar: Dict[str, Any], body: bytes):
+        with self._lock:
+            self._memory[slug] = (sidecar, body)
+            self._memory.move_to_end(slug)
+            while len(self._memory) > MEMORY_CACHE_SIZE:
+                self._memory.popitem(last=False)
+
+    def _load_sidecar(self, render_dir: str, slug: str) -> Optional[Dict[str, Any]]:
+        try:
+            with open(os.path.join(render_dir, f"{slug}.json"), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _slug_lock(self, slug: str) -> threading.Lock:
+        with self._lock:
+            return self._slug_locks.setdefault(slug, threading.Lock())
+
+    def _write_atomic(self, path: str, data: bytes):
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=f".{os.path.basename(path)}.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except BaseException:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            raise
+
+    @staticmethod
+    def _read(path: Optional[str]) -> Optional[bytes]:
+        """The file's bytes, or None if it is gone (e.g. pruned by another writer)."""
+        if not path:
+            return None
+        try:
+            with open(path, "rb") as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    def _prune(self, render_dir: str, slug: str, keep: List[str]):
+        """Drops renders of the slug other than `keep` (current and previous hash)."""
+        pattern = re.compile(rf"^{re.escape(slug)}-([0-9a-f]{{16}})\.html$")
+        for name in os.listdir(render_dir):
+            match = pattern.match(name)
+            if match and match.group(1) not in keep:
+                try:
+                    os.remove(os.path.join(render_dir, name))
+                except OSError:
+                    pass
+
+    def render(self, slug: str) -> Optional[Tuple[Dict[str, Any], bytes]]:
+        """Returns (sidecar, html bytes) for the current version of a post, or None if unknown."""
+        entry = self.index.get(slug)
+        if not entry:
+            return None
+        source, render_dir = self._paths(entry)
+        stamp = {"size": entry["size"], "mtime": entry["mtime"]}
+
+        cached = self._memory.get(slug)
+        if cached and cached[0].get("source") == stamp:
+            return cached
+
+        with self._slug_lock(slug):
+            return self._render(slug, source, render_dir, stamp)
+
+    def _render(self, slug: str, source: str, render_dir: str, stamp: Dict[str, Any]) -> Optional[Tuple[Dict[str, Any], bytes]]:
+        sidecar = self._load_sidecar(render_dir, slug)
+        html_path = os.path.join(render_dir, f"{slug}-{sidecar['hash']}.html") if sidecar else None
+        if sidecar and sidecar.get("source") == stamp:
+            body = self._read(html_path)
+            if body is not None:
+                self._remember(slug, sidecar, body)
+                return sidecar, body
+
+        try:
+            with open(source, "rb") as f:
+                raw = f.read()
+        except FileNotFoundError:
+            return None
+        digest = hashlib.sha256(raw).hexdigest()[:16]
+        os.makedirs(render_dir, exist_ok=True)
+
+        # Touched but unchanged: refresh the stamp, keep the render
+        body = self._read(html_path) if sidecar and sidecar.get("hash") == digest else None
+        if body is None:
+            meta, markdown = split_frontmatter(raw.decode("utf-8", errors="replace"))
+            rendered, toc = markdown_to_html(markdown)
+            body = rendered.encode("utf-8")
+            self._write_atomic(os.path.join(render_dir, f"{slug}-{digest}.html"), body)
+            previous = sidecar.get("hash") if sidecar else None
+            sidecar = {
+                "slug": slug,
+                "hash": digest,
+                "title": meta.get("title", slug),
+                "reading_time": reading_time_minutes(markdown),
+                "toc": toc,
+                "previous": previous if previous != digest else sidecar.get("previous"),
+            }
+            logger.info(f"Rendered post {slug} ({digest})")
+
+        sidecar["source"] = stamp
+        self._write_atomic(os.path.join(render_dir, f"{slug}.json"), json.dumps(sidecar).encode("utf-8"))
+        self._prune(render_dir, slug, [sidecar["hash"], sidecar.get("previous")])
+        self._remember(slug, sidecar, body)
+        return sidecar, body
+
+_caches: Dict[str, RenderCache] = {}
+_caches_lock = threading.Lock()
+
+def get_render_cache(blog_dir: str = "data/blog") -> RenderCache:
+    """One render cache per blog directory, sharing that directory's post index."""
+    key = os.path.abspath(blog_dir)
+    with _caches_lock:
+        if key not in _caches:
+            _caches[key] = RenderCache(get_post_index(blog_dir))
+        return _caches[key]
@@ -0,0 +1,208 @@
+import os
+import re
+import math
+import heapq
+import bisect
+from collections import Counter
+from typing import Dict, List, Any, Optional, Tuple
+from orchestrator.src.core.blog.frontmatter import split_frontmatter
+from orchestrator.src.core.blog.incremental import IncrementalPostIndex, shared_index
+
+SNAPSHOT_VERSION = 1
+BM25_K1 = 1.2
+BM25_B = 0.75
+TITLE_BOOST = 3
+# Terms with more postings than this are never scanned in full at query time
+SCAN_LIMIT = 4000
+# Postings scanned in full per query; rarer terms spend it first
+SCAN_BUDGET = 12000
+MAX_PREFIX_EXPANSIONS = 16
+
+_TOKEN_RE = re.compile(r'[a-z0-9]+')
+STOPWORDS = frozenset(
+    "a an and are as at be by for from has have in is it its of on or that the this to was were will with".split()
+)
+
+def tokenize(text: str) -> List[str]:
+    return [t for t in _TOKEN_RE.findall(text.lower()) if len(t) > 1 and t not in STOPWORDS]
+
+class SearchIndex(IncrementalPostIndex):
+    """
+    Incremental BM25 inverted index over published posts, with prefix matching on the
+    last query term.
+
+    Query terms are evaluated rarest first, each scanning its postings in full until the
+    per-query SCAN_BUDGET runs out. Terms beyond that, or in a large share of the corpus
+    (templated report boilerplate), only contribute to documents already matched by rarer
+    terms, or, when the query has nothing rarer, to a cached list of their highest-impact
+    postings. Query cost is bounded by the budget instead of the corpus size.
+
+    Each post's payload is its term counts; persistence and syncing come from IncrementalPostIndex.
+    """
+    LABEL = "Search"
+    STORE_SUFFIX = "search"
+    SNAPSHOT_VERSION = SNAPSHOT_VERSION
+    LOG_FIELD = "tf"
+
+    def _reset(self):
+        super()._reset()
+        # slug -> {"id", "stamp", "len", "terms"}
+        self.docs: Dict[str, Dict[str, Any]] = {}
+        self.id_to_slug: Dict[int, str] = {}
+        self.doc_len: Dict[int, int] = {}
+        self.postings: Dict[str, Dict[int, int]] = {}
+        self.total_len = 0
+        self.next_id = 0
+        self._sorted_terms: Optional[List[str]] = None
+        self._impact_cache: Dict[str, Tuple[int, List[int]]] = {}
+
+    @property
+    def records(self) -> Dict[str, Dict[str, Any]]:
+        return self.docs
+
+    # --- persistence ---
+
+    def _snapshot_state(self) -> Dict[str, Any]:
+        return {"docs": self.docs, "postings": self.postings, "next_id": self.next_id}
+
+    def _restore(self, state: Dict[str, Any]):
+        self.docs = state["docs"]
+        self.postings = state["postings"]
+        self.next_id = state["next_id"]
+        self.total_len = sum(d["len"] for d in self.docs.values())
+        self.id_to_slug = {d["id"]: slug for slug, d in self.docs.items()}
+        self.doc_len = {d["id"]: d["len"] for d in self.docs.values()}
+
+    def _decode(self, raw: Dict[str, int]) -> Counter:
+        return Counter(raw)
+
+    # --- mutation ---
+
+    def _apply_add(self, slug: str, stamp: List[int], tf: Counter):
+        self._apply_remove(slug)
+        doc_id = self.next_id
+        self.next_id += 1
+        length = sum(tf.values())
+        self.docs[slug] = {"id": doc_id, "stamp": stamp, "len": length, "terms": tuple(tf)}
+        self.id_to_slug[doc_id] = slug
+        self.doc_len[doc_id] = length
+        self.total_len += length
+        for term, count in tf.items():
+            plist = self.postings.get(term)
+            if plist is None:
+                self.postings[term] = plist = {}
+                self._sorted_terms = None
+            plist[doc_id] = count
+
+    def _apply_remove(self, slug: str):
+        doc = self.docs.pop(slug, None)
+        if not doc:
+            return
+        self.id_to_slug.pop(doc["id"], None)
+        self.doc_len.pop(doc["id"], None)
+        self.total_len -= doc["len"]
+        for term in doc["terms"]:
+            # A cached ranking may hold the removed id (re-indexing assigns a new one)
+            self._impact_cache.pop(term, None)
+            plist = self.postings.get(term)
+            if plist is not None:
+                plist.pop(doc["id"], None)
+                if not plist:
+                    del self.postings[term]
+                    self._sorted_terms = None
+
+    def _payload(self, entry: Dict[str, Any]) -> Counter:
+        with open(os.path.join(self.post_index.blog_dir, entry["path"]), "r", encoding="utf-8") as f:
+            meta, body = split_frontmatter(f.read())
+        tf = Counter(tokenize(body))
+        tf.update(tokenize(" ".join([str(meta.get("summary", ""))] + list(entry.get("tags") or []))))
+        for term in tokenize(str(meta.get("title", entry["slug"]))):
+            tf[term] += TITLE_BOOST
+        return tf
+
+    # --- query ---
+
+    def _expand_prefix(self, prefix: str) -> List[str]:
+        if self._sorted_terms is None:
+            self._sorted_terms = sorted(self.postings)
+        terms = self._sorted_terms
+        i = bisect.bisect_left(terms, prefix)
+        out = []
+        while i < len(terms) and terms[i].startswith(prefix) and len(out) < MAX_PREFIX_EXPANSIONS:
+            out.append(terms[i])
+            i += 1
+        return out
+
+    def _impact_list(self, term: str, plist: Dict[int, int]) -> List[int]:
+        """Top SCAN_LIMIT postings of a common term by tf/len; refreshed once the term grows by 10%."""
+        cached = self._impact_cache.get(term)
+        if cached and len(plist) <= cached[0] * 1.1:
+            return cached[1]
+        doc_len = self.doc_len
+        ranked = heapq.nlargest(SCAN_LIMIT, plist, key=lambda d: plist[d] / (doc_len[d] or 1))
+        self._impact_cache[term] = (len(plist), ranked)
+        return ranked
+
+    def search(self, query: str, limit: int = 10, prefix: bool = True) -> List[Dict[str, Any]]:
+        self.sync()
+        tokens = tokenize(query)
+        if not tokens:
+            return []
+
+        with self._lock:
+            n_docs = len(self.docs)
+            if not n_docs:
+                return []
+            avgdl = self.total_len / n_docs
+            doc_len, slugs = self.doc_len, self.id_to_slug
+            norm = BM25_K1 * (1 - BM25_B)
+            norm_per_len = BM25_K1 * BM25_B / avgdl
+
+            # Each query position is a group of alternative terms (prefix expansion on the last one)
+            groups = [[t] for t in tokens[:-1]]
+            last = tokens[-1]
+            groups.append(self._expand_prefix(last) if prefix else [last])
+
+            weighted = []
+            for group in groups:
+                for term in group:
+                    plist = self.postings.get(term)
+                    if plist:
+                        df = len(plist)
+                        idf = math.log(1 + (n_docs - df + 0.5) / (df + 0.5))
+                        weighted.append((df, term, idf, plist))
+            weighted.sort(key=lambda w: w[0])
+
+            scores: Dict[int, float] = {}
+            budget = SCAN_BUDGET
+            for df, term, idf, plist in weighted:
+                if df <= min(SCAN_LIMIT, budget):
+                    candidates = plist
+                    budget -= df
+                elif scores:
+                    candidates = [d for d in scores if d in plist]
+                else:
+                    candidates = self._impact_list(term, plist)
+                boost = idf * (BM25_K1 + 1)
+                get = scores.get
+                for doc_id in candidates:
+                    tf = plist[doc_id]
+                    scores[doc_id] = get(doc_id, 0.0) + boost * tf / (tf + norm + norm_per_len * doc_len[doc_id])
+
+            top = heapq.nlargest(limit, scores.items(), key=lambda kv: kv[1])
+
+        results = []
+        for doc_id, score in top:
+            entry = self.post_index.get(slugs[doc_id]) if doc_id in slugs else None
+            if entry:
+                results.append({
+                    "slug": entry["slug"],
+                    "title": entry["title"],
+                    "date": entry["date"],
+                    "summary": entry["summary"],
+                    "score": round(score, 4),
+                })
+        return results
+
+def get_search_index(blog_dir: str = "data/blog") -> SearchIndex:
+    return shared_index(SearchIndex, blog_dir)
@@ -1,41 +1,91 @@
-from typing import List, Optional
+import glob
+import json
+import os
+import threading
+from typing import List, Optional, Tuple
+from sqlalchemy import func
 from orchestrator.src.core.catalog.models import ProductModel, PriceModel, ProductSchema, PriceSchema
+from orchestrator.src.core.catalog.index import CatalogIndex
 from orchestrator.src.memory.sql_store import SQLStore
 from orchestrator.src.logging.logger import get_logger
 
 logger = get_logger(__name__)
 
 class CatalogAPI:
+    SLOT_PATH = "data/store/slots/*.json"
+
     def __init__(self):
         self.store = SQLStore()
-    
-    def get_products(self) -> List[ProductSchema]:
+        self._lock = threading.Lock()
+        self._signature: Optional[Tuple] = None
+        # Whether the current products came from the DB fallback rather than slot files
+        self._from_db = False
+        self._products: List[ProductSchema] = []
+        self._index = CatalogIndex([])
+
+    def _slot_signature(self) -> Tuple:
+        """Cheap change detector: (path, mtime, size) of every slot file."""
+        sig = []
+        for slot_file in sorted(glob.glob(self.SLOT_PATH)):
+            try:
+                st = os.stat(slot_file)
+                sig.append((slot_file, st.st_mtime_ns, st.st_size))
+            except OSError:
+                continue
+        return tuple(sig)
+
+    def _db_signature(self) -> Tuple:
+        """Cheap DB change detector for the fallback path: row count and highest id of products and prices."""
+        session = self.store.Session()
+        try:
+            products = session.query(func.count(ProductModel.id), func.max(ProductModel.id)).one()
+            prices = session.query(func.count(PriceModel.id), func.max(PriceModel.id)).one()
+            return tuple(products) + tuple(prices)
+        except Exception as e:
+            logger.warning(f"Catalog DB signature unavailable: {e}")
+            return ()
+        finally:
+            session.close()
+
+    @staticmethod
+    def _slot_to_schema(data: dict) -> ProductSchema:
+        """Slot files carry a flat price; lift it into `prices` so indexes and clients see one shape."""
+        if isinstance(data, ProductSchema):
+            return data
+        data = dict(data)
+        if not data.get("prices") and data.get("price") is not None:
+            data["prices"] = [PriceSchema(
+                product_id=data["id"],
+                price=float(data["price"]),
+                currency=data.get("currency", "USD"),
+                interval=data.get("interval", "one_time"),
+                stripe_price_id=data.get("stripe_price_id")
+            )]
+        return ProductSchema(**data)
+
+    def _load_products(self) -> List[ProductSchema]:
         """Fetch all products dynamically from the modular slots directory."""
-        import json
-        import glob
-        import os
-        
         all_products = []
-        slot_path = "data/store/slots/*.json"
-        
         try:
-            for slot_file in glob.glob(slot_path):
+            for slot_file in glob.glob(self.SLOT_PATH):
                 try:
                     with open(slot_file, 'r') as f:
                         data = json.load(f)
                         if isinstance(data, list):
-                            all_products.extend([ProductSchema(**p) if not isinstance(p, ProductSchema) else p for p in data])
+                            all_products.extend([self._slot_to_schema(p) for p in data])
                         else:
-                            all_products.append(ProductSchema(**data) if not isinstance(data, ProductSchema) else data)
+                            all_products.append(self._slot_to_schema(data))
                 except Exception as e:
                     logger.error(f"Skipping corrupt slot file {slot_file}: {e}")
             
             if all_products:
+                self._from_db = False
                 return all_products
         except Exception as e:
             logger.error(f"Catalog Expansion Error: {e}")
 
         # Fallback to DB if directory scan fails
+        self._from_db = True
         session = self.store.Session()
         try:
             products = session.query(ProductModel).all()
@@ -59,7 +109,47 @@ class CatalogAPI:
         finally:
             session.close()
 
+    def _refresh(self):
+        slots = self._slot_signature()
+        # With no usable slot files the products come from the DB, which then has to be watched too
+        signature = slots + ((self._db_signature(),) if self._from_db else ())
+        if signature == self._signature and self._signature is not None:
+            return
+        with self._lock:
+            if signature == self._signature and self._signature is not None:
+                return
+            # Read before loading, so a DB write racing the load shows up as a change next time
+            db_signature = self._db_signature()
+            products = self._load_products()
+            self._index = CatalogIndex(products)
+            self._products = products
+            self._signature = slots + ((db_signature,) if self._from_db else ())
+            logger.info(f"Catalog index rebuilt: {len(products)} products, {len(self._index.by_stripe_price)} prices")
+
+    def invalidate(self):
+        """Forces a reload on next access (e.g. after seeding the DB)."""
+        with self._lock:
+            self._signature = None
+
+    @property
+    def index(self) -> CatalogIndex:
+        self._refresh()
+        return self._index
+
+    def get_products(self) -> List[ProductSchema]:
+        self._refresh()
+        return list(self._products)
+
+    def query_products(self, category: Optional[str] = None, min_price: Optional[float] = None, max_price: Optional[float] = None) -> List[ProductSchema]:
+        return self.index.query(category=category, min_price=min_price, max_price=max_price)
+
+    def resolve_price(self, price_id: str) -> Optional[Tuple[ProductSchema, PriceSchema]]:
+        return self.index.resolve_price(price_id)
+
     def get_product(self, product_id: str) -> Optional[ProductSchema]:
+        indexed = self.index.get(product_id)
+        if indexed:
+            return indexed
         session = self.store.Session()
         try:
             p = session.query(ProductModel).filter_by(id=product_id).first()
@@ -0,0 +1,82 @@
+import bisect
+from typing import Dict, List, Optional, Tuple
+from orchestrator.src.core.catalog.models import ProductSchema, PriceSchema
+
+SUBSCRIPTION_INTERVALS = ("day", "week", "month", "year")
+
+class CatalogIndex:
+    """
+    In-memory lookup tables over a catalog snapshot.
+    Built once per catalog reload; every lookup afterwards is a dict hit or a bisect.
+    """
+
+    def __init__(self, products: List[ProductSchema]):
+        self.by_id: Dict[str, ProductSchema] = {}
+        self.by_stripe_price: Dict[str, Tuple[ProductSchema, PriceSchema]] = {}
+        self.by_category: Dict[str, List[str]] = {}
+        # Parallel sorted arrays: (amount, product_id) for range queries
+        self._amounts: List[float] = []
+        self._amount_ids: List[str] = []
+
+        entries = []
+        for p in products:
+            self.by_id[p.id] = p
+            self.by_category.setdefault(p.category.lower(), []).append(p.id)
+            for pr in p.prices:
+                if pr.stripe_price_id and pr.stripe_price_id != "pending":
+                    self.by_stripe_price[pr.stripe_price_id] = (p, pr)
+                entries.append((pr.price, p.id))
+
+        entries.sort()
+        self._amounts = [e[0] for e in entries]
+        self._amount_ids = [e[1] for e in entries]
+
+    def __len__(self) -> int:
+        return len(self.by_id)
+
+    def get(self, product_id: str) -> Optional[ProductSchema]:
+        return self.by_id.get(product_id)
+
+    def resolve_price(self, price_id: str) -> Optional[Tuple[ProductSchema, PriceSchema]]:
+        """Resolves a Stripe price id (or a bare product id) to its product and price."""
+        if not price_id:
+            return None
+        hit = self.by_stripe_price.get(price_id)
+        if hit:
+            return hit
+        product = self.by_id.get(price_id)
+        if product and product.prices:
+            return product, product.prices[0]
+        return None
+
+    def query(
+        self,
+        category: Optional[str] = None,
+        min_price: Optional[float] = None,
+        max_price: Optional[float] = None
+    ) -> List[ProductSchema]:
+        """Filters by category and price range. Results are ordered by lowest matching price."""
+        lo = 0 if min_price is None else bisect.bisect_left(self._amounts, min_price)
+        hi = len(self._amounts) if max_price is None else bisect.bisect_right(self._amounts, max_price)
+
+        candidates = self.by_category.get(category.lower(), []) if category else list(self.by_id)
+        allowed = set(candidates) if category else None
+
+        seen = set()
+        results = []
+        for product_id in self._amount_ids[lo:hi]:
+            if product_id in seen or (allowed is not None and product_id not in allowed):
+                continue
+            seen.add(product_id)
+            results.append(self.by_id[product_id])
+
+        # Products without prices only match unbounded queries
+        if min_price is None and max_price is None:
+            for product_id in candidates:
+                if product_id not in seen and not self.by_id[product_id].prices:
+                    results.append(self.by_id[product_id])
+        return results
+
+def checkout_mode(price: PriceSchema) -> str:
+    """Stripe Checkout mode for a price: recurring intervals are subscriptions."""
+    return "subscription" if (price.interval or "").lower() in SUBSCRIPTION_INTERVALS else "payment"
@@ -43,3 +43,7 @@ class ProductSchema(BaseModel):
     description: Optional[str] = None
     category: str
     prices: List[PriceSchema] = []
+    # Flat fields carried by modular slot files (data/store/slots)
+    price: Optional[float] = None
+    stripe_price_id: Optional[str] = None
+    checkout_url: Optional[str] = None
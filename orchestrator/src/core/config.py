@@ -1,6 +1,6 @@
 import os
 from pydantic_settings import BaseSettings, SettingsConfigDict
-from typing import Optional
+from typing import Dict, List, Optional
 from orchestrator.src.validation.schemas import DatabaseConfig, MarketingConfig
 
 class Settings(BaseSettings):
@@ -30,7 +30,114 @@ class Settings(BaseSettings):
     GROQ_BASE_URL: str = "https://api.groq.com/openai/v1"
     
     OPENAI_API_KEY: Optional[str] = None
-    
+    OPENAI_MODEL: str = "gpt-4o-mini"
+
+    # Async LLM calls: in-flight limits overall and per model (LLM_MODEL_CONCURRENCY='{"model": n}')
+    LLM_MAX_CONCURRENCY: int = 64
+    LLM_PER_MODEL_CONCURRENCY: int = 32
+    LLM_MODEL_CONCURRENCY: Dict[str, int] = {}
+    LLM_TIMEOUT_SECONDS: float = 60.0
+    LLM_KEEPALIVE_SECONDS: float = 30.0
+
+    # Response cache in front of the LLM provider
+    LLM_CACHE_ENABLED: bool = True
+    LLM_CACHE_PATH: str = "data/llm_cache.sqlite3"
+    LLM_CACHE_TTL_SECONDS: int = 86400
+    LLM_CACHE_MEMORY_ITEMS: int = 1024
+
+    # Client-side rate limiting (0 disables a bucket; the token limit adapts to response headers)
+    LLM_REQUESTS_PER_MINUTE: int = 30
+    LLM_TOKENS_PER_MINUTE: int = 6000
+    LLM_RATE_LIMIT_MAX_WAIT_SECONDS: float = 30.0
+    LLM_MAX_RETRIES: int = 3
+    LLM_BACKOFF_BASE_SECONDS: float = 0.5
+    LLM_BACKOFF_MAX_SECONDS: float = 20.0
+    # False: API errors and throttling raise instead of returning mock text
+    LLM_MOCK_FALLBACK: bool = True
+
+    # Prompt assembly: prompt token budget per model (LLM_PROMPT_BUDGETS='{"model": n}'),
+    # cap on RAG context inside it, and how many memory snippets to recall before trimming
+    LLM_PROMPT_BUDGET_TOKENS: int = 6000
+    LLM_PROMPT_BUDGETS: Dict[str, int] = {}
+    LLM_CONTEXT_MAX_TOKENS: int = 1200
+    LLM_CONTEXT_SNIPPETS: int = 8
+
+    # Plan cache: recurring directives reuse a cached tool plan (parameters substituted) when
+    # their template is at least this similar, skipping the LLM round trip
+    LLM_PLAN_CACHE_ENABLED: bool = True
+    LLM_PLAN_CACHE_MIN_SIMILARITY: float = 0.8
+    LLM_PLAN_CACHE_MAX_PARAMS: int = 3
+    LLM_PLAN_CACHE_ITEMS: int = 512
+    LLM_PLAN_CACHE_TTL_SECONDS: int = 86400
+    # Threads shared by all plans for running independent tool steps concurrently
+    PLAN_STEP_WORKERS: int = 8
+
+    # Result cache for tools declaring themselves cacheable: LRU in memory plus an optional
+    # SQLite tier; TOOL_CACHE_TTLS='{"search": 600}' overrides a tool's own TTL
+    TOOL_CACHE_ENABLED: bool = True
+    TOOL_CACHE_PATH: str = "data/tool_cache.sqlite3"
+    TOOL_CACHE_DISK: bool = True
+    TOOL_CACHE_MEMORY_ITEMS: int = 2048
+    TOOL_CACHE_TTL_SECONDS: int = 3600
+    TOOL_CACHE_TTLS: Dict[str, int] = {}
+
+    # Multi-backend routing, active when OPENAI_API_KEY adds a second backend. Hedging sends a
+    # backup request once the chosen backend runs past its own p95 latency.
+    LLM_ROUTER_HEDGE: bool = True
+    LLM_ROUTER_WINDOW: int = 100
+    LLM_ROUTER_MAX_ERROR_RATE: float = 0.5
+    LLM_ROUTER_COOLDOWN_SECONDS: float = 30.0
+
+    # Circuit breaker per LLM backend: opens after N consecutive failures, lets trial calls
+    # through after the reset timeout, closes after that many trials succeed
+    LLM_BREAKER_FAILURE_THRESHOLD: int = 5
+    LLM_BREAKER_RESET_SECONDS: float = 30.0
+    LLM_BREAKER_HALF_OPEN_CALLS: int = 1
+    # Bulkheads: concurrent LLM calls each cell may hold (LLM_CELL_CONCURRENCY_OVERRIDES='{"ALPHA": n}')
+    LLM_CELL_CONCURRENCY: int = 16
+    LLM_CELL_CONCURRENCY_OVERRIDES: Dict[str, int] = {}
+    LLM_BULKHEAD_TIMEOUT_SECONDS: float = 30.0
+
+    # Model tiering: triage sends simple plans to the small tier and complex ones to the large
+    # tier; LLM_CELL_TIERS='{"BETA": {"complex": "small"}}' overrides the choice per cell.
+    # Off by default: without it every call uses GROQ_MODEL. With it, complex plans move to the
+    # large model (llama-3.3-70b costs ~10x the 8b default per token), so spend goes up for
+    # better plans; the per-tier report prices that against LLM_COST_BASELINE_MODEL.
+    LLM_TIERING_ENABLED: bool = False
+    # Groq model per tier; the small tier defaults to GROQ_MODEL
+    LLM_TIER_MODELS: Dict[str, str] = {"large": "llama-3.3-70b-versatile"}
+    # Other backends' model per tier (keyed by provider class), so a tiered call the router
+    # fails over or hedges to another backend asks it for the matching model
+    LLM_BACKEND_TIER_MODELS: Dict[str, Dict[str, str]] = {"OpenAIProvider": {"small": "gpt-4o-mini", "large": "gpt-4o"}}
+    LLM_CELL_TIERS: Dict[str, Dict[str, str]] = {}
+    # What the savings column compares against; None is GROQ_MODEL, the model every call used before tiering
+    LLM_COST_BASELINE_MODEL: Optional[str] = None
+    LLM_TRIAGE_COMPLEX_SCORE: int = 2
+    LLM_TRIAGE_LONG_TOKENS: int = 60
+    # "local" keyword routing, or "llm": ask the small tier when the keywords are unsure
+    LLM_CLASSIFIER: str = "local"
+    LLM_CLASSIFIER_MIN_CONFIDENCE: float = 0.5
+    # USD per million prompt/completion tokens, for the per-tier cost report
+    LLM_MODEL_PRICES: Dict[str, List[float]] = {
+        "llama-3.1-8b-instant": [0.05, 0.08],
+        "llama-3.3-70b-versatile": [0.59, 0.79],
+        "gpt-4o-mini": [0.15, 0.60],
+        "gpt-4o": [2.50, 10.00],
+    }
+
+    # LLM_PROVIDER=mock swaps the real backends for MockLLMProvider: seeded latency
+    # (fixed | lognormal | longtail), injected errors (error | throttle | timeout), token rate
+    LLM_PROVIDER: str = "groq"
+    LLM_MOCK_DISTRIBUTION: str = "lognormal"
+    LLM_MOCK_LATENCY_MS: float = 800.0
+    LLM_MOCK_SIGMA: float = 0.5
+    LLM_MOCK_TAIL_PROBABILITY: float = 0.02
+    LLM_MOCK_TAIL_MULTIPLIER: float = 10.0
+    LLM_MOCK_ERROR_RATE: float = 0.0
+    LLM_MOCK_ERROR_KIND: str = "error"
+    LLM_MOCK_TOKENS_PER_SECOND: float = 0.0
+    LLM_MOCK_SEED: int = 0
+
     # --- COMMUNICATION ---
     TWILIO_ACCOUNT_SID: Optional[str] = None
     TWILIO_AUTH_TOKEN: Optional[str] = None
@@ -54,6 +161,11 @@ class Settings(BaseSettings):
     ELEVENLABS_API_KEY: Optional[str] = None
     STABILITY_API_KEY: Optional[str] = None
     
+    # --- CONTENT ---
+    # What to do when a new report nearly repeats a published one: skip | merge | publish
+    BLOG_DUPLICATE_POLICY: str = "skip"
+    BLOG_DUPLICATE_THRESHOLD: float = 0.8
+
     # --- MONETIZATION ---
     STRIPE_API_KEY: Optional[str] = None
     STRIPE_WEBHOOK_SECRET: Optional[str] = None
@@ -1,16 +1,18 @@
 import hashlib
 import json
 from datetime import datetime
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 from orchestrator.src.validation.schemas import AgentConfig, TaskSpec
 from orchestrator.src.core.agent import Agent
+from orchestrator.src.core.model_tiers import TaskClassifier
 from orchestrator.src.logging.logger import get_logger
 
 logger = get_logger(__name__)
 
 class ForgeOrchestrator:
-    def __init__(self, agents: Dict[str, Agent]):
+    def __init__(self, agents: Dict[str, Agent], classifier: Optional[TaskClassifier] = None):
         self.agents = agents
+        self.classifier = classifier or TaskClassifier()
         self.agent_registry: List[Dict[str, Any]] = []
         self._register_agents()
 
@@ -85,5 +87,7 @@ class ForgeOrchestrator:
             logger.error(f"Forge failed to find agent {target_agent_id}")
             return {"status": "failed", "error": f"Target agent {target_agent_id} not found"}
             
-        logger.info(f"Forge routing task to {target_agent_id} (ID: {agent.config.id})")
-        return agent.process_task(task_spec)
+        # Tiers for forge tasks are configured under the "FORGE" key of LLM_CELL_TIERS
+        tier, model = self.classifier.plan_model("FORGE", task_spec.description)
+        logger.info(f"Forge routing task to {target_agent_id} (ID: {agent.config.id}, tier: {tier})")
+        return agent.process_task(task_spec, model)
@@ -0,0 +1,277 @@
+from typing import List, Dict, Any, Optional, Tuple, AsyncIterator
+from collections import OrderedDict
+import os
+import json
+import asyncio
+import time
+import sqlite3
+import hashlib
+import threading
+from orchestrator.src.core.llm_provider import BaseLLMProvider, LLMProviderWrapper, MockResponse
+from orchestrator.src.core.config import settings
+from orchestrator.src.logging.logger import get_logger
+
+logger = get_logger(__name__)
+
+class ResponseCache:
+    """
+    Two-tier completion cache: an in-process LRU in front of a SQLite file shared by every
+    process on the host. Entries expire after `ttl` seconds (or the ttl given to put) in both
+    tiers. With disk=False, or if the disk tier can't be opened, the cache works from memory alone.
+
+    The tiers have separate locks, so a memory lookup never waits behind a disk query; the
+    async aget/aput run the disk tier in a worker thread to keep SQLite off the event loop.
+    """
+
+    def __init__(self, path: Optional[str] = None, ttl: Optional[int] = None, max_items: Optional[int] = None, disk: bool = True):
+        self.path = path or settings.LLM_CACHE_PATH
+        self.ttl = ttl if ttl is not None else settings.LLM_CACHE_TTL_SECONDS
+        self.max_items = max_items or settings.LLM_CACHE_MEMORY_ITEMS
+        self._memory: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._db_lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+        self._disk_failed = not disk
+        self.counters = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "stores": 0, "bypassed": 0}
+
+    @staticmethod
+    def make_key(
+        namespace: str,
+        model: Optional[str],
+        messages: List[Dict[str, str]],
+        temperature: float,
+        max_tokens: Optional[int]
+    ) -> str:
+        payload = json.dumps([namespace, model, messages, temperature, max_tokens], sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    # --- disk tier (callers hold _db_lock) ---
+
+    def _connect(self) -> Optional[sqlite3.Connection]:
+        if self._db is not None or self._disk_failed:
+            return self._db
+        try:
+            if os.path.dirname(self.path):
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            db = sqlite3.connect(self.path, check_same_thread=False, timeout=5)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "key TEXT PRIMARY KEY, response TEXT NOT NULL, model TEXT, created REAL NOT NULL, expires REAL NOT NULL)"
+            )
+            db.execute("DELETE FROM responses WHERE expires < ?", (time.time(),))
+            db.commit()
+            self._db = db
+        except sqlite3.Error as e:
+            logger.warning(f"LLM cache disk tier unavailable, memory only: {e}")
+            self._disk_failed = True
+        return self._db
+
+    def _disk_get(self, key: str, now: float) -> Optional[Tuple[float, str]]:
+        with self._db_lock:
+            db = self._connect()
+            if db is None:
+                return None
+            try:
+                row = db.execute("SELECT response, expires FROM responses WHERE key = ?", (key,)).fetchone()
+            except sqlite3.Error as e:
+                logger.warning(f"LLM cache read failed: {e}")
+                return None
+        return (row[1], row[0]) if row and row[1] > now else None
+
+    def _disk_put(self, key: str, value: str, model: Optional[str], now: float, expires: float):
+        with self._db_lock:
+            db = self._connect()
+            if db is None:
+                return
+            try:
+                db.execute(
+                    "INSERT OR REPLACE INTO responses (key, response, model, created, expires) VALUES (?, ?, ?, ?, ?)",
+                    (key, value, model, now, expires)
+                )
+                db.commit()
+            except sqlite3.Error as e:
+                logger.warning(f"LLM cache write failed: {e}")
+
+    # --- memory tier ---
+
+    def _remember(self, key: str, expires: float, value: str):
+        self._memory[key] = (expires, value)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_items:
+            self._memory.popitem(last=False)
+
+    def _memory_get(self, key: str, now: float) -> Optional[str]:
+        with self._lock:
+            cached = self._memory.get(key)
+            if cached:
+                if cached[0] > now:
+                    self._memory.move_to_end(key)
+                    self.counters["memory_hits"] += 1
+                    return cached[1]
+                del self._memory[key]
+            return None
+
+    def _disk_result(self, key: str, row: Optional[Tuple[float, str]]) -> Optional[str]:
+        with self._lock:
+            if row is None:
+                self.counters["misses"] += 1
+                return None
+            self._remember(key, row[0], row[1])
+            self.counters["disk_hits"] += 1
+            return row[1]
+
+    def _store(self, key: str, value: str, ttl: Optional[int]) -> Tuple[float, float]:
+        now = time.time()
+        expires = now + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._remember(key, expires, value)
+            self.counters["stores"] += 1
+        return now, expires
+
+    # --- lookups ---
+
+    def get(self, key: str) -> Optional[str]:
+        now = time.time()
+        hit = self._memory_get(key, now)
+        if hit is not None:
+            return hit
+        return self._disk_result(key, self._disk_get(key, now))
+
+    async def aget(self, key: str) -> Optional[str]:
+        now = time.time()
+        hit = self._memory_get(key, now)
+        if hit is not None:
+            return hit
+        return self._disk_result(key, await asyncio.to_thread(self._disk_get, key, now))
+
+    def put(self, key: str, value: str, model: Optional[str] = None, ttl: Optional[int] = None):
+        now, expires = self._store(key, value, ttl)
+        self._disk_put(key, value, model, now, expires)
+
+    async def aput(self, key: str, value: str, model: Optional[str] = None, ttl: Optional[int] = None):
+        now, expires = self._store(key, value, ttl)
+        await asyncio.to_thread(self._disk_put, key, value, model, now, expires)
+
+    def bypass(self):
+        with self._lock:
+            self.counters["bypassed"] += 1
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+        with self._db_lock:
+            db = self._connect()
+            if db is not None:
+                db.execute("DELETE FROM responses")
+                db.commit()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            counters = dict(self.counters)
+            memory_items = len(self._memory)
+        lookups = counters["memory_hits"] + counters["disk_hits"] + counters["misses"]
+        hits = counters["memory_hits"] + counters["disk_hits"]
+        return {**counters, "memory_items": memory_items, "hit_rate": round(hits / lookups, 4) if lookups else 0.0}
+
+class CachedLLMProvider(LLMProviderWrapper):
+    """
+    Serves exact repeats of a (model, messages, temperature, max_tokens) call from the
+    response cache. Pass `cache=False` to force a fresh completion. Mock/fallback output is
+    never stored, so an API outage doesn't get replayed after it ends.
+    """
+
+    def __init__(self, inner: BaseLLMProvider, cache: Optional["ResponseCache"] = None):
+        super().__init__(inner)
+        self.cache = cache or get_response_cache()
+        # Different backends answer differently; keep their entries apart
+        self.namespace = inner.name
+
+    def _key(self, messages, model, temperature, max_tokens) -> str:
+        return ResponseCache.make_key(
+            self.namespace, model or getattr(self.inner, "default_model", None), messages, temperature, max_tokens
+        )
+
+    def generate_response(
+        self,
+        messages: List[Dict[str, str]],
+        model: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None,
+        cache: bool = True
+    ) -> str:
+        if not cache:
+            self.cache.bypass()
+            return self.inner.generate_response(messages, model=model, temperature=temperature, max_tokens=max_tokens)
+        key = self._key(messages, model, temperature, max_tokens)
+        hit = self.cache.get(key)
+        if hit is not None:
+            return hit
+        text = self.inner.generate_response(messages, model=model, temperature=temperature, max_tokens=max_tokens)
+        if text and not isinstance(text, MockResponse):
+            self.cache.put(key, text, model)
+        return text
+
+    async def agenerate_response(
+        self,
+        messages: List[Dict[str, str]],
+        model: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None,
+        cache: bool = True
+    ) -> str:
+        if not cache:
+            self.cache.bypass()
+            return await self.inner.agenerate_response(messages, model=model, temperature=temperature, max_tokens=max_tokens)
+        key = self._key(messages, model, temperature, max_tokens)
+        hit = await self.cache.aget(key)
+        if hit is not None:
+            return hit
+        text = await self.inner.agenerate_response(messages, model=model, temperature=temperature, max_tokens=max_tokens)
+        if text and not isinstance(text, MockResponse):
+            await self.cache.aput(key, text, model)
+        return text
+
+    async def astream_response(
+        self,
+        messages: List[Dict[str, str]],
+        model: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None,
+        cache: bool = True
+    ) -> AsyncIterator[str]:
+        """A hit arrives as a single delta; a miss streams through and is stored once complete."""
+        if not cache:
+            self.cache.bypass()
+            async for delta in self.inner.astream_response(messages, model=model, temperature=temperature, max_tokens=max_tokens):
+                yield delta
+            return
+        key = self._key(messages, model, temperature, max_tokens)
+        hit = await self.cache.aget(key)
+        if hit is not None:
+            yield hit
+            return
+        chunks: List[str] = []
+        mock = False
+        async for delta in self.inner.astream_response(messages, model=model, temperature=temperature, max_tokens=max_tokens):
+            chunks.append(delta)
+            mock = mock or isinstance(delta, MockResponse)
+            yield delta
+        text = "".join(chunks)
+        if text and not mock:
+            await self.cache.aput(key, text, model)
+
+    def stats(self) -> Dict[str, Any]:
+        return {**self.inner.stats(), "cache": self.cache.stats()}
+
+_response_cache: Optional[ResponseCache] = None
+_response_cache_lock = threading.Lock()
+
+def get_response_cache() -> ResponseCache:
+    """Process-wide cache, so every Orchestrator shares one memory tier."""
+    global _response_cache
+    with _response_cache_lock:
+        if _response_cache is None:
+            _response_cache = ResponseCache()
+        return _response_cache
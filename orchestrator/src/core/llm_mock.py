@@ -0,0 +1,220 @@
+from typing import List, Dict, Any, Optional, AsyncIterator
+from collections import Counter
+import re
+import math
+import json
+import time
+import random
+import asyncio
+import hashlib
+import threading
+from orchestrator.src.core.llm_provider import BaseLLMProvider, mock_payload
+from orchestrator.src.core.llm_ratelimit import RateLimiter, LLMThrottledError, estimate_tokens, get_rate_limiter
+from orchestrator.src.core.tokenizer import count_tokens, count_message_tokens
+from orchestrator.src.core.config import settings
+from orchestrator.src.logging.logger import get_logger
+
+logger = get_logger(__name__)
+
+DISTRIBUTIONS = ("fixed", "lognormal", "longtail")
+ERROR_KINDS = ("error", "throttle", "timeout")
+
+class MockLLMError(RuntimeError):
+    """Injected backend failure."""
+
+class MockLLMProvider(BaseLLMProvider):
+    """
+    Offline stand-in for a real backend with realistic timing, for load-testing the task
+    pipeline, thread pools and rate limiters.
+
+    Every call waits a sampled time-to-first-token, then streams its completion at
+    `tokens_per_second` (0 = all at once). Latency is `fixed`, `lognormal` around the
+    median `latency_ms`, or `longtail`: lognormal with `tail_probability` of calls slowed by
+    `tail_multiplier`. `error_rate` of calls fail with `error_kind`.
+
+    Runs are reproducible: the draws for a call come from the seed, the messages and how many
+    times those messages were sent before, so concurrent interleaving does not change them.
+    Output is the same canned plan as GroqProvider's mock mode but as plain text, so caches
+    and routers treat it like a real completion.
+
+    Calls go through a RateLimiter like GroqProvider's (by default one shared by all mock
+    backends, at the LLM_REQUESTS_PER_MINUTE / LLM_TOKENS_PER_MINUTE limits): each reserves its
+    estimated tokens, waits for its slot and settles with the simulated usage, and injected
+    throttles count as 429s. The backend is not `billable`, so the meter never prices it.
+    """
+    billable = False
+
+    def __init__(
+        self,
+        distribution: Optional[str] = None,
+        latency_ms: Optional[float] = None,
+        sigma: Optional[float] = None,
+        tail_probability: Optional[float] = None,
+        tail_multiplier: Optional[float] = None,
+        error_rate: Optional[float] = None,
+        error_kind: Optional[str] = None,
+        tokens_per_second: Optional[float] = None,
+        seed: Optional[int] = None,
+        default_model: str = "mock",
+        limiter: Optional[RateLimiter] = None
+    ):
+        self.distribution = distribution or settings.LLM_MOCK_DISTRIBUTION
+        self.latency_ms = settings.LLM_MOCK_LATENCY_MS if latency_ms is None else latency_ms
+        self.sigma = settings.LLM_MOCK_SIGMA if sigma is None else sigma
+        self.tail_probability = settings.LLM_MOCK_TAIL_PROBABILITY if tail_probability is None else tail_probability
+        self.tail_multiplier = settings.LLM_MOCK_TAIL_MULTIPLIER if tail_multiplier is None else tail_multiplier
+        self.error_rate = settings.LLM_MOCK_ERROR_RATE if error_rate is None else error_rate
+        self.error_kind = error_kind or settings.LLM_MOCK_ERROR_KIND
+        self.tokens_per_second = settings.LLM_MOCK_TOKENS_PER_SECOND if tokens_per_second is None else tokens_per_second
+        self.seed = settings.LLM_MOCK_SEED if seed is None else seed
+        self.default_model = default_model
+        self.limiter = limiter or get_rate_limiter("mock")
+        if self.distribution not in DISTRIBUTIONS:
+            raise ValueError(f"Unknown latency distribution {self.distribution!r}; expected one of {DISTRIBUTIONS}")
+        if self.error_kind not in ERROR_KINDS:
+            raise ValueError(f"Unknown error kind {self.error_kind!r}; expected one of {ERROR_KINDS}")
+        self._seen: Counter = Counter()
+        self._lock = threading.Lock()
+        self.counters = {"calls": 0, "errors": 0, "completion_tokens": 0}
+        self.simulated_seconds = 0.0
+
+    # --- sampling ---
+
+    def _rng(self, messages: List[Dict[str, str]], model: Optional[str]) -> random.Random:
+        digest = hashlib.sha256(json.dumps([model, messages], sort_keys=True).encode("utf-8")).hexdigest()
+        with self._lock:
+            occurrence = self._seen[digest]
+            self._seen[digest] += 1
+        return random.Random(f"{self.seed}:{digest}:{occurrence}")
+
+    def _first_token_delay(self, rng: random.Random) -> float:
+        median = self.latency_ms / 1000.0
+        if self.distribution == "fixed" or median <= 0:
+            return max(0.0, median)
+        delay = rng.lognormvariate(math.log(median), self.sigma)
+        if self.distribution == "longtail" and rng.random() < self.tail_probability:
+            delay *= self.tail_multiplier
+        return delay
+
+    def _plan(self, messages: List[Dict[str, str]], model: Optional[str]) -> Dict[str, Any]:
+        """Everything random about one call, drawn up front so sync, async and streaming agree."""
+        rng = self._rng(messages, model or self.default_model)
+        user_content = next((m["content"] for m in reversed(messages) if m["role"] == "user"), "")
+        text = mock_payload(user_content)
+        pieces = re.findall(r'\s*\S+(?:\s+$)?', text) or [text]
+        tokens = count_tokens(text)
+        per_piece = (tokens / self.tokens_per_second / len(pieces)) if self.tokens_per_second > 0 else 0.0
+        failed = rng.random() < self.error_rate
+        return {"delay": self._first_token_delay(rng), "failed": failed, "text": text, "pieces": pieces, "per_piece": per_piece, "tokens": tokens}
+
+    def _account(self, plan: Dict[str, Any], seconds: float):
+        with self._lock:
+            self.counters["calls"] += 1
+            self.simulated_seconds += seconds
+            if plan["failed"]:
+                self.counters["errors"] += 1
+            else:
+                self.counters["completion_tokens"] += plan["tokens"]
+
+    def _settle(self, plan: Dict[str, Any], messages: List[Dict[str, str]], estimate: int):
+        if not plan["failed"]:
+            self.limiter.settle(estimate, count_message_tokens(messages) + plan["tokens"])
+        elif self.error_kind == "throttle":
+            self.limiter.penalize({"retry-after": str(plan["delay"])})
+
+    def _error(self, plan: Dict[str, Any]) -> Exception:
+        if self.error_kind == "throttle":
+            return LLMThrottledError("Mock backend throttled", retry_after=plan["delay"])
+        if self.error_kind == "timeout":
+            return TimeoutError("Mock backend timed out")
+        return MockLLMError("Mock backend failed")
+
+    def _failure_delay(self, plan: Dict[str, Any]) -> float:
+        # Timeouts burn the whole client timeout; other errors come back at first-token speed
+        return settings.LLM_TIMEOUT_SECONDS if self.error_kind == "timeout" else plan["delay"]
+
+    # --- calls ---
+
+    def generate_response(
+        self,
+        messages: List[Dict[str, str]],
+        model: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None
+    ) -> str:
+        estimate = estimate_tokens(messages, max_tokens)
+        wait = self.limiter.reserve(estimate)
+        if wait:
+            time.sleep(wait)
+        plan = self._plan(messages, model)
+        if plan["failed"]:
+            delay = self._failure_delay(plan)
+            self._account(plan, delay)
+            time.sleep(delay)
+            self._settle(plan, messages, estimate)
+            raise self._error(plan)
+        total = plan["delay"] + plan["per_piece"] * len(plan["pieces"])
+        self._account(plan, total)
+        time.sleep(total)
+        self._settle(plan, messages, estimate)
+        return plan["text"]
+
+    async def agenerate_response(
+        self,
+        messages: List[Dict[str, str]],
+        model: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None
+    ) -> str:
+        estimate = estimate_tokens(messages, max_tokens)
+        wait = self.limiter.reserve(estimate)
+        if wait:
+            await asyncio.sleep(wait)
+        plan = self._plan(messages, model)
+        if plan["failed"]:
+            delay = self._failure_delay(plan)
+            self._account(plan, delay)
+            await asyncio.sleep(delay)
+            self._settle(plan, messages, estimate)
+            raise self._error(plan)
+        total = plan["delay"] + plan["per_piece"] * len(plan["pieces"])
+        self._account(plan, total)
+        await asyncio.sleep(total)
+        self._settle(plan, messages, estimate)
+        return plan["text"]
+
+    async def astream_response(
+        self,
+        messages: List[Dict[str, str]],
+        model: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None
+    ) -> AsyncIterator[str]:
+        estimate = estimate_tokens(messages, max_tokens)
+        wait = self.limiter.reserve(estimate)
+        if wait:
+            await asyncio.sleep(wait)
+        plan = self._plan(messages, model)
+        if plan["failed"]:
+            delay = self._failure_delay(plan)
+            self._account(plan, delay)
+            await asyncio.sleep(delay)
+            self._settle(plan, messages, estimate)
+            raise self._error(plan)
+        self._account(plan, plan["delay"] + plan["per_piece"] * len(plan["pieces"]))
+        await asyncio.sleep(plan["delay"])
+        for i, piece in enumerate(plan["pieces"]):
+            if i and plan["per_piece"]:
+                await asyncio.sleep(plan["per_piece"])
+            yield piece
+        self._settle(plan, messages, estimate)
+
+    def sample_latencies(self, n: int) -> List[float]:
+        """First-token delays (seconds) of n distinct calls, without sleeping: a preview of the distribution."""
+        rng = random.Random(f"{self.seed}:preview")
+        return [self._first_token_delay(rng) for _ in range(n)]
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            mock = {**self.counters, "simulated_seconds": round(self.simulated_seconds, 3), "distribution": self.distribution}
+        return {"mock": mock, "rate_limit": self.limiter.stats()}
@@ -1,12 +1,27 @@
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, AsyncIterator
 import os
-from groq import Groq
+import re
+import json
+import time
+import asyncio
+import threading
+import weakref
+import httpx
+from groq import Groq, AsyncGroq, RateLimitError
+from openai import OpenAI, AsyncOpenAI
 from orchestrator.src.core.config import settings
+from orchestrator.src.core.llm_ratelimit import RateLimiter, LLMThrottledError, estimate_tokens, get_rate_limiter
 from orchestrator.src.logging.logger import get_logger
 
 logger = get_logger(__name__)
 
+class MockResponse(str):
+    """Canned output from the mock fallback. Callers can tell it apart from a real completion (e.g. to never cache it)."""
+
+class FallbackResponse(MockResponse):
+    """Mock output returned because a real call failed, as opposed to deliberate mock mode (no API key)."""
+
 class BaseLLMProvider(ABC):
     @abstractmethod
     def generate_response(
@@ -19,23 +34,158 @@ class BaseLLMProvider(ABC):
         """Generate a completion from the LLM."""
         pass
 
+    async def agenerate_response(
+        self,
+        messages: List[Dict[str, str]],
+        model: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None
+    ) -> str:
+        """Awaitable completion. Providers without a native async client run the sync call in a worker thread."""
+        return await asyncio.to_thread(
+            self.generate_response, messages, model=model, temperature=temperature, max_tokens=max_tokens
+        )
+
+    async def astream_response(
+        self,
+        messages: List[Dict[str, str]],
+        model: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None
+    ) -> AsyncIterator[str]:
+        """Completion as incremental text deltas. Providers that can't stream yield the whole answer as one delta."""
+        yield await self.agenerate_response(messages, model=model, temperature=temperature, max_tokens=max_tokens)
+
+    async def aclose(self):
+        """Releases pooled connections, if the provider holds any."""
+        pass
+
+    def stats(self) -> Dict[str, Any]:
+        """Provider-side counters (cache hit rates and the like) for telemetry."""
+        return {}
+
+    @property
+    def name(self) -> str:
+        """Identifies the backend that actually answers; wrappers report their inner provider."""
+        return type(self).__qualname__
+
+class LLMProviderWrapper(BaseLLMProvider):
+    """Base for layers stacked in front of a provider (cache, coalescing, ...). Delegates by default."""
+
+    def __init__(self, inner: BaseLLMProvider):
+        self.inner = inner
+
+    def __getattr__(self, name: str):
+        # default_model, client, ... of the wrapped provider
+        return getattr(self.inner, name)
+
+    @property
+    def name(self) -> str:
+        return self.inner.name
+
+    def generate_response(
+        self,
+        messages: List[Dict[str, str]],
+        model: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None
+    ) -> str:
+        return self.inner.generate_response(messages, model=model, temperature=temperature, max_tokens=max_tokens)
+
+    async def agenerate_response(
+        self,
+        messages: List[Dict[str, str]],
+        model: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None
+    ) -> str:
+        return await self.inner.agenerate_response(messages, model=model, temperature=temperature, max_tokens=max_tokens)
+
+    async def astream_response(
+        self,
+        messages: List[Dict[str, str]],
+        model: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None
+    ) -> AsyncIterator[str]:
+        async for delta in self.inner.astream_response(messages, model=model, temperature=temperature, max_tokens=max_tokens):
+            yield delta
+
+    async def aclose(self):
+        await self.inner.aclose()
+
+    def stats(self) -> Dict[str, Any]:
+        return self.inner.stats()
+
+class _AsyncPool:
+    """
+    Async client and concurrency slots for one event loop. asyncio semaphores and pooled
+    connections are bound to the loop that first uses them, so each loop gets its own.
+    """
+
+    def __init__(self, api_key: str, max_concurrency: int, model_limits: Dict[str, int], default_model_limit: int, on_response=None):
+        self.client = AsyncGroq(
+            api_key=api_key,
+            # Retries are ours (rate limiter backoff), not the SDK's
+            max_retries=0,
+            http_client=httpx.AsyncClient(
+                limits=httpx.Limits(
+                    max_connections=max_concurrency,
+                    max_keepalive_connections=max_concurrency,
+                    keepalive_expiry=settings.LLM_KEEPALIVE_SECONDS,
+                ),
+                timeout=httpx.Timeout(settings.LLM_TIMEOUT_SECONDS, connect=10.0),
+                follow_redirects=True,
+                event_hooks={"response": [on_response]} if on_response else None,
+            ),
+        )
+        self.global_slots = asyncio.Semaphore(max_concurrency)
+        self.model_limits = model_limits
+        self.default_model_limit = default_model_limit
+        self.model_slots: Dict[str, asyncio.Semaphore] = {}
+
+    def slots_for(self, model: str) -> asyncio.Semaphore:
+        if model not in self.model_slots:
+            self.model_slots[model] = asyncio.Semaphore(self.model_limits.get(model, self.default_model_limit))
+        return self.model_slots[model]
+
 class GroqProvider(BaseLLMProvider):
     def __init__(
         self, 
         api_key: Optional[str] = None, 
         base_url: Optional[str] = None,
-        default_model: Optional[str] = None
+        default_model: Optional[str] = None,
+        max_concurrency: Optional[int] = None,
+        model_concurrency: Optional[Dict[str, int]] = None,
+        limiter: Optional[RateLimiter] = None,
+        mock_fallback: Optional[bool] = None,
+        max_retries: Optional[int] = None
     ):
         self.api_key = api_key or settings.GROQ_API_KEY
         self.base_url = base_url or settings.GROQ_BASE_URL
         self.default_model = default_model or settings.GROQ_MODEL
+        self.max_concurrency = max_concurrency or settings.LLM_MAX_CONCURRENCY
+        self.model_concurrency = model_concurrency if model_concurrency is not None else dict(settings.LLM_MODEL_CONCURRENCY)
+        self._pools: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, _AsyncPool]" = weakref.WeakKeyDictionary()
+        self._pools_lock = threading.Lock()
+        self.limiter = limiter or get_rate_limiter(self.api_key)
+        self.mock_fallback = settings.LLM_MOCK_FALLBACK if mock_fallback is None else mock_fallback
+        self.max_retries = settings.LLM_MAX_RETRIES if max_retries is None else max_retries
         
         if not self.api_key or self.api_key == "placeholder":
             logger.warning("GROQ_API_KEY is not set or is a placeholder")
             # In production this might raise, in dev/test we might want to allow mock
             # raise ValueError("GROQ_API_KEY is required for GroqProvider")
             
-        self.client = Groq( api_key=settings.GROQ_API_KEY )
+        self.client = Groq(
+            api_key=self.api_key,
+            max_retries=0,
+            http_client=httpx.Client(
+                timeout=httpx.Timeout(settings.LLM_TIMEOUT_SECONDS, connect=10.0),
+                follow_redirects=True,
+                event_hooks={"response": [self._observe_response]},
+            ),
+        )
         
         logger.info(f"Initialized GroqProvider with model {self.default_model}")
 
@@ -49,86 +199,325 @@ class GroqProvider(BaseLLMProvider):
         target_model = model or self.default_model
         
         # --- MOCK FALLBACK ---
-        if not self.api_key or self.api_key == "placeholder":
+        if self._is_mock():
             user_content = next((m["content"] for m in reversed(messages) if m["role"] == "user"), "")
             return self._generate_mock_response(user_content)
 
         try:
-            completion = self.client.chat.completions.create(
-                model=target_model,
-                messages=messages, # type: ignore
-                temperature=temperature,
-                max_tokens=max_tokens,
-            )
-            content = completion.choices[0].message.content
-            return content if content else ""
+            return self._complete(target_model, messages, temperature, max_tokens)
         except Exception as e:
-            logger.error(f"Groq API call failed: {e}")
-            # Even if API fails, return mock in dev mode to prevent system hang
-            return self._generate_mock_response("API_ERROR_FALLBACK")
+            return self._fallback(e)
+
+    def _complete(self, target_model: str, messages: List[Dict[str, str]], temperature: float, max_tokens: Optional[int]) -> str:
+        estimate = estimate_tokens(messages, max_tokens)
+        attempt = 0
+        while True:
+            wait = self.limiter.reserve(estimate)
+            if wait:
+                time.sleep(wait)
+            try:
+                completion = self.client.chat.completions.create(
+                    model=target_model,
+                    messages=messages, # type: ignore
+                    temperature=temperature,
+                    max_tokens=max_tokens,
+                )
+            except RateLimitError as e:
+                time.sleep(self._throttled(e, target_model, attempt))
+                attempt += 1
+                continue
+            return self._content(completion, estimate)
+
+    def _throttled(self, error: RateLimitError, target_model: str, attempt: int) -> float:
+        """Books a 429 with the limiter and returns the delay before the next attempt, or raises once retries run out."""
+        retry_after = self.limiter.penalize(error.response.headers)
+        if attempt >= self.max_retries:
+            raise LLMThrottledError(f"Groq throttled {target_model} after {attempt + 1} attempts", retry_after=retry_after) from error
+        delay = self.limiter.backoff(attempt, retry_after)
+        logger.warning(f"Groq throttled {target_model}, retrying in {delay:.2f}s")
+        return delay
+
+    def _content(self, completion: Any, estimate: int) -> str:
+        usage = getattr(completion, "usage", None)
+        self.limiter.settle(estimate, getattr(usage, "total_tokens", None))
+        content = completion.choices[0].message.content
+        return content if content else ""
+
+    def _fallback(self, error: Exception) -> str:
+        if not self.mock_fallback:
+            raise error
+        logger.error(f"Groq API call failed: {error}")
+        # Even if API fails, return mock in dev mode to prevent system hang
+        return FallbackResponse(self._mock_payload("API_ERROR_FALLBACK"))
+
+    def _observe_response(self, response: httpx.Response):
+        self.limiter.observe(response.headers)
+
+    async def _aobserve_response(self, response: httpx.Response):
+        self.limiter.observe(response.headers)
+
+    def _is_mock(self) -> bool:
+        return not self.api_key or self.api_key == "placeholder"
+
+    def _pool(self) -> _AsyncPool:
+        loop = asyncio.get_running_loop()
+        with self._pools_lock:
+            pool = self._pools.get(loop)
+            if pool is None:
+                pool = _AsyncPool(
+                    self.api_key, self.max_concurrency, self.model_concurrency, settings.LLM_PER_MODEL_CONCURRENCY,
+                    on_response=self._aobserve_response
+                )
+                self._pools[loop] = pool
+            return pool
+
+    async def agenerate_response(
+        self,
+        messages: List[Dict[str, str]],
+        model: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None
+    ) -> str:
+        target_model = model or self.default_model
+
+        if self._is_mock():
+            user_content = next((m["content"] for m in reversed(messages) if m["role"] == "user"), "")
+            return self._generate_mock_response(user_content)
+
+        try:
+            return await self._acomplete(self._pool(), target_model, messages, temperature, max_tokens)
+        except Exception as e:
+            return self._fallback(e)
+
+    async def _acomplete(
+        self, pool: _AsyncPool, target_model: str, messages: List[Dict[str, str]], temperature: float, max_tokens: Optional[int]
+    ) -> str:
+        estimate = estimate_tokens(messages, max_tokens)
+        attempt = 0
+        while True:
+            # Rate limit waits and backoff happen outside the concurrency slots
+            wait = self.limiter.reserve(estimate)
+            if wait:
+                await asyncio.sleep(wait)
+            try:
+                # Model slot first: a call queued behind a busy model must not hold a global slot
+                async with pool.slots_for(target_model), pool.global_slots:
+                    completion = await pool.client.chat.completions.create(
+                        model=target_model,
+                        messages=messages, # type: ignore
+                        temperature=temperature,
+                        max_tokens=max_tokens,
+                    )
+            except RateLimitError as e:
+                await asyncio.sleep(self._throttled(e, target_model, attempt))
+                attempt += 1
+                continue
+            return self._content(completion, estimate)
+
+    async def astream_response(
+        self,
+        messages: List[Dict[str, str]],
+        model: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None
+    ) -> AsyncIterator[str]:
+        """Streams the completion (stream=True) under the same rate limits and concurrency slots as agenerate_response."""
+        target_model = model or self.default_model
+
+        if self._is_mock():
+            user_content = next((m["content"] for m in reversed(messages) if m["role"] == "user"), "")
+            for piece in self._mock_stream(self._generate_mock_response(user_content)):
+                yield piece
+            return
+
+        started = False
+        try:
+            async for delta in self._astream(self._pool(), target_model, messages, temperature, max_tokens):
+                started = True
+                yield delta
+        except Exception as e:
+            # Half an answer can't be swapped for a mock one
+            if started:
+                raise
+            for piece in self._mock_stream(self._fallback(e)):
+                yield piece
+
+    async def _astream(
+        self, pool: _AsyncPool, target_model: str, messages: List[Dict[str, str]], temperature: float, max_tokens: Optional[int]
+    ) -> AsyncIterator[str]:
+        estimate = estimate_tokens(messages, max_tokens)
+        attempt = 0
+        while True:
+            wait = self.limiter.reserve(estimate)
+            if wait:
+                await asyncio.sleep(wait)
+            # The connection is busy until the last chunk, so the slots are held for the whole stream
+            async with pool.slots_for(target_model), pool.global_slots:
+                try:
+                    stream = await pool.client.chat.completions.create(
+                        model=target_model,
+                        messages=messages, # type: ignore
+                        temperature=temperature,
+                        max_tokens=max_tokens,
+                        stream=True,
+                    )
+                except RateLimitError as e:
+                    delay = self._throttled(e, target_model, attempt)
+                else:
+                    usage = None
+                    async for chunk in stream:
+                        if chunk.choices and chunk.choices[0].delta.content:
+                            yield chunk.choices[0].delta.content
+                        # Groq reports usage on the last chunk
+                        usage = getattr(getattr(chunk, "x_groq", None), "usage", None) or usage
+                    self.limiter.settle(estimate, getattr(usage, "total_tokens", None))
+                    return
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    @staticmethod
+    def _mock_stream(text: str) -> List[str]:
+        # Word-sized pieces, still marked as mock (or fallback) output
+        cls = type(text) if isinstance(text, MockResponse) else MockResponse
+        return [cls(piece) for piece in re.findall(r'\s*\S+(?:\s+$)?', text)] or [text]
+
+    async def aclose(self):
+        """Closes the pooled connections of the running loop's client."""
+        with self._pools_lock:
+            pool = self._pools.pop(asyncio.get_running_loop(), None)
+        if pool:
+            await pool.client.close()
+
+    def stats(self) -> Dict[str, Any]:
+        return {"rate_limit": self.limiter.stats()}
 
     def _generate_mock_response(self, user_prompt: str) -> str:
-        """Generates a semi-intelligent looking mock response for system demonstration."""
-        prompt_lower = user_prompt.lower()
-        
-        if "analyze" in prompt_lower or "report" in prompt_lower:
-            return json.dumps({
-                "reasoning": f"Automated analysis of {user_prompt}. Agents detected significant delta in neural weights.",
-                "steps": [
-                    {"tool_id": "search", "inputs": {"q": user_prompt}},
-                    {"tool_id": "file", "inputs": {"path": "data/analysis.txt", "content": "Simulated analysis results."}}
-                ]
-            })
-        
-        if "image" in prompt_lower or "visual" in prompt_lower:
-             return json.dumps({
-                "reasoning": "Visual cortex activated. Rendering asset based on prompt parameters.",
-                "steps": [
-                    {"tool_id": "image_gen", "inputs": {"prompt": user_prompt}}
-                ]
-            })
-
-        if "video" in prompt_lower or "teaser" in prompt_lower:
-             return json.dumps({
-                "reasoning": "Temporal synthesis engine engaged. Compiling video sequence.",
-                "steps": [
-                    {"tool_id": "video", "inputs": {"script": user_prompt}}
-                ]
-            })
-            
-        if "shard" in prompt_lower or "twitter" in prompt_lower or "social" in prompt_lower:
-             return json.dumps({
-                "reasoning": "Optimizing content for high-velocity social channels.",
-                "steps": [
-                    {"tool_id": "shard", "inputs": {"text": user_prompt}}
-                ]
-            })
-
-        if "fiscal" in prompt_lower or "revenue" in prompt_lower or "audit" in prompt_lower:
-             return json.dumps({
-                "reasoning": "Initiating fiscal integrity scan. Verifying cryptographic revenue ledger.",
-                "steps": [
-                    {"tool_id": "payments", "inputs": {"action": "verify_telemetry"}}
-                ]
-            })
-
-        if "outreach" in prompt_lower or "viral" in prompt_lower:
-             return json.dumps({
-                "reasoning": "Deploying viral outreach protocol. Targeting high-influence nodes.",
-                "steps": [
-                    {"tool_id": "social", "inputs": {"platform": "twitter", "content": "The Sovereign Era has arrived. Join the elite. #Realms2Riches"}}
-                ]
-            })
-
-        if "seo" in prompt_lower or "meta" in prompt_lower or "optimize" in prompt_lower:
-             return json.dumps({
-                "reasoning": "Analyzing search intent and keyword density. Generating high-CTR meta tags.",
-                "steps": [
-                    {"tool_id": "seo", "inputs": {"action": "optimize_meta", "content": user_prompt, "keywords": ["Sovereign", "AI", "Wealth"]}}
-                ]
-            })
+        return MockResponse(self._mock_payload(user_prompt))
+
+    def _mock_payload(self, user_prompt: str) -> str:
+        return mock_payload(user_prompt)
 
+def mock_payload(user_prompt: str) -> str:
+    """Generates a semi-intelligent looking mock response for system demonstration."""
+    prompt_lower = user_prompt.lower()
+    
+    if "analyze" in prompt_lower or "report" in prompt_lower:
         return json.dumps({
-            "reasoning": "Standard swarm operation initiated. Optimized pathways identified.",
-            "steps": []
+            "reasoning": f"Automated analysis of {user_prompt}. Agents detected significant delta in neural weights.",
+            "steps": [
+                {"tool_id": "search", "inputs": {"q": user_prompt}},
+                {"tool_id": "file", "inputs": {"path": "data/analysis.txt", "content": "Simulated analysis results."}}
+            ]
+        })
+    
+    if "image" in prompt_lower or "visual" in prompt_lower:
+         return json.dumps({
+            "reasoning": "Visual cortex activated. Rendering asset based on prompt parameters.",
+            "steps": [
+                {"tool_id": "image_gen", "inputs": {"prompt": user_prompt}}
+            ]
         })
+
+    if "video" in prompt_lower or "teaser" in prompt_lower:
+         return json.dumps({
+            "reasoning": "Temporal synthesis engine engaged. Compiling video sequence.",
+            "steps": [
+                {"tool_id": "video", "inputs": {"script": user_prompt}}
+            ]
+        })
+        
+    if "shard" in prompt_lower or "twitter" in prompt_lower or "social" in prompt_lower:
+         return json.dumps({
+            "reasoning": "Optimizing content for high-velocity social channels.",
+            "steps": [
+                {"tool_id": "shard", "inputs": {"text": user_prompt}}
+            ]
+        })
+
+    if "fiscal" in prompt_lower or "revenue" in prompt_lower or "audit" in prompt_lower:
+         return json.dumps({
+            "reasoning": "Initiating fiscal integrity scan. Verifying cryptographic revenue ledger.",
+            "steps": [
+                {"tool_id": "payments", "inputs": {"action": "verify_telemetry"}}
+            ]
+        })
+
+    if "outreach" in prompt_lower or "viral" in prompt_lower:
+         return json.dumps({
+            "reasoning": "Deploying viral outreach protocol. Targeting high-influence nodes.",
+            "steps": [
+                {"tool_id": "social", "inputs": {"platform": "twitter", "content": "The Sovereign Era has arrived. Join the elite. #Realms2Riches"}}
+            ]
+        })
+
+    if "seo" in prompt_lower or "meta" in prompt_lower or "optimize" in prompt_lower:
+         return json.dumps({
+            "reasoning": "Analyzing search intent and keyword density. Generating high-CTR meta tags.",
+            "steps": [
+                {"tool_id": "seo", "inputs": {"action": "optimize_meta", "content": user_prompt, "keywords": ["Sovereign", "AI", "Wealth"]}}
+            ]
+        })
+
+    return json.dumps({
+        "reasoning": "Standard swarm operation initiated. Optimized pathways identified.",
+        "steps": []
+    })
+
+class OpenAIProvider(BaseLLMProvider):
+    """
+    OpenAI chat completions, mainly as a second backend behind LLMRouter. There is no mock
+    fallback: failures raise so the router can count them and fail over.
+    """
+
+    def __init__(self, api_key: Optional[str] = None, default_model: Optional[str] = None):
+        self.api_key = api_key or settings.OPENAI_API_KEY
+        self.default_model = default_model or settings.OPENAI_MODEL
+        self.client = OpenAI(api_key=self.api_key, max_retries=0, timeout=settings.LLM_TIMEOUT_SECONDS)
+        self._async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, AsyncOpenAI]" = weakref.WeakKeyDictionary()
+        self._clients_lock = threading.Lock()
+        logger.info(f"Initialized OpenAIProvider with model {self.default_model}")
+
+    def generate_response(
+        self,
+        messages: List[Dict[str, str]],
+        model: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None
+    ) -> str:
+        completion = self.client.chat.completions.create(
+            model=model or self.default_model,
+            messages=messages, # type: ignore
+            temperature=temperature,
+            max_tokens=max_tokens,
+        )
+        return completion.choices[0].message.content or ""
+
+    def _async_client(self) -> AsyncOpenAI:
+        loop = asyncio.get_running_loop()
+        with self._clients_lock:
+            client = self._async_clients.get(loop)
+            if client is None:
+                client = AsyncOpenAI(api_key=self.api_key, max_retries=0, timeout=settings.LLM_TIMEOUT_SECONDS)
+                self._async_clients[loop] = client
+            return client
+
+    async def agenerate_response(
+        self,
+        messages: List[Dict[str, str]],
+        model: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None
+    ) -> str:
+        completion = await self._async_client().chat.completions.create(
+            model=model or self.default_model,
+            messages=messages, # type: ignore
+            temperature=temperature,
+            max_tokens=max_tokens,
+        )
+        return completion.choices[0].message.content or ""
+
+    async def aclose(self):
+        with self._clients_lock:
+            client = self._async_clients.pop(asyncio.get_running_loop(), None)
+        if client:
+            await client.close()
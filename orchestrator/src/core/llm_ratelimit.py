@@ -0,0 +1,188 @@
+from typing import List, Dict, Any, Optional, Mapping
+import re
+import time
+import random
+import threading
+from orchestrator.src.core.config import settings
+from orchestrator.src.core.tokenizer import count_message_tokens
+from orchestrator.src.logging.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Completion size assumed when the caller sets no max_tokens; corrected from usage afterwards
+DEFAULT_COMPLETION_ESTIMATE = 256
+# AIMD on the refill rate: halve on every 429, win back 5% of the configured rate per success
+THROTTLE_FLOOR = 0.1
+THROTTLE_DECREASE = 0.5
+THROTTLE_INCREASE = 0.05
+_DURATION_RE = re.compile(r'(\d+(?:\.\d+)?)(ms|h|m|s)')
+
+class LLMThrottledError(RuntimeError):
+    """Raised instead of returning mock output when the provider keeps throttling us."""
+
+    def __init__(self, message: str, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+def estimate_tokens(messages: List[Dict[str, str]], max_tokens: Optional[int] = None) -> int:
+    """Prompt + completion size used to reserve tokens/min up front."""
+    return count_message_tokens(messages) + (max_tokens or DEFAULT_COMPLETION_ESTIMATE)
+
+def parse_duration(value: Optional[str]) -> Optional[float]:
+    """Seconds from a Retry-After / x-ratelimit-reset value ("12", "7.66s", "2m59.56s", "120ms")."""
+    if not value:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    parts = _DURATION_RE.findall(value)
+    if not parts:
+        return None
+    scale = {"h": 3600.0, "m": 60.0, "s": 1.0, "ms": 0.001}
+    return sum(float(n) * scale[unit] for n, unit in parts)
+
+def _header_int(headers: Mapping[str, str], name: str) -> Optional[int]:
+    try:
+        return int(float(headers[name]))
+    except (KeyError, TypeError, ValueError):
+        return None
+
+class TokenBucket:
+    """Per-minute budget refilled continuously. The level may go negative: that is debt owed by queued callers."""
+
+    def __init__(self, per_minute: float):
+        self.capacity = float(per_minute)
+        self.rate = self.capacity / 60.0
+        self.level = self.capacity
+        self.stamp = time.monotonic()
+
+    def refill(self, now: float, throttle: float = 1.0):
+        self.level = min(self.capacity, self.level + (now - self.stamp) * self.rate * throttle)
+        self.stamp = now
+
+    def wait_for(self, amount: float, throttle: float = 1.0) -> float:
+        shortfall = amount - self.level
+        return shortfall / (self.rate * throttle) if shortfall > 0 else 0.0
+
+class RateLimiter:
+    """
+    Client-side requests/min and tokens/min limiter shared by the sync and async paths.
+
+    Each caller reserves its request and estimated tokens under one lock and is told how long
+    to sleep before sending. Buckets go into debt, so a later caller always waits longer than an
+    earlier one: callers are served in arrival order and no one is starved by a burst behind
+    them. Response headers tighten the buckets to what the server reports, and a 429 blocks all
+    callers for Retry-After and halves the refill rate until successes win it back.
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: Optional[int] = None,
+        tokens_per_minute: Optional[int] = None,
+        max_wait: Optional[float] = None
+    ):
+        rpm = settings.LLM_REQUESTS_PER_MINUTE if requests_per_minute is None else requests_per_minute
+        tpm = settings.LLM_TOKENS_PER_MINUTE if tokens_per_minute is None else tokens_per_minute
+        self.requests = TokenBucket(rpm) if rpm else None
+        self.tokens = TokenBucket(tpm) if tpm else None
+        self.max_wait = settings.LLM_RATE_LIMIT_MAX_WAIT_SECONDS if max_wait is None else max_wait
+        self.throttle = 1.0
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+        self.counters = {"admitted": 0, "delayed": 0, "rejected": 0, "throttled": 0, "retries": 0}
+        self.wait_seconds = 0.0
+
+    def _buckets(self, tokens: int):
+        return [(b, n) for b, n in ((self.requests, 1), (self.tokens, tokens)) if b is not None]
+
+    def reserve(self, tokens: int) -> float:
+        """Claims one request and `tokens` tokens; returns the seconds to sleep before sending."""
+        with self._lock:
+            now = time.monotonic()
+            wait = max(0.0, self._blocked_until - now)
+            buckets = self._buckets(tokens)
+            for bucket, amount in buckets:
+                bucket.refill(now, self.throttle)
+                wait = max(wait, bucket.wait_for(amount, self.throttle))
+            if wait > self.max_wait:
+                self.counters["rejected"] += 1
+                raise LLMThrottledError(f"LLM rate limit: next slot in {wait:.1f}s exceeds {self.max_wait:.0f}s", retry_after=wait)
+            for bucket, amount in buckets:
+                bucket.level -= amount
+            self.counters["admitted"] += 1
+            if wait > 0:
+                self.counters["delayed"] += 1
+                self.wait_seconds += wait
+            return wait
+
+    def settle(self, estimated: int, actual: Optional[int]):
+        """Corrects a reservation once the response reports real usage."""
+        with self._lock:
+            if self.tokens is not None and actual is not None:
+                self.tokens.level = min(self.tokens.capacity, self.tokens.level + estimated - actual)
+            self.throttle = min(1.0, self.throttle + THROTTLE_INCREASE)
+
+    def observe(self, headers: Mapping[str, str]):
+        """Adopts the server's view from x-ratelimit-* response headers."""
+        limit_tokens = _header_int(headers, "x-ratelimit-limit-tokens")
+        remaining_tokens = _header_int(headers, "x-ratelimit-remaining-tokens")
+        remaining_requests = _header_int(headers, "x-ratelimit-remaining-requests")
+        if limit_tokens is None and remaining_tokens is None and remaining_requests is None:
+            return
+        with self._lock:
+            now = time.monotonic()
+            if self.tokens is not None:
+                if limit_tokens and limit_tokens != self.tokens.capacity:
+                    # Groq reports tokens per minute
+                    self.tokens.capacity = float(limit_tokens)
+                    self.tokens.rate = limit_tokens / 60.0
+                if remaining_tokens is not None:
+                    self.tokens.refill(now, self.throttle)
+                    self.tokens.level = min(self.tokens.level, remaining_tokens)
+            if remaining_requests == 0:
+                # The request limit window can be a day long; wait it out rather than guess a rate
+                reset = parse_duration(headers.get("x-ratelimit-reset-requests"))
+                if reset:
+                    self._blocked_until = max(self._blocked_until, now + reset)
+
+    def penalize(self, headers: Optional[Mapping[str, str]] = None) -> Optional[float]:
+        """Records a 429. Returns the server's Retry-After in seconds, if it sent one."""
+        retry_after = parse_duration((headers or {}).get("retry-after"))
+        with self._lock:
+            self.counters["throttled"] += 1
+            self.throttle = max(THROTTLE_FLOOR, self.throttle * THROTTLE_DECREASE)
+            if retry_after:
+                self._blocked_until = max(self._blocked_until, time.monotonic() + retry_after)
+        return retry_after
+
+    def backoff(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        """Jittered exponential delay before retry number `attempt` (0-based), never shorter than Retry-After."""
+        ceiling = min(settings.LLM_BACKOFF_MAX_SECONDS, settings.LLM_BACKOFF_BASE_SECONDS * (2 ** attempt))
+        delay = random.uniform(ceiling / 2, ceiling)
+        with self._lock:
+            self.counters["retries"] += 1
+        return max(delay, retry_after or 0.0)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            now = time.monotonic()
+            return {
+                **self.counters,
+                "wait_seconds": round(self.wait_seconds, 3),
+                "throttle": round(self.throttle, 3),
+                "blocked_for": round(max(0.0, self._blocked_until - now), 3),
+                "requests_per_minute": self.requests.capacity if self.requests else None,
+                "tokens_per_minute": self.tokens.capacity if self.tokens else None,
+            }
+
+_rate_limiters: Dict[str, RateLimiter] = {}
+_rate_limiters_lock = threading.Lock()
+
+def get_rate_limiter(api_key: Optional[str]) -> RateLimiter:
+    """Limits belong to the API key, so every provider using the same key shares one limiter."""
+    key = api_key or ""
+    with _rate_limiters_lock:
+        if key not in _rate_limiters:
+            _rate_limiters[key] = RateLimiter()
+        return _rate_limiters[key]
@@ -0,0 +1,360 @@
+from typing import List, Dict, Any, Optional, AsyncIterator
+from collections import deque
+import time
+import asyncio
+import threading
+from orchestrator.src.core.llm_provider import BaseLLMProvider, LLMProviderWrapper, FallbackResponse, mock_payload
+from orchestrator.src.core.llm_cache import CachedLLMProvider
+from orchestrator.src.core.config import settings
+from orchestrator.src.logging.logger import get_logger
+
+logger = get_logger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+class CircuitOpenError(RuntimeError):
+    """The backend's circuit is open: the call was refused without touching the network."""
+
+    def __init__(self, message: str, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+class BulkheadFullError(RuntimeError):
+    """No LLM slot freed up for the cell within the bulkhead timeout."""
+
+class CircuitBreaker:
+    """
+    Closed: calls pass; `failure_threshold` consecutive failures open the circuit.
+    Open: calls are refused until `reset_timeout` has passed, then the circuit goes half-open.
+    Half-open: up to `half_open_calls` trial calls go through; that many successes close the
+    circuit again, a single failure re-opens it.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: Optional[int] = None,
+        reset_timeout: Optional[float] = None,
+        half_open_calls: Optional[int] = None
+    ):
+        self.name = name
+        self.failure_threshold = failure_threshold or settings.LLM_BREAKER_FAILURE_THRESHOLD
+        self.reset_timeout = settings.LLM_BREAKER_RESET_SECONDS if reset_timeout is None else reset_timeout
+        self.half_open_calls = half_open_calls or settings.LLM_BREAKER_HALF_OPEN_CALLS
+        self.state = CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trials = 0
+        self._trial_successes = 0
+        self._lock = threading.Lock()
+        self.counters = {"rejected": 0, "opened": 0}
+
+    def _transition(self, state: str):
+        if state != self.state:
+            logger.warning(f"Circuit {self.name}: {self.state} -> {state}")
+            self.state = state
+        if state == OPEN:
+            self._opened_at = time.monotonic()
+            self.counters["opened"] += 1
+        elif state == HALF_OPEN:
+            self._trials = 0
+            self._trial_successes = 0
+        else:
+            self._failures = 0
+
+    def allow(self):
+        """Admits a call or raises CircuitOpenError."""
+        with self._lock:
+            if self.state == OPEN:
+                remaining = self.reset_timeout - (time.monotonic() - self._opened_at)
+                if remaining > 0:
+                    self.counters["rejected"] += 1
+                    raise CircuitOpenError(f"Circuit {self.name} open, retry in {remaining:.1f}s", retry_after=remaining)
+                self._transition(HALF_OPEN)
+            if self.state == HALF_OPEN:
+                if self._trials >= self.half_open_calls:
+                    self.counters["rejected"] += 1
+                    raise CircuitOpenError(f"Circuit {self.name} half-open, trial calls in flight")
+                self._trials += 1
+
+    def record_success(self):
+        with self._lock:
+            if self.state == HALF_OPEN:
+                self._trial_successes += 1
+                if self._trial_successes >= self.half_open_calls:
+                    self._transition(CLOSED)
+            else:
+                self._failures = 0
+
+    def record_failure(self):
+        with self._lock:
+            if self.state == HALF_OPEN:
+                self._transition(OPEN)
+            elif self.state == CLOSED:
+                self._failures += 1
+                if self._failures >= self.failure_threshold:
+                    self._transition(OPEN)
+
+    def abandon(self):
+        """An admitted call ended without a verdict (cancelled): frees its half-open trial slot."""
+        with self._lock:
+            if self.state == HALF_OPEN and self._trials > 0:
+                self._trials -= 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"state": self.state, "consecutive_failures": self._failures, **self.counters}
+
+class CircuitBreakerProvider(LLMProviderWrapper):
+    """
+    Trips on exceptions and on fallback output (a backend that answered with mock text because
+    its real call failed). While open, calls fail fast: with LLM_MOCK_FALLBACK they get the
+    fallback text immediately instead of waiting on a dead dependency, without it they raise
+    CircuitOpenError. Deliberate mock mode (no API key) never counts as a failure.
+    """
+
+    def __init__(self, inner: BaseLLMProvider, breaker: Optional[CircuitBreaker] = None, mock_fallback: Optional[bool] = None):
+        super().__init__(inner)
+        self.breaker = breaker or CircuitBreaker(inner.name)
+        self.mock_fallback = settings.LLM_MOCK_FALLBACK if mock_fallback is None else mock_fallback
+
+    def _admit(self) -> Optional[str]:
+        try:
+            self.breaker.allow()
+        except CircuitOpenError:
+            if not self.mock_fallback:
+                raise
+            return FallbackResponse(mock_payload("API_ERROR_FALLBACK"))
+        return None
+
+    def _outcome(self, text: str) -> str:
+        if isinstance(text, FallbackResponse):
+            self.breaker.record_failure()
+        else:
+            self.breaker.record_success()
+        return text
+
+    def generate_response(
+        self,
+        messages: List[Dict[str, str]],
+        model: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None
+    ) -> str:
+        refused = self._admit()
+        if refused is not None:
+            return refused
+        try:
+            text = self.inner.generate_response(messages, model=model, temperature=temperature, max_tokens=max_tokens)
+        except Exception:
+            self.breaker.record_failure()
+            raise
+        return self._outcome(text)
+
+    async def agenerate_response(
+        self,
+        messages: List[Dict[str, str]],
+        model: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None
+    ) -> str:
+        refused = self._admit()
+        if refused is not None:
+            return refused
+        try:
+            text = await self.inner.agenerate_response(messages, model=model, temperature=temperature, max_tokens=max_tokens)
+        except asyncio.CancelledError:
+            # Says nothing about the backend
+            self.breaker.abandon()
+            raise
+        except Exception:
+            self.breaker.record_failure()
+            raise
+        return self._outcome(text)
+
+    async def astream_response(
+        self,
+        messages: List[Dict[str, str]],
+        model: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None
+    ) -> AsyncIterator[str]:
+        refused = self._admit()
+        if refused is not None:
+            yield refused
+            return
+        judged = False
+        try:
+            async for delta in self.inner.astream_response(messages, model=model, temperature=temperature, max_tokens=max_tokens):
+                if not judged:
+                    # The first delta tells a live backend from a fallback
+                    judged = True
+                    self._outcome(delta)
+                yield delta
+        except Exception:
+            if not judged:
+                judged = True
+                self.breaker.record_failure()
+            raise
+        finally:
+            if not judged:
+                self.breaker.abandon()
+
+    def stats(self) -> Dict[str, Any]:
+        return {**self.inner.stats(), "breaker": self.breaker.stats()}
+
+class _Waiter:
+    __slots__ = ("granted", "event", "loop", "future")
+
+    def __init__(self, loop: Optional[asyncio.AbstractEventLoop] = None):
+        self.granted = False
+        self.loop = loop
+        self.event = None if loop else threading.Event()
+        self.future = loop.create_future() if loop else None
+
+    def wake(self):
+        if self.loop is None:
+            self.event.set()
+        else:
+            self.loop.call_soon_threadsafe(lambda: self.future.done() or self.future.set_result(None))
+
+class Bulkhead:
+    """
+    Caps concurrent calls for one cell. Thread and asyncio callers share the same slots and
+    one FIFO queue; a freed slot is handed straight to the longest waiter, so no caller can
+    barge ahead. Waiting longer than `timeout` raises BulkheadFullError.
+    """
+
+    def __init__(self, name: str, limit: int, timeout: Optional[float] = None):
+        self.name = name
+        self.limit = limit
+        self.timeout = settings.LLM_BULKHEAD_TIMEOUT_SECONDS if timeout is None else timeout
+        self._active = 0
+        self._waiters: deque = deque()
+        self._lock = threading.Lock()
+        self.counters = {"admitted": 0, "queued": 0, "rejected": 0, "peak": 0}
+
+    def _try_enter(self, waiter: Optional[_Waiter]) -> bool:
+        # Caller holds the lock
+        if self._active < self.limit and not self._waiters:
+            self._active += 1
+            self.counters["admitted"] += 1
+            self.counters["peak"] = max(self.counters["peak"], self._active)
+            return True
+        if waiter is not None:
+            self._waiters.append(waiter)
+            self.counters["queued"] += 1
+        return False
+
+    def _give_up(self, waiter: _Waiter) -> bool:
+        """True if the waiter left the queue; False if it was granted a slot in the meantime."""
+        with self._lock:
+            if waiter.granted:
+                return False
+            self._waiters.remove(waiter)
+            self.counters["rejected"] += 1
+            return True
+
+    def acquire(self):
+        waiter = _Waiter()
+        with self._lock:
+            if self._try_enter(waiter):
+                return
+        if not waiter.event.wait(self.timeout) and self._give_up(waiter):
+            raise BulkheadFullError(f"Bulkhead {self.name}: no LLM slot within {self.timeout:.0f}s")
+
+    async def aacquire(self):
+        waiter = _Waiter(asyncio.get_running_loop())
+        with self._lock:
+            if self._try_enter(waiter):
+                return
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter.future), self.timeout)
+        except asyncio.TimeoutError:
+            if self._give_up(waiter):
+                raise BulkheadFullError(f"Bulkhead {self.name}: no LLM slot within {self.timeout:.0f}s")
+        except asyncio.CancelledError:
+            if not self._give_up(waiter):
+                self.release()
+            raise
+
+    def release(self):
+        with self._lock:
+            if self._waiters:
+                # Hand the slot over; _active stays the same
+                waiter = self._waiters.popleft()
+                waiter.granted = True
+                self.counters["admitted"] += 1
+                waiter.wake()
+            else:
+                self._active -= 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"limit": self.limit, "active": self._active, "waiting": len(self._waiters), **self.counters}
+
+class BulkheadLLMProvider(LLMProviderWrapper):
+    """
+    A cell's view of the shared provider: every call holds one of the cell's bulkhead slots.
+    `cache=False` is handed to the response cache below, when there is one, for a fresh completion.
+    """
+
+    def __init__(self, inner: BaseLLMProvider, bulkhead: Bulkhead):
+        super().__init__(inner)
+        self.bulkhead = bulkhead
+
+    def _options(self, cache: bool) -> Dict[str, Any]:
+        # Without a response cache below there is nothing to opt out of
+        return {} if cache or not isinstance(self.inner, CachedLLMProvider) else {"cache": False}
+
+    def generate_response(
+        self,
+        messages: List[Dict[str, str]],
+        model: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None,
+        cache: bool = True
+    ) -> str:
+        self.bulkhead.acquire()
+        try:
+            return self.inner.generate_response(messages, model=model, temperature=temperature, max_tokens=max_tokens, **self._options(cache))
+        finally:
+            self.bulkhead.release()
+
+    async def agenerate_response(
+        self,
+        messages: List[Dict[str, str]],
+        model: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None,
+        cache: bool = True
+    ) -> str:
+        await self.bulkhead.aacquire()
+        try:
+            return await self.inner.agenerate_response(messages, model=model, temperature=temperature, max_tokens=max_tokens, **self._options(cache))
+        finally:
+            self.bulkhead.release()
+
+    async def astream_response(
+        self,
+        messages: List[Dict[str, str]],
+        model: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None,
+        cache: bool = True
+    ) -> AsyncIterator[str]:
+        await self.bulkhead.aacquire()
+        try:
+            async for delta in self.inner.astream_response(messages, model=model, temperature=temperature, max_tokens=max_tokens, **self._options(cache)):
+                yield delta
+        finally:
+            self.bulkhead.release()
+
+    def stats(self) -> Dict[str, Any]:
+        return {**self.inner.stats(), "bulkhead": self.bulkhead.stats()}
+
+def cell_bulkhead(cell_key: str) -> Bulkhead:
+    limit = settings.LLM_CELL_CONCURRENCY_OVERRIDES.get(cell_key, settings.LLM_CELL_CONCURRENCY)
+    return Bulkhead(cell_key, max(1, limit))
@@ -0,0 +1,323 @@
+from typing import List, Dict, Any, Optional, AsyncIterator, Callable, Awaitable, Tuple
+from collections import deque
+import time
+import asyncio
+import threading
+from orchestrator.src.core.llm_provider import BaseLLMProvider, MockResponse
+from orchestrator.src.core.model_tiers import tier_of, backend_tier_model, served_model, served_by
+from orchestrator.src.core.config import settings
+from orchestrator.src.logging.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Samples a backend needs before its p95 is trusted as a hedge trigger or its error rate as a verdict
+MIN_SAMPLES = 10
+
+class _MockOnly(Exception):
+    """A backend answered with mock fallback text: a failure, but usable if nothing better comes."""
+
+    def __init__(self, text: str):
+        super().__init__("backend returned mock fallback output")
+        self.text = text
+
+class BackendStats:
+    """Rolling latency and outcome window for one backend."""
+
+    def __init__(self, window: int):
+        self.latencies: deque = deque(maxlen=window)
+        self.outcomes: deque = deque(maxlen=window)
+        self.calls = 0
+        self.unhealthy_until = 0.0
+
+    def record(self, ok: bool, latency: Optional[float] = None, cooldown: float = 0.0, max_error_rate: float = 1.0):
+        self.calls += 1
+        self.outcomes.append(ok)
+        if ok:
+            self.latencies.append(latency)
+        elif len(self.outcomes) >= MIN_SAMPLES and self.error_rate() > max_error_rate:
+            self.unhealthy_until = time.monotonic() + cooldown
+
+    def error_rate(self) -> float:
+        return (len(self.outcomes) - sum(self.outcomes)) / len(self.outcomes) if self.outcomes else 0.0
+
+    def percentile(self, q: float) -> Optional[float]:
+        if not self.latencies:
+            return None
+        ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+    def healthy(self) -> bool:
+        return time.monotonic() >= self.unhealthy_until
+
+    def snapshot(self) -> Dict[str, Any]:
+        p50, p95 = self.percentile(0.5), self.percentile(0.95)
+        return {
+            "calls": self.calls,
+            "p50_ms": round(p50 * 1000, 1) if p50 is not None else None,
+            "p95_ms": round(p95 * 1000, 1) if p95 is not None else None,
+            "error_rate": round(self.error_rate(), 4),
+            "healthy": self.healthy(),
+        }
+
+class LLMRouter(BaseLLMProvider):
+    """
+    Spreads calls over several backends. Each call goes to the healthy backend with the lowest
+    rolling median latency (backends without samples first, so they get measured); failures and
+    mock fallback output move on to the next one. A backend whose error rate crosses
+    LLM_ROUTER_MAX_ERROR_RATE sits out LLM_ROUTER_COOLDOWN_SECONDS.
+
+    On the async path a hedge goes to the runner-up once the chosen backend runs past its own
+    p95; whichever answers first wins and the other is cancelled. The sync path only fails over.
+
+    A call naming a model goes first to backends serving it (their default_model or `models`,
+    or their own model for the same tier per backend_tier_model); the others follow
+    with their default model, so tiered calls keep failover and hedging across backends.
+    """
+
+    def __init__(
+        self,
+        backends: List[BaseLLMProvider],
+        hedge: Optional[bool] = None,
+        window: Optional[int] = None,
+        max_error_rate: Optional[float] = None,
+        cooldown: Optional[float] = None
+    ):
+        if not backends:
+            raise ValueError("LLMRouter needs at least one backend")
+        self.backends = backends
+        self.hedge = settings.LLM_ROUTER_HEDGE if hedge is None else hedge
+        self.max_error_rate = settings.LLM_ROUTER_MAX_ERROR_RATE if max_error_rate is None else max_error_rate
+        self.cooldown = settings.LLM_ROUTER_COOLDOWN_SECONDS if cooldown is None else cooldown
+        window = window or settings.LLM_ROUTER_WINDOW
+        self._stats = [BackendStats(window) for _ in backends]
+        self._lock = threading.Lock()
+        self.counters = {"failovers": 0, "hedged": 0, "hedge_wins": 0}
+        # Two backends of the same class still need distinct labels in telemetry
+        labels: List[str] = []
+        for backend in backends:
+            label = backend.name
+            while label in labels:
+                label += "'"
+            labels.append(label)
+        self.labels = labels
+
+    @property
+    def default_model(self) -> Optional[str]:
+        return getattr(self.backends[0], "default_model", None)
+
+    # --- routing ---
+
+    def _backend_model(self, backend: BaseLLMProvider, model: Optional[str]) -> Tuple[bool, Optional[str]]:
+        """
+        Whether the backend serves `model`, and the model to ask it for: the model itself
+        (its default_model or one of its `models`), or its own model for the same tier
+        (backend_tier_model). A backend that serves neither gets None, its default.
+        """
+        if model is None or model == getattr(backend, "default_model", None) or model in (getattr(backend, "models", None) or ()):
+            return True, model
+        mapped = backend_tier_model(backend.name, tier_of(model))
+        return (True, mapped) if mapped else (False, None)
+
+    def _ranked(self, model: Optional[str]) -> List[Tuple[int, Optional[str]]]:
+        """(backend index, model to ask it for) in the order to try them."""
+        picks = [(i, *self._backend_model(backend, model)) for i, backend in enumerate(self.backends)]
+        if not any(serves for _, serves, _ in picks):
+            # Nobody claims the model: the first backend gets it, as before routing existed
+            picks[0] = (0, True, model)
+        with self._lock:
+            def key(pick):
+                i, serves, _ = pick
+                stats = self._stats[i]
+                p50 = stats.percentile(0.5)
+                # Backends serving the model first; the rest stay in line for failover and hedging
+                return (not serves, not stats.healthy(), p50 is not None, p50 or 0.0, i)
+            return [(i, backend_model) for i, _, backend_model in sorted(picks, key=key)]
+
+    def _served(self, i: int, backend_model: Optional[str]):
+        """Tell the meter above which model answered, so a failover is priced as what it cost."""
+        backend = self.backends[i]
+        served_model.set(served_by(backend, backend_model or getattr(backend, "default_model", None)))
+
+    def _record(self, i: int, ok: bool, latency: Optional[float] = None):
+        with self._lock:
+            was_healthy = self._stats[i].healthy()
+            self._stats[i].record(ok, latency, self.cooldown, self.max_error_rate)
+            if was_healthy and not self._stats[i].healthy():
+                logger.warning(f"LLM backend {self.labels[i]} unhealthy ({self._stats[i].error_rate():.0%} errors), benched for {self.cooldown:.0f}s")
+
+    def _count(self, counter: str):
+        with self._lock:
+            self.counters[counter] += 1
+
+    def _hedge_delay(self, i: int) -> Optional[float]:
+        with self._lock:
+            stats = self._stats[i]
+            return stats.percentile(0.95) if len(stats.latencies) >= MIN_SAMPLES else None
+
+    # --- sync ---
+
+    def generate_response(
+        self,
+        messages: List[Dict[str, str]],
+        model: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None
+    ) -> str:
+        error: Optional[Exception] = None
+        mock: Optional[str] = None
+        for attempt, (i, backend_model) in enumerate(self._ranked(model)):
+            if attempt:
+                self._count("failovers")
+            start = time.monotonic()
+            try:
+                text = self.backends[i].generate_response(messages, model=backend_model, temperature=temperature, max_tokens=max_tokens)
+            except Exception as e:
+                logger.warning(f"LLM backend {self.labels[i]} failed: {e}")
+                self._record(i, False)
+                error = e
+                continue
+            if isinstance(text, MockResponse):
+                self._record(i, False)
+                mock = mock or text
+                continue
+            self._record(i, True, time.monotonic() - start)
+            self._served(i, backend_model)
+            return text
+        return self._exhausted(error, mock)
+
+    def _exhausted(self, error: Optional[Exception], mock: Optional[str]) -> str:
+        if mock is not None:
+            return mock
+        raise error if error else RuntimeError("No LLM backend available")
+
+    # --- async ---
+
+    async def _timed(self, i: int, call: Callable[[], Awaitable[str]]) -> str:
+        start = time.monotonic()
+        try:
+            text = await call()
+        except asyncio.CancelledError:
+            # A hedge loser was cancelled: says nothing about the backend's health
+            raise
+        except Exception as e:
+            logger.warning(f"LLM backend {self.labels[i]} failed: {e}")
+            self._record(i, False)
+            raise
+        if isinstance(text, MockResponse):
+            self._record(i, False)
+            raise _MockOnly(text)
+        self._record(i, True, time.monotonic() - start)
+        return text
+
+    async def agenerate_response(
+        self,
+        messages: List[Dict[str, str]],
+        model: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None
+    ) -> str:
+        def start(pick: Tuple[int, Optional[str]]) -> asyncio.Task:
+            i, backend_model = pick
+            call = lambda: self.backends[i].agenerate_response(messages, model=backend_model, temperature=temperature, max_tokens=max_tokens)
+            task = asyncio.ensure_future(self._timed(i, call))
+            running[task] = pick
+            return task
+
+        queue = self._ranked(model)
+        running: Dict[asyncio.Task, Tuple[int, Optional[str]]] = {}
+        finished: Dict[asyncio.Task, Tuple[int, Optional[str]]] = {}
+        hedge: Optional[asyncio.Task] = None
+        error: Optional[Exception] = None
+        mock: Optional[str] = None
+        try:
+            while queue or running:
+                delay = None
+                if not running:
+                    first = error is None and mock is None
+                    if not first:
+                        self._count("failovers")
+                    pick = queue.pop(0)
+                    start(pick)
+                    # Only the first pick is hedged; a failover already is the second try
+                    if self.hedge and first and queue:
+                        delay = self._hedge_delay(pick[0])
+
+                done, _ = await asyncio.wait(running, timeout=delay, return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    self._count("hedged")
+                    hedge = start(queue.pop(0))
+                    continue
+
+                for task in done:
+                    finished[task] = running.pop(task)
+                    exc = task.exception()
+                    if isinstance(exc, _MockOnly):
+                        mock = mock or exc.text
+                    elif exc is not None:
+                        error = exc
+                winners = [task for task in done if task.exception() is None]
+                if winners:
+                    if winners[0] is hedge:
+                        self._count("hedge_wins")
+                    self._served(*finished[winners[0]])
+                    return winners[0].result()
+            return self._exhausted(error, mock)
+        finally:
+            # The slower side of a hedge, or everything if our caller was cancelled
+            for task in running:
+                task.cancel()
+
+    async def astream_response(
+        self,
+        messages: List[Dict[str, str]],
+        model: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None
+    ) -> AsyncIterator[str]:
+        """Streams from the first backend that produces a real first delta. Not hedged: a stream can't be raced and swapped."""
+        error: Optional[Exception] = None
+        mock: Optional[List[str]] = None
+        for attempt, (i, backend_model) in enumerate(self._ranked(model)):
+            if attempt:
+                self._count("failovers")
+            start = time.monotonic()
+            stream = self.backends[i].astream_response(messages, model=backend_model, temperature=temperature, max_tokens=max_tokens)
+            try:
+                first = await stream.__anext__()
+            except StopAsyncIteration:
+                first = ""
+            except Exception as e:
+                logger.warning(f"LLM backend {self.labels[i]} failed: {e}")
+                self._record(i, False)
+                error = e
+                continue
+            if isinstance(first, MockResponse):
+                self._record(i, False)
+                if mock is None:
+                    mock = [first] + [piece async for piece in stream]
+                else:
+                    await stream.aclose()
+                continue
+            # Time to first token is what a streaming caller waits on
+            self._record(i, True, time.monotonic() - start)
+            self._served(i, backend_model)
+            if first:
+                yield first
+            async for delta in stream:
+                yield delta
+            return
+        if mock is None:
+            raise error if error else RuntimeError("No LLM backend available")
+        for piece in mock:
+            yield piece
+
+    async def aclose(self):
+        for backend in self.backends:
+            await backend.aclose()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            routing = {label: stats.snapshot() for label, stats in zip(self.labels, self._stats)}
+            counters = dict(self.counters)
+        backends = {label: {**routing[label], **backend.stats()} for label, backend in zip(self.labels, self.backends)}
+        return {"router": {**counters, "backends": backends}}
@@ -0,0 +1,120 @@
+from typing import List, Dict, Any, Optional, Callable, Awaitable, Tuple
+import asyncio
+import threading
+from orchestrator.src.core.llm_provider import BaseLLMProvider, LLMProviderWrapper
+from orchestrator.src.core.llm_cache import ResponseCache
+from orchestrator.src.logging.logger import get_logger
+
+logger = get_logger(__name__)
+
+class _Call:
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+class SingleFlight:
+    """
+    Collapses concurrent calls with the same key into one execution whose outcome (result
+    or exception) every caller receives. Thread callers and asyncio callers are tracked
+    separately; on the async side the shared call runs as its own task, so a cancelled
+    waiter never cancels it for the others.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[str, _Call] = {}
+        self._tasks: Dict[Tuple[asyncio.AbstractEventLoop, str], asyncio.Task] = {}
+        self.counters = {"leaders": 0, "coalesced": 0}
+
+    def do(self, key: str, fn: Callable[[], Any]) -> Any:
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self.counters["leaders"] += 1
+            else:
+                self.counters["coalesced"] += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    async def ado(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        loop = asyncio.get_running_loop()
+        slot = (loop, key)
+        with self._lock:
+            task = self._tasks.get(slot)
+            if task is None:
+                task = loop.create_task(fn())
+                self._tasks[slot] = task
+                task.add_done_callback(lambda t, slot=slot: self._finish(slot, t))
+                self.counters["leaders"] += 1
+            else:
+                self.counters["coalesced"] += 1
+        return await asyncio.shield(task)
+
+    def _finish(self, slot: Tuple[asyncio.AbstractEventLoop, str], task: asyncio.Task):
+        with self._lock:
+            self._tasks.pop(slot, None)
+        if not task.cancelled():
+            task.exception()  # retrieved here in case every waiter was cancelled
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {**self.counters, "in_flight": len(self._calls) + len(self._tasks)}
+
+class CoalescingLLMProvider(LLMProviderWrapper):
+    """Identical concurrent completions share one upstream call."""
+
+    def __init__(self, inner: BaseLLMProvider, flights: Optional[SingleFlight] = None):
+        super().__init__(inner)
+        self.flights = flights or SingleFlight()
+
+    def _key(self, messages, model, temperature, max_tokens) -> str:
+        return ResponseCache.make_key(
+            self.inner.name, model or getattr(self.inner, "default_model", None), messages, temperature, max_tokens
+        )
+
+    def generate_response(
+        self,
+        messages: List[Dict[str, str]],
+        model: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None
+    ) -> str:
+        return self.flights.do(
+            self._key(messages, model, temperature, max_tokens),
+            lambda: self.inner.generate_response(messages, model=model, temperature=temperature, max_tokens=max_tokens)
+        )
+
+    async def agenerate_response(
+        self,
+        messages: List[Dict[str, str]],
+        model: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None
+    ) -> str:
+        return await self.flights.ado(
+            self._key(messages, model, temperature, max_tokens),
+            lambda: self.inner.agenerate_response(messages, model=model, temperature=temperature, max_tokens=max_tokens)
+        )
+
+    def stats(self) -> Dict[str, Any]:
+        return {**self.inner.stats(), "singleflight": self.flights.stats()}
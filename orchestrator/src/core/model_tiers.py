@@ -0,0 +1,273 @@
+from typing import List, Dict, Any, Optional, Tuple, AsyncIterator
+from collections import deque
+from contextvars import ContextVar
+import re
+import time
+import threading
+from orchestrator.src.core.llm_provider import BaseLLMProvider, LLMProviderWrapper, MockResponse
+from orchestrator.src.core.tokenizer import count_tokens, count_message_tokens
+from orchestrator.src.core.config import settings
+from orchestrator.src.logging.logger import get_logger
+
+logger = get_logger(__name__)
+
+SIMPLE = "simple"
+COMPLEX = "complex"
+DEFAULT_TIERS = {SIMPLE: "small", COMPLEX: "large"}
+
+# Word prefixes per cell. Ties go to the cell listed first; no hit at all goes to GAMMA.
+CELL_KEYWORDS: Dict[str, List[str]] = {
+    "ALPHA": ["build", "code", "fix", "logic", "infrastructure", "implement", "refactor", "deploy", "debug", "engineer"],
+    "BETA": ["post", "market", "shard", "outreach", "seo", "social", "campaign", "content", "blog", "growth"],
+    "GAMMA": ["strateg", "legal", "revenue", "integrity", "audit", "pricing", "compliance", "contract"],
+}
+DEFAULT_CELL = "GAMMA"
+
+# Work that needs the heavy model to plan well
+HEAVY_TERMS = ["analy", "architect", "design", "refactor", "migrat", "strateg", "audit", "integrat", "optimi", "security", "research", "compare"]
+_STEP_MARKERS = re.compile(r"\bthen\b|\band\b|;|\n|(?:^|\s)\d+[.)]\s", re.IGNORECASE)
+
+_CELL_PATTERNS = {cell: re.compile(r"\b(?:" + "|".join(words) + r")", re.IGNORECASE) for cell, words in CELL_KEYWORDS.items()}
+_HEAVY_PATTERN = re.compile(r"\b(?:" + "|".join(HEAVY_TERMS) + r")", re.IGNORECASE)
+
+_ROUTING_PROMPT = (
+    "Assign the task to exactly one cell. ALPHA: engineering, code, infrastructure. "
+    "BETA: marketing, social posts, content, SEO. GAMMA: strategy, legal, revenue, operations. "
+    "Answer with the cell name only."
+)
+
+# The model that actually answered the current call, set by the router (which may fail over
+# to another backend's model) and read by MeteredLLMProvider to price the call
+served_model: ContextVar[Optional[str]] = ContextVar("served_model", default=None)
+
+# served_model of calls answered by a backend that is not `billable` (the offline mock)
+UNBILLED_MODEL = "mock"
+
+def served_by(provider: BaseLLMProvider, model: Optional[str]) -> Optional[str]:
+    """What to report as served_model for a call `provider` answered with `model`."""
+    return model if getattr(provider, "billable", True) else UNBILLED_MODEL
+
+def tier_models() -> Dict[str, str]:
+    """Tier -> Groq model: LLM_TIER_MODELS, with the small tier defaulting to GROQ_MODEL."""
+    return {"small": settings.GROQ_MODEL, **settings.LLM_TIER_MODELS}
+
+def tier_model(tier: str) -> Optional[str]:
+    """Model serving `tier` (tier_models()); None leaves the backend's default."""
+    return tier_models().get(tier)
+
+def backend_tier_model(backend_name: str, tier: str) -> Optional[str]:
+    """A backend's own model for `tier`: tier_models() for Groq, LLM_BACKEND_TIER_MODELS for the rest."""
+    return {"GroqProvider": tier_models(), **settings.LLM_BACKEND_TIER_MODELS}.get(backend_name, {}).get(tier)
+
+def baseline_model() -> str:
+    """The model every call went to before tiering, which savings are measured against."""
+    return settings.LLM_COST_BASELINE_MODEL or settings.GROQ_MODEL
+
+def tier_of(model: Optional[str]) -> str:
+    """The tier a model belongs to, or the model name itself when no tier uses it."""
+    for tier, tier_model_name in tier_models().items():
+        if tier_model_name == model:
+            return tier
+    return model or "default"
+
+def cell_tier(cell_key: str, task_class: str) -> str:
+    """Tier for a task class in a cell: DEFAULT_TIERS overridden by LLM_CELL_TIERS[cell_key]."""
+    return {**DEFAULT_TIERS, **settings.LLM_CELL_TIERS.get(cell_key, {})}.get(task_class, DEFAULT_TIERS[COMPLEX])
+
+def call_cost(model: Optional[str], prompt_tokens: int, completion_tokens: int) -> float:
+    """USD for one call at LLM_MODEL_PRICES (per million prompt/completion tokens); unknown models cost 0."""
+    prompt_price, completion_price = settings.LLM_MODEL_PRICES.get(model or "", (0.0, 0.0))
+    return (prompt_tokens * prompt_price + completion_tokens * completion_price) / 1_000_000
+
+class TaskClassifier:
+    """
+    Cheap routing and plan triage for task descriptions: keyword scores pick the cell, a few
+    surface features decide whether planning needs the heavy model. Both run locally in
+    microseconds. With LLM_CLASSIFIER="llm", descriptions the keywords cannot place with
+    LLM_CLASSIFIER_MIN_CONFIDENCE are put to the small-tier model instead.
+    """
+
+    def __init__(self, provider: Optional[BaseLLMProvider] = None, mode: Optional[str] = None, min_confidence: Optional[float] = None):
+        self.provider = provider
+        self.mode = mode or settings.LLM_CLASSIFIER
+        self.min_confidence = settings.LLM_CLASSIFIER_MIN_CONFIDENCE if min_confidence is None else min_confidence
+        self._lock = threading.Lock()
+        self.counters: Dict[str, int] = {"routed": 0, "llm_routed": 0, SIMPLE: 0, COMPLEX: 0}
+
+    def _count(self, key: str):
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + 1
+
+    def route(self, description: str) -> Tuple[str, float]:
+        """(cell key, confidence in [0, 1]). Confidence is the winner's lead over the runner-up."""
+        self._count("routed")
+        scores = [(len(pattern.findall(description)), cell) for cell, pattern in _CELL_PATTERNS.items()]
+        ranked = sorted(scores, key=lambda s: -s[0])  # stable: ties keep CELL_KEYWORDS order
+        (top, cell), (second, _) = ranked[0], ranked[1]
+        if top == 0:
+            return DEFAULT_CELL, 0.0
+        return cell, (top - second) / top
+
+    async def aroute(self, description: str) -> Tuple[str, float]:
+        """route(), consulting the small-tier model when configured to and the keywords are unsure."""
+        cell, confidence = self.route(description)
+        if self.mode != "llm" or self.provider is None or confidence >= self.min_confidence:
+            return cell, confidence
+        messages = [{"role": "system", "content": _ROUTING_PROMPT}, {"role": "user", "content": description}]
+        try:
+            answer = await self.provider.agenerate_response(messages, model=tier_model("small"), temperature=0.0, max_tokens=4)
+        except Exception as e:
+            logger.warning(f"Routing classifier call failed, keeping keyword route {cell}: {e}")
+            return cell, confidence
+        match = re.search(r"\b(ALPHA|BETA|GAMMA)\b", answer.upper())
+        if isinstance(answer, MockResponse) or not match:
+            return cell, confidence
+        self._count("llm_routed")
+        return match.group(1), 1.0
+
+    def triage(self, description: str) -> str:
+        """SIMPLE or COMPLEX: heavy terms, step markers and length each add to the score."""
+        score = len(_HEAVY_PATTERN.findall(description)) + len(_STEP_MARKERS.findall(description))
+        if count_tokens(description) > settings.LLM_TRIAGE_LONG_TOKENS:
+            score += 1
+        task_class = COMPLEX if score >= settings.LLM_TRIAGE_COMPLEX_SCORE else SIMPLE
+        self._count(task_class)
+        return task_class
+
+    def plan_model(self, cell_key: str, description: str) -> Tuple[str, Optional[str]]:
+        """(tier, model) for planning the task in the cell; ("default", None) with tiering off."""
+        if not settings.LLM_TIERING_ENABLED:
+            return "default", None
+        tier = cell_tier(cell_key, self.triage(description))
+        return tier, tier_model(tier)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return dict(self.counters)
+
+class _TierStats:
+    def __init__(self, window: int):
+        self.calls = 0
+        self.mock = 0
+        self.errors = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.cost = 0.0
+        self.baseline_cost = 0.0
+        self.latencies: deque = deque(maxlen=window)
+
+    def percentile(self, q: float) -> Optional[float]:
+        if not self.latencies:
+            return None
+        ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+    def snapshot(self) -> Dict[str, Any]:
+        p50, p95 = self.percentile(0.5), self.percentile(0.95)
+        return {
+            "calls": self.calls,
+            "mock": self.mock,
+            "errors": self.errors,
+            "p50_ms": round(p50 * 1000, 1) if p50 is not None else None,
+            "p95_ms": round(p95 * 1000, 1) if p95 is not None else None,
+            "prompt_tokens": self.prompt_tokens,
+            "completion_tokens": self.completion_tokens,
+            "cost_usd": round(self.cost, 6),
+            "baseline_cost_usd": round(self.baseline_cost, 6),
+            "savings_usd": round(self.baseline_cost - self.cost, 6),
+        }
+
+class MeteredLLMProvider(LLMProviderWrapper):
+    """
+    Latency, tokens and cost per model tier. Cost is priced at LLM_MODEL_PRICES for the model
+    that served the call (after a router failover, the other backend's); the baseline is the
+    same tokens at baseline_model(), so savings show what tiering saved, or cost when negative,
+    over the pre-tiering default. Mock output, and anything a backend that is not `billable`
+    answered, is counted but never priced.
+    Sits below the cache and the coalescer, so only calls that reach a backend are metered.
+    """
+
+    def __init__(self, inner: BaseLLMProvider, window: int = 1000):
+        super().__init__(inner)
+        self.window = window
+        self._tiers: Dict[str, _TierStats] = {}
+        self._lock = threading.Lock()
+
+    def _record(self, model: Optional[str], messages: List[Dict[str, str]], text: Optional[str], elapsed: float):
+        model = model or getattr(self.inner, "default_model", None)
+        tier = tier_of(model)
+        model = served_model.get() or served_by(self.inner, model)
+        prompt_tokens = count_message_tokens(messages)
+        completion_tokens = count_tokens(text) if text is not None else 0
+        with self._lock:
+            stats = self._tiers.setdefault(tier, _TierStats(self.window))
+            stats.calls += 1
+            stats.latencies.append(elapsed)
+            if text is None:
+                stats.errors += 1
+            elif isinstance(text, MockResponse) or model == UNBILLED_MODEL:
+                stats.mock += 1
+            else:
+                stats.prompt_tokens += prompt_tokens
+                stats.completion_tokens += completion_tokens
+                stats.cost += call_cost(model, prompt_tokens, completion_tokens)
+                stats.baseline_cost += call_cost(baseline_model(), prompt_tokens, completion_tokens)
+
+    def generate_response(
+        self,
+        messages: List[Dict[str, str]],
+        model: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None
+    ) -> str:
+        start = time.perf_counter()
+        text = None
+        served_model.set(None)
+        try:
+            text = self.inner.generate_response(messages, model=model, temperature=temperature, max_tokens=max_tokens)
+            return text
+        finally:
+            self._record(model, messages, text, time.perf_counter() - start)
+
+    async def agenerate_response(
+        self,
+        messages: List[Dict[str, str]],
+        model: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None
+    ) -> str:
+        start = time.perf_counter()
+        text = None
+        served_model.set(None)
+        try:
+            text = await self.inner.agenerate_response(messages, model=model, temperature=temperature, max_tokens=max_tokens)
+            return text
+        finally:
+            self._record(model, messages, text, time.perf_counter() - start)
+
+    async def astream_response(
+        self,
+        messages: List[Dict[str, str]],
+        model: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None
+    ) -> AsyncIterator[str]:
+        start = time.perf_counter()
+        chunks: List[str] = []
+        mock = False
+        done = False
+        served_model.set(None)
+        try:
+            async for delta in self.inner.astream_response(messages, model=model, temperature=temperature, max_tokens=max_tokens):
+                mock = mock or isinstance(delta, MockResponse)
+                chunks.append(delta)
+                yield delta
+            done = True
+        finally:
+            text = "".join(chunks) if done else None
+            self._record(model, messages, MockResponse(text) if mock and text is not None else text, time.perf_counter() - start)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            tiers = {tier: {"model": tier_model(tier) or tier, **stats.snapshot()} for tier, stats in self._tiers.items()}
+        return {**self.inner.stats(), "tiers": tiers}
@@ -1,25 +1,25 @@
-from typing import Dict, List, Any, Optional
+from typing import Dict, Any, Optional, Sequence
 import asyncio
+import threading
 import os
 import random
 from orchestrator.src.core.agent import Agent
-from orchestrator.src.core.llm_provider import GroqProvider
+from orchestrator.src.core.agent_pool import AgentPool, AgentDirectory
+from orchestrator.src.core.llm_provider import GroqProvider, OpenAIProvider
+from orchestrator.src.core.llm_router import LLMRouter
+from orchestrator.src.core.llm_mock import MockLLMProvider
+from orchestrator.src.core.llm_cache import CachedLLMProvider
+from orchestrator.src.core.llm_singleflight import CoalescingLLMProvider
+from orchestrator.src.core.llm_resilience import CircuitBreakerProvider, BulkheadLLMProvider, Bulkhead, cell_bulkhead
+from orchestrator.src.core.model_tiers import TaskClassifier, MeteredLLMProvider
+from orchestrator.src.core.plan_cache import PlanCache
 from orchestrator.src.core.config import settings
-from orchestrator.src.validation.schemas import TaskSpec, AgentConfig, ToolConfig
-from orchestrator.src.tools.git_tools import GitTool
-from orchestrator.src.tools.file_tools import FileTool
-from orchestrator.src.tools.social_tools import FacebookPostTool, LinkedInPostTool, SocialMediaMultiplexer
-from orchestrator.src.tools.web_tools import WebSearchTool, WebScraperTool
-from orchestrator.src.tools.project_tools import ProjectGeneratorTool
-from orchestrator.src.tools.content_sharder import ContentSharderTool
-from orchestrator.src.tools.media_tools import ImageGenerationTool, VideoGenerationTool
-from orchestrator.src.tools.revenue_tools import PaymentTool, ProductForgeTool, YieldAuditorTool
-from orchestrator.src.tools.seo_tools import SEOTool
-from orchestrator.src.tools.universal_tools import get_multiplexer_tool
+from orchestrator.src.validation.schemas import TaskSpec
+from orchestrator.src.tools.registry import get_tool_registry
 from orchestrator.src.memory.vector_store import VectorStore
 from orchestrator.src.memory.sql_store import SQLStore
 from orchestrator.src.logging.logger import get_logger
-from orchestrator.src.agents.fleet import generate_grand_fleet
+from orchestrator.src.agents.fleet import fleet_manifest
 
 # Voice Adapters
 from orchestrator.src.core.voice.interfaces import STTAdapter, TTSAdapter
@@ -29,13 +29,14 @@ from orchestrator.src.core.voice.real_adapters import OpenAIWhisperAdapter, Elev
 logger = get_logger(__name__)
 
 class SovereignCell:
-    def __init__(self, cell_id: str, agents: List[Agent]):
+    def __init__(self, cell_id: str, agents: Sequence[Agent], bulkhead: Optional[Bulkhead] = None):
         self.cell_id = cell_id
-        self.agent_pool = agents
+        self.agent_pool = agents if isinstance(agents, AgentPool) else AgentPool.of(agents)
+        self.bulkhead = bulkhead
         self.active_tasks = 0
         self.task_queue = asyncio.Queue()
 
-    async def execute(self, task: TaskSpec):
+    async def execute(self, task: TaskSpec, model: Optional[str] = None):
         self.active_tasks += 1
         await self.task_queue.put(task)
         
@@ -43,20 +44,54 @@ class SovereignCell:
         agent = random.choice(self.agent_pool) 
         
         try:
-            # Run CPU-bound agent logic in a separate thread to avoid blocking the asyncio loop
-            # This allows the 'Social Scheduler' and 'Autonomous Loop' to keep ticking 
-            # while this agent 'thinks'.
-            result = await asyncio.to_thread(agent.process_task, task)
+            # The LLM call is awaited rather than parked on a thread, so the 'Social Scheduler'
+            # and 'Autonomous Loop' keep ticking and hundreds of tasks can wait on the network
+            # without exhausting the default executor.
+            result = await agent.aprocess_task(task, model)
             return result
         finally:
             self.active_tasks -= 1
             await self.task_queue.get()
 
+    def token_usage(self) -> Dict[str, int]:
+        """Prompt/completion token totals over the cell's agents (only built agents have any)."""
+        totals: Dict[str, int] = {}
+        for agent in self.agent_pool.materialized():
+            for key, value in agent.token_usage.items():
+                totals[key] = totals.get(key, 0) + value
+        return totals
+
+    async def stream(self, task: TaskSpec, model: Optional[str] = None):
+        """execute(), passing on the agent's incremental events as they happen."""
+        self.active_tasks += 1
+        await self.task_queue.put(task)
+        agent = random.choice(self.agent_pool)
+
+        try:
+            async for event in agent.astream_task(task, model):
+                yield event
+        finally:
+            self.active_tasks -= 1
+            await self.task_queue.get()
+
 class Orchestrator:
     def __init__(self):
         self.memory = VectorStore()
         self.sql_store = SQLStore()
-        self.llm_provider = GroqProvider()
+        if settings.LLM_PROVIDER == "mock":
+            backends = [MockLLMProvider()]
+        else:
+            backends = [GroqProvider()]
+            if settings.OPENAI_API_KEY and len(settings.OPENAI_API_KEY) > 10:
+                backends.append(OpenAIProvider(settings.OPENAI_API_KEY))
+        # One breaker per backend, inside the router, so a dead backend is skipped without a network round-trip
+        backends = [CircuitBreakerProvider(b) for b in backends]
+        # Metered below the cache and coalescer: only calls that reach a backend cost anything
+        provider = CoalescingLLMProvider(MeteredLLMProvider(LLMRouter(backends) if len(backends) > 1 else backends[0]))
+        self.llm_provider = CachedLLMProvider(provider) if settings.LLM_CACHE_ENABLED else provider
+        self.classifier = TaskClassifier(self.llm_provider)
+        # Shared by every agent: a plan learned in one agent serves its peers with the same tools
+        self.plan_cache = PlanCache()
         self.cells: Dict[str, SovereignCell] = {}
         
         if settings.ELEVENLABS_API_KEY and len(settings.ELEVENLABS_API_KEY) > 10:
@@ -70,74 +105,96 @@ class Orchestrator:
         self._initialize_sovereign_matrix()
 
     def _initialize_sovereign_matrix(self):
-        # 1. Load Tools
-        all_tools = [
-            GitTool(ToolConfig(tool_id="git", name="Git", description="Git ops", parameters_schema={}, allowed_agents=["*"])),
-            FileTool(ToolConfig(tool_id="file", name="File", description="File system access", parameters_schema={}, allowed_agents=["*"])),
-            FacebookPostTool(ToolConfig(tool_id="facebook_post", name="Facebook Poster", description="Post content to Facebook Page", parameters_schema={"message": "string", "link": "string"}, allowed_agents=["*"])),
-            LinkedInPostTool(ToolConfig(tool_id="linkedin_post", name="LinkedIn Poster", description="Post content to LinkedIn Profile/Page", parameters_schema={"message": "string", "link": "string"}, allowed_agents=["*"])),
-            SocialMediaMultiplexer(ToolConfig(tool_id="social_multiplexer", name="Social Media Multiplexer", description="Post to all channels simultaneously", parameters_schema={"message": "string", "link": "string"}, allowed_agents=["*"])),
-            WebSearchTool(ToolConfig(tool_id="search", name="Search", description="Search web", parameters_schema={}, allowed_agents=["*"])),
-            WebScraperTool(ToolConfig(tool_id="scrape", name="Scrape", description="Scrape web", parameters_schema={"url": "string"}, allowed_agents=["*"])),
-            ProjectGeneratorTool(ToolConfig(tool_id="scaffold", name="Scaffold", description="Build companies", parameters_schema={"name": "string", "industry": "string"}, allowed_agents=["*"])),
-            ContentSharderTool(ToolConfig(tool_id="shard", name="Shard", description="Fragment content", parameters_schema={"text": "string"}, allowed_agents=["*"])),
-            ImageGenerationTool(ToolConfig(tool_id="image_gen", name="ImageGen", description="Generate images", parameters_schema={"prompt": "string"}, allowed_agents=["*"]), stability_key=settings.STABILITY_API_KEY),
-            VideoGenerationTool(ToolConfig(tool_id="video", name="Video", description="Video logic", parameters_schema={}, allowed_agents=["*"])),
-            PaymentTool(ToolConfig(tool_id="payments", name="Payments", description="Manage fiscal transmissions", parameters_schema={}, allowed_agents=["*"]), stripe_key=settings.STRIPE_API_KEY),
-            ProductForgeTool(ToolConfig(tool_id="product_forge", name="Product_Forge", description="Create new modular product slots", parameters_schema={"id": "string", "name": "string", "price": "number", "description": "string"}, allowed_agents=["GAMMA_OPS_1"])),
-            YieldAuditorTool(ToolConfig(tool_id="yield_auditor", name="Yield_Auditor", description="Audit monetization potential", parameters_schema={}, allowed_agents=["GAMMA_OPS_1"])),
-            SEOTool(ToolConfig(tool_id="seo", name="SEO_Master", description="Optimize content for organic reach", parameters_schema={}, allowed_agents=["*"])),
-            get_multiplexer_tool()
-        ]
-
-        fleet = generate_grand_fleet()
+        # 1. Load Tools: one read-only registry shared by every agent (and every Orchestrator)
+        self.tools = get_tool_registry()
+        fleet = fleet_manifest()
+
+        # Bulkheads: each cell reaches the shared provider through its own slot pool, so a
+        # burst in one cell queues there instead of starving the other two
+        bulkheads = {key: cell_bulkhead(key) for key in ("ALPHA", "BETA", "GAMMA")}
+        providers = {key: BulkheadLLMProvider(self.llm_provider, b) for key, b in bulkheads.items()}
+
+        def pool(key: str, entries) -> AgentPool:
+            # Agents are built when a task first lands on them; until then a unit is its fleet entry
+            return AgentPool(entries, lambda entry: Agent(entry.config(), self.tools, self.memory, providers[key], self.plan_cache))
         
         # 2. Case-Insensitive Cell Partitioning
         # ids in fleet are e.g. agent_cybernetic_engineering_1 (all lowercase)
-        self.cells["ALPHA"] = SovereignCell("ALPHA_CORE", [
-            Agent(c, all_tools, self.memory, self.llm_provider) 
-            for c in fleet if any(k in c.id.lower() for k in ["engineering", "cybernetic"])
-        ])
-        self.cells["BETA"] = SovereignCell("BETA_GROWTH", [
-            Agent(c, all_tools, self.memory, self.llm_provider) 
-            for c in fleet if any(k in c.id.lower() for k in ["market", "force"])
-        ])
-        self.cells["GAMMA"] = SovereignCell("GAMMA_OPS", [
-            Agent(c, all_tools, self.memory, self.llm_provider) 
-            for c in fleet if any(k in c.id.lower() for k in ["strategic", "legal", "revenue", "integrity"])
-        ])
-
-        self.agents = {a.config.id: a for cell in self.cells.values() for a in cell.agent_pool}
+        self.cells["ALPHA"] = SovereignCell("ALPHA_CORE", pool("ALPHA", [
+            e for e in fleet if any(k in e.id.lower() for k in ["engineering", "cybernetic"])
+        ]), bulkheads["ALPHA"])
+        self.cells["BETA"] = SovereignCell("BETA_GROWTH", pool("BETA", [
+            e for e in fleet if any(k in e.id.lower() for k in ["market", "force"])
+        ]), bulkheads["BETA"])
+        self.cells["GAMMA"] = SovereignCell("GAMMA_OPS", pool("GAMMA", [
+            e for e in fleet if any(k in e.id.lower() for k in ["strategic", "legal", "revenue", "integrity"])
+        ]), bulkheads["GAMMA"])
+
+        self.agents = AgentDirectory([cell.agent_pool for cell in self.cells.values()])
         
         if not self.agents:
             logger.error("MATRIX INITIALIZATION FAILED: 0 Agents detected. Checking fleet generation...")
             # Fallback: take all agents if filter failed
-            alpha_fallback = [Agent(c, all_tools, self.memory, self.llm_provider) for c in fleet[:333]]
-            beta_fallback = [Agent(c, all_tools, self.memory, self.llm_provider) for c in fleet[333:666]]
-            gamma_fallback = [Agent(c, all_tools, self.memory, self.llm_provider) for c in fleet[666:]]
-            self.cells["ALPHA"] = SovereignCell("ALPHA_CORE", alpha_fallback)
-            self.cells["BETA"] = SovereignCell("BETA_GROWTH", beta_fallback)
-            self.cells["GAMMA"] = SovereignCell("GAMMA_OPS", gamma_fallback)
-            self.agents = {a.config.id: a for cell in self.cells.values() for a in cell.agent_pool}
+            self.cells["ALPHA"] = SovereignCell("ALPHA_CORE", pool("ALPHA", fleet[:333]), bulkheads["ALPHA"])
+            self.cells["BETA"] = SovereignCell("BETA_GROWTH", pool("BETA", fleet[333:666]), bulkheads["BETA"])
+            self.cells["GAMMA"] = SovereignCell("GAMMA_OPS", pool("GAMMA", fleet[666:]), bulkheads["GAMMA"])
+            self.agents = AgentDirectory([cell.agent_pool for cell in self.cells.values()])
 
         logger.info(f"PLATINUM SOVEREIGN MATRIX ONLINE: {len(self.agents)} Agents across 3 Specialized Cells.")
 
-    async def submit_task_stream(self, task_description: str, project_id: str):
+    async def submit_task_stream(self, task_description: str, project_id: str, stream: bool = False):
+        """
+        Yields "routing", then "completed" (or "failed"). With stream=True the plan's tokens arrive
+        as "token" events in between, so the first output shows up long before the last.
+        """
         task = TaskSpec(project_id=project_id, description=task_description)
-        desc = task_description.lower()
-        
-        if any(k in desc for k in ["build", "code", "fix", "logic", "infrastructure"]): cell_key = "ALPHA"
-        elif any(k in desc for k in ["post", "market", "shard", "outreach", "seo"]): cell_key = "BETA"
-        else: cell_key = "GAMMA"
+        cell_key, _ = await self.classifier.aroute(task_description)
+        # Simple plans go to the small model, complex ones to the heavy model (per the cell's tiers)
+        tier, model = self.classifier.plan_model(cell_key, task_description)
 
-        yield {"status": "routing", "message": f"Diverting directive to CELL_{cell_key}..."}
+        yield {"status": "routing", "message": f"Diverting directive to CELL_{cell_key}...", "tier": tier}
         
         try:
-            result = await self.cells[cell_key].execute(task)
+            if stream:
+                result = {}
+                async for event in self.cells[cell_key].stream(task, model):
+                    if event["status"] == "result":
+                        result = event["result"]
+                    else:
+                        yield event
+            else:
+                result = await self.cells[cell_key].execute(task, model)
             yield {"status": "completed", "result": result}
         except Exception as e:
             logger.error(f"Cell Execution Failed: {e}")
             yield {"status": "failed", "message": str(e)}
 
     def get_matrix_status(self):
-        return {name: {"active": c.active_tasks, "queued": c.task_queue.qsize(), "units": len(c.agent_pool)} for name, c in self.cells.items()}
+        return {
+            name: {
+                "active": c.active_tasks,
+                "queued": c.task_queue.qsize(),
+                "units": len(c.agent_pool),
+                "tokens": c.token_usage(),
+                "llm_slots": c.bulkhead.stats() if c.bulkhead else None,
+            }
+            for name, c in self.cells.items()
+        }
+
+    def get_token_usage(self) -> Dict[str, Any]:
+        """Token accounting per cell, and per agent for the agents that have called the LLM."""
+        return {
+            "cells": {name: c.token_usage() for name, c in self.cells.items()},
+            "agents": {agent_id: dict(a.token_usage) for agent_id, a in self.agents.materialized().items() if a.token_usage["calls"]},
+        }
+
+_orchestrator: Optional[Orchestrator] = None
+_orchestrator_lock = threading.Lock()
+
+def get_orchestrator() -> Orchestrator:
+    """The process-wide Orchestrator: the API and the schedulers share one fleet, stores and provider stack."""
+    global _orchestrator
+    with _orchestrator_lock:
+        if _orchestrator is None:
+            _orchestrator = Orchestrator()
+        return _orchestrator
@@ -0,0 +1,224 @@
+from typing import List, Dict, Any, Optional, Tuple
+from collections import OrderedDict
+from difflib import SequenceMatcher
+import re
+import copy
+import json
+import time
+import hashlib
+import threading
+from orchestrator.src.core.config import settings
+from orchestrator.src.logging.logger import get_logger
+
+logger = get_logger(__name__)
+
+SLOT = "<slot>"
+
+# Literal values that are parameters by construction: URLs, emails, quoted strings, numbers
+_SLOT_PATTERN = re.compile(r'https?://\S+|[\w.+-]+@[\w-]+\.[\w.]+|"[^"]+"|\'[^\']+\'|“[^”]+”|\d+(?:[.,]\d+)*')
+_TOKEN_PATTERN = re.compile(r"\w+|[^\w\s]")
+
+# Too common to substitute safely: replacing them would rewrite unrelated text in the plan
+STOPWORDS = {
+    "a", "an", "the", "and", "or", "but", "not", "no", "to", "of", "in", "on", "for", "with", "by",
+    "at", "from", "about", "as", "is", "are", "be", "it", "this", "that", "all", "any", "some",
+}
+
+def tokenize(description: str) -> List[Tuple[str, int, int]]:
+    """(normalized, start, end) tokens; slot literals normalize to SLOT, words to lowercase."""
+    tokens: List[Tuple[str, int, int]] = []
+    pos = 0
+    for match in _SLOT_PATTERN.finditer(description):
+        tokens.extend((m.group(0).lower(), pos + m.start(), pos + m.end()) for m in _TOKEN_PATTERN.finditer(description[pos:match.start()]))
+        tokens.append((SLOT, match.start(), match.end()))
+        pos = match.end()
+    tokens.extend((m.group(0).lower(), pos + m.start(), pos + m.end()) for m in _TOKEN_PATTERN.finditer(description[pos:]))
+    return tokens
+
+def template_of(tokens: List[Tuple[str, int, int]]) -> str:
+    return " ".join(norm for norm, _, _ in tokens)
+
+def span_text(description: str, tokens: List[Tuple[str, int, int]]) -> str:
+    """The original text covered by consecutive tokens, without the quotes of a quoted literal."""
+    return description[tokens[0][1]:tokens[-1][2]].strip("\"'“”")
+
+class _PlanEntry:
+    def __init__(self, description: str, tokens: List[Tuple[str, int, int]], plan: Dict[str, Any], expires: float):
+        self.description = description
+        self.tokens = tokens
+        self.norms = [norm for norm, _, _ in tokens]
+        self.plan = plan
+        self.expires = expires
+
+class PlanCache:
+    """
+    Reuses tool plans for recurring directives. Each plan is stored under the normalized
+    template of its task description (lowercased, literals such as numbers, URLs and quoted
+    strings replaced by slots), scoped by the agent's tool set.
+
+    A lookup takes the exact template, or else the most similar cached template (token
+    alignment). If the similarity is at least `min_similarity`, the differing spans become
+    parameters. Substitution is all-or-nothing and only touches string and numeric values
+    inside step inputs and the reasoning, never tool ids. A match is refused if:
+    - there are more than `max_params` parameters, or any span was inserted or deleted
+      rather than replaced;
+    - an old value is a stopword;
+    - an old value picked the tool (it appears in a tool id);
+    - an old value never appears in the plan's inputs, so the plan cannot be rewritten
+      to the new task.
+    """
+
+    def __init__(
+        self,
+        min_similarity: Optional[float] = None,
+        max_params: Optional[int] = None,
+        max_items: Optional[int] = None,
+        ttl: Optional[int] = None
+    ):
+        self.min_similarity = settings.LLM_PLAN_CACHE_MIN_SIMILARITY if min_similarity is None else min_similarity
+        self.max_params = settings.LLM_PLAN_CACHE_MAX_PARAMS if max_params is None else max_params
+        self.max_items = max_items or settings.LLM_PLAN_CACHE_ITEMS
+        self.ttl = settings.LLM_PLAN_CACHE_TTL_SECONDS if ttl is None else ttl
+        self._entries: "OrderedDict[Tuple[str, str], _PlanEntry]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.counters = {"exact_hits": 0, "similar_hits": 0, "misses": 0, "rejected": 0, "stores": 0}
+
+    @staticmethod
+    def scope_of(tool_ids: List[str]) -> str:
+        """Plans only make sense for agents holding the same tools."""
+        return hashlib.sha256(json.dumps(sorted(tool_ids)).encode("utf-8")).hexdigest()[:16]
+
+    def put(self, scope: str, description: str, plan: Dict[str, Any]):
+        tokens = tokenize(description)
+        if not tokens:
+            return
+        with self._lock:
+            key = (scope, template_of(tokens))
+            self._entries[key] = _PlanEntry(description, tokens, copy.deepcopy(plan), time.time() + self.ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_items:
+                self._entries.popitem(last=False)
+            self.counters["stores"] += 1
+
+    def get(self, scope: str, description: str) -> Optional[Dict[str, Any]]:
+        """A plan for `description` adapted from a cached one, or None."""
+        tokens = tokenize(description)
+        norms = [norm for norm, _, _ in tokens]
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get((scope, template_of(tokens)))
+            exact = entry is not None and entry.expires > now
+            similarity = 1.0
+            if not exact:
+                entry, similarity = self._most_similar(scope, norms, now)
+            if entry is None or similarity < self.min_similarity:
+                self.counters["misses"] += 1
+                return None
+            self._entries.move_to_end((scope, template_of(entry.tokens)))
+
+        plan = self._adapt(entry, description, tokens)
+        with self._lock:
+            if plan is None:
+                self.counters["rejected"] += 1
+            else:
+                self.counters["exact_hits" if exact else "similar_hits"] += 1
+        if plan is not None:
+            logger.info(f"Plan cache hit ({similarity:.2f}) for: {description}")
+        return plan
+
+    def _most_similar(self, scope: str, norms: List[str], now: float) -> Tuple[Optional[_PlanEntry], float]:
+        # Caller holds the lock
+        best, best_ratio = None, 0.0
+        matcher = SequenceMatcher(None, autojunk=False)
+        matcher.set_seq2(norms)
+        for (entry_scope, _), entry in self._entries.items():
+            if entry_scope != scope or entry.expires <= now:
+                continue
+            matcher.set_seq1(entry.norms)
+            if matcher.real_quick_ratio() <= best_ratio or matcher.quick_ratio() <= best_ratio:
+                continue
+            ratio = matcher.ratio()
+            if ratio > best_ratio:
+                best, best_ratio = entry, ratio
+        return best, best_ratio
+
+    def _parameters(self, entry: _PlanEntry, description: str, tokens: List[Tuple[str, int, int]]) -> Optional[Dict[str, str]]:
+        """Old value -> new value for every span that differs, or None if the match is unsafe."""
+        params: Dict[str, str] = {}
+        matcher = SequenceMatcher(None, entry.norms, [norm for norm, _, _ in tokens], autojunk=False)
+        for op, i1, i2, j1, j2 in matcher.get_opcodes():
+            if op in ("insert", "delete"):
+                return None
+            if op == "replace":
+                params[span_text(entry.description, entry.tokens[i1:i2])] = span_text(description, tokens[j1:j2])
+                continue
+            # Equal templates can still carry different slot values
+            for old_token, new_token in zip(entry.tokens[i1:i2], tokens[j1:j2]):
+                old, new = span_text(entry.description, [old_token]), span_text(description, [new_token])
+                if old_token[0] == SLOT and old != new:
+                    params[old] = new
+        if len(params) > self.max_params or any(old.lower() in STOPWORDS for old in params):
+            return None
+        return params
+
+    def _adapt(self, entry: _PlanEntry, description: str, tokens: List[Tuple[str, int, int]]) -> Optional[Dict[str, Any]]:
+        params = self._parameters(entry, description, tokens)
+        if params is None:
+            return None
+        plan = copy.deepcopy(entry.plan)
+        if not params:
+            return plan
+
+        tool_ids = " ".join(str(step.get("tool_id", "")) for step in plan.get("steps", [])).lower()
+        if any(old.lower() in tool_ids for old in params):
+            return None
+
+        lookup = {old.lower(): new for old, new in params.items()}
+        pattern = re.compile(
+            r"(?<!\w)(?:" + "|".join(re.escape(old) for old in sorted(params, key=len, reverse=True)) + r")(?!\w)",
+            re.IGNORECASE
+        )
+        used = set()
+
+        def rewrite(value: Any) -> Any:
+            if isinstance(value, str):
+                def swap(match: "re.Match") -> str:
+                    used.add(match.group(0).lower())
+                    return lookup[match.group(0).lower()]
+                return pattern.sub(swap, value)
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                new = lookup.get(str(value))
+                if new is not None:
+                    try:
+                        converted = type(value)(new.replace(",", ""))
+                    except ValueError:
+                        return value
+                    used.add(str(value))
+                    return converted
+                return value
+            if isinstance(value, dict):
+                return {k: rewrite(v) for k, v in value.items()}
+            if isinstance(value, list):
+                return [rewrite(v) for v in value]
+            return value
+
+        for step in plan.get("steps", []):
+            step["inputs"] = rewrite(step.get("inputs", {}))
+        # Every parameter must have reached the inputs; otherwise the plan still does the old task
+        if used != set(lookup):
+            return None
+        if isinstance(plan.get("reasoning"), str):
+            plan["reasoning"] = rewrite(plan["reasoning"])
+        return plan
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            counters = dict(self.counters)
+            items = len(self._entries)
+        lookups = counters["exact_hits"] + counters["similar_hits"] + counters["misses"] + counters["rejected"]
+        hits = counters["exact_hits"] + counters["similar_hits"]
+        return {**counters, "items": items, "hit_rate": round(hits / lookups, 4) if lookups else 0.0}
@@ -0,0 +1,139 @@
+from typing import List, Dict, Any, Optional, Callable, Tuple
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+import time
+import threading
+from orchestrator.src.core.config import settings
+from orchestrator.src.logging.logger import get_logger
+
+logger = get_logger(__name__)
+
+# run_step(step, failed_dependencies) -> result dict, or None when the step produced nothing
+StepRunner = Callable[[Dict[str, Any], List[str]], Optional[Dict[str, Any]]]
+
+def step_label(step: Dict[str, Any], index: int) -> str:
+    return str(step["id"]) if step.get("id") is not None else str(index)
+
+def step_dependencies(steps: List[Dict[str, Any]]) -> Optional[List[List[int]]]:
+    """
+    For each step, the indexes of the steps it waits for. None if no step declares
+    `depends_on`: such plans keep their strict order. Raises ValueError on duplicate or
+    unknown ids and on cycles.
+    """
+    if not any("depends_on" in step for step in steps):
+        return None
+    ids: Dict[str, int] = {}
+    for i, step in enumerate(steps):
+        if step.get("id") is not None:
+            if str(step["id"]) in ids:
+                raise ValueError(f"duplicate step id {step['id']!r}")
+            ids[str(step["id"])] = i
+
+    deps: List[List[int]] = []
+    for i, step in enumerate(steps):
+        wanted = step.get("depends_on") or []
+        if not isinstance(wanted, list):
+            wanted = [wanted]
+        resolved = []
+        for ref in wanted:
+            if str(ref) not in ids:
+                raise ValueError(f"step {step_label(step, i)} depends on unknown step {ref!r}")
+            resolved.append(ids[str(ref)])
+        deps.append(resolved)
+
+    # Kahn's algorithm: whatever never becomes ready sits on a cycle
+    waiting = [len(d) for d in deps]
+    ready = [i for i, n in enumerate(waiting) if n == 0]
+    seen = 0
+    while ready:
+        done = ready.pop()
+        seen += 1
+        for i, d in enumerate(deps):
+            if done in d:
+                waiting[i] -= 1
+                if waiting[i] == 0:
+                    ready.append(i)
+    if seen != len(steps):
+        raise ValueError("step dependencies form a cycle")
+    return deps
+
+def execute_steps(
+    steps: List[Dict[str, Any]],
+    run_step: StepRunner,
+    pool: Optional[ThreadPoolExecutor] = None
+) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+    """
+    Runs a plan's steps and returns (results in plan order, timings).
+
+    A plan with `depends_on` runs as a DAG on the bounded pool. A step starts as soon as
+    its dependencies finish. The runner is told which dependencies failed, so it can skip
+    the step. Plans without dependencies, or with unusable ones, run in order on the
+    calling thread. Timings cover every step (start offset and duration in ms) plus the
+    plan's wall time and the serial time the steps would have taken back to back.
+    """
+    start = time.perf_counter()
+    timings: List[Optional[Dict[str, Any]]] = [None] * len(steps)
+    outcomes: List[Optional[Dict[str, Any]]] = [None] * len(steps)
+
+    def timed(i: int, failed: List[str]):
+        began = time.perf_counter()
+        outcome = run_step(steps[i], failed)
+        ended = time.perf_counter()
+        timings[i] = {
+            "step": step_label(steps[i], i),
+            "tool_id": steps[i].get("tool_id"),
+            "status": outcome.get("status") if outcome else "skipped",
+            "start_ms": round((began - start) * 1000, 2),
+            "duration_ms": round((ended - began) * 1000, 2),
+        }
+        outcomes[i] = outcome
+
+    try:
+        deps = step_dependencies(steps)
+    except ValueError as e:
+        logger.warning(f"Plan dependencies unusable ({e}); running steps in order")
+        deps = None
+
+    if deps is None or len(steps) < 2:
+        for i in range(len(steps)):
+            timed(i, [])
+    else:
+        pool = pool or get_step_pool()
+        waiting = [len(d) for d in deps]
+        dependents: List[List[int]] = [[] for _ in steps]
+        for i, d in enumerate(deps):
+            for j in d:
+                dependents[j].append(i)
+
+        def failed_deps(i: int) -> List[str]:
+            return [step_label(steps[j], j) for j in deps[i] if not outcomes[j] or outcomes[j].get("status") != "success"]
+
+        running = {pool.submit(timed, i, []): i for i, n in enumerate(waiting) if n == 0}
+        while running:
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                i = running.pop(future)
+                future.result()
+                for k in dependents[i]:
+                    waiting[k] -= 1
+                    if waiting[k] == 0:
+                        running[pool.submit(timed, k, failed_deps(k))] = k
+
+    wall_ms = round((time.perf_counter() - start) * 1000, 2)
+    report = {
+        "parallel": deps is not None,
+        "wall_ms": wall_ms,
+        "serial_ms": round(sum(t["duration_ms"] for t in timings if t), 2),
+        "steps": timings,
+    }
+    return [o for o in outcomes if o is not None], report
+
+_step_pool: Optional[ThreadPoolExecutor] = None
+_step_pool_lock = threading.Lock()
+
+def get_step_pool() -> ThreadPoolExecutor:
+    """Process-wide pool for plan steps, so concurrent plans share PLAN_STEP_WORKERS threads."""
+    global _step_pool
+    with _step_pool_lock:
+        if _step_pool is None:
+            _step_pool = ThreadPoolExecutor(max_workers=settings.PLAN_STEP_WORKERS, thread_name_prefix="plan-step")
+        return _step_pool
@@ -0,0 +1,273 @@
+from typing import List, Dict, Any, Optional, Iterator, Tuple
+import re
+import json
+from itertools import chain
+
+try:
+    import orjson
+except ImportError:  # optional speedup; the stdlib parser gives the same results
+    orjson = None
+
+from orchestrator.src.logging.logger import get_logger
+
+logger = get_logger(__name__)
+
+MAX_CANDIDATES = 8
+
+class PlanParseError(ValueError):
+    """No JSON object in the LLM output could be read as a plan."""
+
+class PlanValidationError(ValueError):
+    """A value does not match the plan schema; `path` locates it, e.g. "plan.steps[2].tool_id"."""
+
+    def __init__(self, message: str, path: str = "plan"):
+        super().__init__(message)
+        self.message = message
+        self.path = path
+
+    def __str__(self) -> str:
+        return f"{self.path}: {self.message}"
+
+def loads(text: str) -> Any:
+    return orjson.loads(text) if orjson is not None else json.loads(text)
+
+# --- validation ---
+
+# A plan is {"reasoning": str, "steps": [step, ...]}, a step {"id": str, "tool_id": str,
+# "inputs": {...}, "depends_on": [str, ...]}; only "tool_id" is required. Values are checked
+# and normalized in place: numbers become strings, missing or null "inputs"/"steps" become
+# empty, a lone "depends_on" becomes a list, and other null fields are removed. Invalid steps
+# are dropped, anything else invalid rejects the plan. Valid plans are never copied.
+
+def _type_error(expected: str, value: Any, path: str) -> PlanValidationError:
+    return PlanValidationError(f"expected {expected}, got {type(value).__name__}", path)
+
+def _string(value: Any, path: str) -> str:
+    """A non-string `value` as a string: numbers are converted, anything else raises."""
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return str(value)
+    raise _type_error("a string", value, path)
+
+def _check_step(step: Any):
+    """validate_step's checks, with error paths relative to the step ("" for the step itself)."""
+    if not isinstance(step, dict):
+        raise _type_error("an object", step, "")
+    tool_id = step.get("tool_id")
+    if tool_id is None:
+        raise PlanValidationError("required", ".tool_id")
+    if not isinstance(tool_id, str):
+        raise _type_error("a string", tool_id, ".tool_id")
+
+    step_id = step.get("id")
+    if step_id is None:
+        step.pop("id", None)
+    elif not isinstance(step_id, str):
+        step["id"] = _string(step_id, ".id")
+
+    inputs = step.get("inputs")
+    if inputs is None:
+        step["inputs"] = {}
+    elif not isinstance(inputs, dict):
+        raise _type_error("an object", inputs, ".inputs")
+
+    depends_on = step.get("depends_on")
+    if depends_on is None:
+        step.pop("depends_on", None)
+        return
+    if not isinstance(depends_on, list):
+        depends_on = step["depends_on"] = [depends_on]
+    for i, dep in enumerate(depends_on):
+        if not isinstance(dep, str):
+            depends_on[i] = _string(dep, f".depends_on[{i}]")
+
+def validate_step(step: Any, path: str = "step") -> Dict[str, Any]:
+    """Checks and normalizes one step in place and returns it, or raises PlanValidationError."""
+    try:
+        _check_step(step)
+    except PlanValidationError as e:
+        e.path = path + e.path
+        raise
+    return step
+
+def validate_plan(plan: Any, path: str = "plan") -> Dict[str, Any]:
+    """
+    Checks and normalizes a plan in place and returns it. Steps that fail validation are
+    dropped with one warning for the lot; any other problem raises PlanValidationError.
+    """
+    if not isinstance(plan, dict):
+        raise _type_error("an object", plan, path)
+    reasoning = plan.get("reasoning")
+    if reasoning is None:
+        plan.pop("reasoning", None)
+    elif not isinstance(reasoning, str):
+        plan["reasoning"] = _string(reasoning, f"{path}.reasoning")
+
+    steps = plan.get("steps")
+    if steps is None:
+        plan["steps"] = []
+        return plan
+    if not isinstance(steps, list):
+        raise _type_error("a list", steps, f"{path}.steps")
+    dropped: List[str] = []
+    kept: Optional[List[Any]] = None  # only built once a step has been dropped
+    for i, step in enumerate(steps):
+        try:
+            _check_step(step)
+        except PlanValidationError as e:
+            e.path = f"{path}.steps[{i}]{e.path}"
+            dropped.append(str(e))
+            if kept is None:
+                kept = steps[:i]
+            continue
+        if kept is not None:
+            kept.append(step)
+    if kept is not None:
+        logger.warning(f"Dropping {len(dropped)} invalid plan steps: {'; '.join(dropped)}")
+        plan["steps"] = kept
+    return plan
+
+# --- extraction ---
+
+_TRAILING_COMMA = re.compile(r",(\s*[}\]])")
+_OBJECT_START = re.compile(r'\{\s*["}]')
+_CLOSING = {"{": "}", "[": "]"}
+_SEPARATORS = " \t\r\n:,"
+_decoder = json.JSONDecoder()
+
+def _odd_backslashes(part: str) -> bool:
+    return part.endswith("\\") and (len(part) - len(part.rstrip("\\"))) % 2 == 1
+
+def _split_strings(text: str) -> List[str]:
+    """text split on its unescaped quotes: parts outside strings at even indexes, string contents at odd ones."""
+    parts = text.split('"')
+    if '\\"' not in text:
+        return parts
+    merged = [parts[0]]
+    for part in parts[1:]:
+        if len(merged) % 2 == 0 and _odd_backslashes(merged[-1]):
+            merged[-1] += '"' + part
+        else:
+            merged.append(part)
+    return merged
+
+def _balanced_end(text: str, start: int) -> Tuple[int, Optional[str]]:
+    """
+    End (exclusive) of the object opening at `start`, and what is missing to close it: "" for a
+    complete object, the closing quote/brackets for one cut off by the end of the text, None if
+    the brackets don't match. Only the short runs of JSON structure between strings are
+    looked at, and most of those (": ", ", ") skipped.
+    """
+    stack: List[str] = []
+    parts = _split_strings(text[start:])
+    pos = start
+    for n in range(0, len(parts), 2):
+        part = parts[n]
+        if part.strip(_SEPARATORS):
+            for i, char in enumerate(part):
+                if char in _CLOSING:
+                    stack.append(_CLOSING[char])
+                elif char == "}" or char == "]":
+                    if not stack or stack.pop() != char:
+                        return pos + i, None
+                    if not stack:
+                        return pos + i + 1, ""
+        if n + 1 < len(parts):
+            pos += len(part) + len(parts[n + 1]) + 2
+    if len(parts) % 2 == 0:
+        # Cut off inside a string; a dangling backslash would escape our closing quote
+        return len(text) - _odd_backslashes(parts[-1]), '"' + "".join(reversed(stack))
+    return len(text), "".join(reversed(stack))
+
+def candidates(text: str) -> Iterator[str]:
+    """Balanced JSON objects in the text, first to last; an object cut off at the end is closed off."""
+    start = text.find("{")
+    found = 0
+    while start != -1 and found < MAX_CANDIDATES:
+        end, missing = _balanced_end(text, start)
+        if missing is not None:
+            found += 1
+            yield text[start:end] + missing
+            if missing:
+                return
+            start = text.find("{", end)
+        else:
+            start = text.find("{", start + 1)
+
+def _decoded(text: str, start: int) -> Iterator[Dict[str, Any]]:
+    """Objects json's C scanner can decode in place, trying each "{" not inside an earlier one."""
+    attempts = 0
+    while start != -1 and attempts < MAX_CANDIDATES * 4:
+        attempts += 1
+        # A brace that can't open an object ("{topic}") is skipped without a costly decode error
+        if not _OBJECT_START.match(text, start):
+            start = text.find("{", start + 1)
+            continue
+        try:
+            value, end = _decoder.raw_decode(text, start)
+        except ValueError:
+            start = text.find("{", start + 1)
+            continue
+        if isinstance(value, dict):
+            yield value
+        start = text.find("{", end)
+
+def _repaired(text: str) -> Iterator[Dict[str, Any]]:
+    for candidate in candidates(text):
+        try:
+            value = loads(candidate)
+        except ValueError:
+            try:
+                value = loads(_TRAILING_COMMA.sub(r"\1", candidate))
+            except ValueError:
+                continue
+        if isinstance(value, dict):
+            yield value
+
+def _without_trailing_commas(span: str, error: ValueError) -> Optional[str]:
+    """The span with trailing commas removed, when the decode error is at one (orjson and json report it a character apart)."""
+    pos = getattr(error, "pos", None)
+    if pos is None or not _TRAILING_COMMA.search(span, max(0, pos - 64), pos + 64):
+        return None
+    return _TRAILING_COMMA.sub(r"\1", span)
+
+def _plan(value: Any) -> Optional[Dict[str, Any]]:
+    """The validated plan, or None when the object isn't one (no "steps" or "reasoning")."""
+    if not isinstance(value, dict) or ("steps" not in value and "reasoning" not in value):
+        return None
+    try:
+        return validate_plan(value)
+    except PlanValidationError as e:
+        logger.warning(f"Plan candidate rejected: {e}")
+        return None
+
+def parse_plan(text: str) -> Dict[str, Any]:
+    """
+    The first JSON object in an LLM response that reads as a plan (has "steps" or
+    "reasoning"), checked by validate_plan. Handles prose and code fences around the
+    JSON, stray braces before it, several objects, trailing commas and output truncated
+    mid-object. Steps failing validation are dropped; the rest of the plan is kept.
+    """
+    start, end = text.find("{"), text.rfind("}")
+    if start == -1:
+        raise PlanParseError("no JSON object in LLM output")
+
+    # Cheapest first: the span from the first "{" to the last "}" (the usual shape, one
+    # orjson call) as is and without trailing commas, then objects decoded in place, then
+    # the bracket scanner with repairs
+    if end > start:
+        span = text[start : end + 1]
+        try:
+            plan = _plan(loads(span))
+        except ValueError as e:
+            repaired = _without_trailing_commas(span, e)
+            try:
+                plan = _plan(loads(repaired)) if repaired is not None else None
+            except ValueError:
+                plan = None
+        if plan is not None:
+            return plan
+    for value in chain(_decoded(text, start), _repaired(text)):
+        plan = _plan(value)
+        if plan is not None:
+            return plan
+    raise PlanParseError("no valid plan object in LLM output")
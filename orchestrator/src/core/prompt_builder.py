@@ -0,0 +1,84 @@
+from typing import List, Dict, Any, Optional, Tuple
+from orchestrator.src.core.config import settings
+from orchestrator.src.core.tokenizer import count_tokens, count_message_tokens
+from orchestrator.src.logging.logger import get_logger
+
+logger = get_logger(__name__)
+
+CONTEXT_HEADER = "\n\nContext:\n"
+NO_CONTEXT = "No specific context found."
+# A context snippet cut shorter than this carries too little to be worth its tokens
+MIN_TRUNCATED_TOKENS = 32
+
+def prompt_budget(model: Optional[str]) -> int:
+    """Prompt token budget for `model` (LLM_PROMPT_BUDGETS), falling back to LLM_PROMPT_BUDGET_TOKENS."""
+    return settings.LLM_PROMPT_BUDGETS.get(model or "", settings.LLM_PROMPT_BUDGET_TOKENS)
+
+def dedupe_snippets(snippets: List[str]) -> Tuple[List[str], int]:
+    """
+    Drops snippets that repeat a higher-ranked one, ignoring case and whitespace, including
+    ones wholly contained in it. Returns the survivors in rank order and how many were dropped.
+    """
+    kept: List[str] = []
+    seen: List[str] = []
+    for snippet in snippets:
+        norm = " ".join(snippet.lower().split())
+        if not norm or any(norm in other for other in seen):
+            continue
+        # A later, longer snippet can contain an earlier one; the earlier rank wins the slot
+        for i, other in enumerate(seen):
+            if other in norm:
+                kept[i], seen[i] = snippet, norm
+                break
+        else:
+            kept.append(snippet)
+            seen.append(norm)
+    return kept, len(snippets) - len(kept)
+
+class PromptBuilder:
+    """
+    Assembles a system + user prompt with RAG context under a token budget. The system and
+    user text are always sent whole; context snippets (ranked best first) are deduplicated,
+    then trimmed from the lowest rank up until both the prompt budget and the context cap hold.
+    """
+
+    def __init__(self, model: Optional[str] = None, budget: Optional[int] = None, context_budget: Optional[int] = None):
+        self.budget = budget or prompt_budget(model)
+        self.context_budget = settings.LLM_CONTEXT_MAX_TOKENS if context_budget is None else context_budget
+
+    def build(self, system: str, user: str, context: List[str]) -> Tuple[List[Dict[str, str]], Dict[str, Any]]:
+        """Returns the chat messages and a report of what the prompt cost and what was cut."""
+        snippets, duplicates = dedupe_snippets(context)
+        fixed = count_message_tokens([{"content": system}, {"content": user}]) + count_tokens(CONTEXT_HEADER)
+        available = min(self.context_budget, self.budget - fixed)
+
+        lines: List[str] = []
+        used = 0
+        for snippet in snippets:
+            line = f"- {snippet}"
+            cost = count_tokens(line) + 1
+            if used + cost > available:
+                room = available - used
+                if room >= MIN_TRUNCATED_TOKENS:
+                    lines.append(line[:len(line) * room // cost].rstrip() + " …")
+                    used += room
+                break
+            lines.append(line)
+            used += cost
+
+        if fixed > self.budget:
+            logger.warning(f"Prompt needs {fixed} tokens before context, over its {self.budget} token budget")
+
+        messages = [
+            {"role": "system", "content": system + CONTEXT_HEADER + ("\n".join(lines) if lines else NO_CONTEXT)},
+            {"role": "user", "content": user},
+        ]
+        report = {
+            "prompt_tokens": count_message_tokens(messages),
+            "context_tokens": used,
+            "snippets_kept": len(lines),
+            "snippets_dropped": len(snippets) - len(lines),
+            "duplicates": duplicates,
+            "budget": self.budget,
+        }
+        return messages, report
@@ -36,9 +36,10 @@ class SocialScheduler:
         logger.info("Social Scheduler: Waking up for Agentic Content Generation...")
         
         from orchestrator.src.core.catalog.api import catalog_api
-        from orchestrator.src.core.orchestrator import Orchestrator
+        from orchestrator.src.core.orchestrator import get_orchestrator
         
-        orchestrator = Orchestrator()
+        # The running app's fleet and provider stack (cache, breakers, metering) rather than a fresh copy per run
+        orchestrator = get_orchestrator()
         products = catalog_api.get_products()
         posts = get_all_posts()
         
@@ -50,6 +51,11 @@ class SocialScheduler:
         # Always prioritize Platinum for high-impact posts
         platinum = [p for p in products if "platinum" in p.id.lower()][0]
         platinum_data = platinum.model_dump() if hasattr(platinum, "model_dump") else platinum
+        # DB products carry the flat slot fields as None
+        platinum_price = platinum_data.get("price")
+        if platinum_price is None and platinum_data.get("prices"):
+            platinum_price = platinum_data["prices"][0]["price"]
+        checkout_url = platinum_data.get("checkout_url") or f"{settings.FRONTEND_URL}/pricing"
         
         # --- AGENTIC COPYWRITING PROMPT ---
         prompt = f"""
@@ -59,14 +65,14 @@ class SocialScheduler:
         REPORT TITLE: {target_post['title']}
         REPORT SUMMARY: {target_post['summary']}
         
-        TARGET PRODUCT: {platinum_data['name']} (${platinum_data['price']})
+        TARGET PRODUCT: {platinum_data['name']} (${platinum_price})
         PRODUCT DESC: {platinum_data['description']}
         
         STYLE GUIDELINES:
         1. NO generic marketing fluff. Use high-intensity, technical, 'Sovereign' vocabulary.
         2. STRUCTURE: Hook (The Problem), Value (The Insight from the report), CTA (The Sovereign Solution).
         3. FORMAT: Short, punchy paragraphs with clear technical authority.
-        4. LINK: You must end with this link: {platinum_data.get('checkout_url')}
+        4. LINK: You must end with this link: {checkout_url}
         
         Write the copy for a LinkedIn/Facebook broadcast that will impress high-net-worth developers and founders.
         """
@@ -76,11 +82,11 @@ class SocialScheduler:
             messages = [{"role": "system", "content": "You are a world-class Direct Response Copywriter for AI Deep Tech."}, 
                         {"role": "user", "content": prompt}]
             
-            message = orchestrator.llm_provider.generate_response(messages)
+            message = await orchestrator.llm_provider.agenerate_response(messages)
             
             # Final Sanity Check: Ensure the link is present
-            if platinum_data.get('checkout_url') not in message:
-                message += f"\n\nSecure your position: {platinum_data.get('checkout_url')}"
+            if checkout_url not in message:
+                message += f"\n\nSecure your position: {checkout_url}"
 
             # --- VISUAL ASSET SELECTION ---
             media_url = None
@@ -1,11 +1,19 @@
 from abc import ABC, abstractmethod
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 from orchestrator.src.validation.schemas import ToolConfig, ToolInvocation
+from orchestrator.src.tools.result_cache import ToolResultCache, get_tool_cache
+from orchestrator.src.core.config import settings
 from orchestrator.src.logging.logger import get_logger
 
 logger = get_logger(__name__)
 
 class BaseTool(ABC):
+    # Idempotent tools set cacheable: identical input_data within cache_ttl seconds reuses
+    # the earlier output instead of executing again (TOOL_CACHE_TTLS overrides per tool id)
+    cacheable: bool = False
+    cache_ttl: int = 3600
+    result_cache: Optional[ToolResultCache] = None
+
     def __init__(self, config: ToolConfig):
         self.config = config
 
@@ -18,6 +26,10 @@ class BaseTool(ABC):
         # Pydantic handles basic type validation, but specific logic can go here
         return True
 
+    def should_cache(self, output: Dict[str, Any]) -> bool:
+        """Outputs reporting an error are never cached, so the next call retries."""
+        return isinstance(output, dict) and "error" not in output
+
     def run(self, invocation: ToolInvocation) -> ToolInvocation:
         logger.info(f"Running tool {self.config.tool_id} for agent {invocation.agent_id}")
         if not self.validate_inputs(invocation):
@@ -25,11 +37,23 @@ class BaseTool(ABC):
             invocation.error_message = "Input validation failed"
             return invocation
 
+        cache = key = None
+        if self.cacheable and settings.TOOL_CACHE_ENABLED:
+            cache = self.result_cache or get_tool_cache()
+            key = cache.make_key(self.config.tool_id, invocation.input_data)
+            cached = cache.get(self.config.tool_id, key) if key else None
+            if cached is not None:
+                invocation.output_data = cached
+                invocation.status = "success"
+                return invocation
+
         try:
             # Pass input_data (dict) to execute instead of invocation object
             result = self.execute(invocation.input_data)
             invocation.output_data = result
             invocation.status = "success"
+            if key and self.should_cache(result):
+                cache.put(self.config.tool_id, key, result, settings.TOOL_CACHE_TTLS.get(self.config.tool_id, self.cache_ttl))
         except Exception as e:
             logger.error(f"Tool execution failed: {e}")
             invocation.status = "failure"
@@ -0,0 +1,74 @@
+from typing import List, Iterator, Optional, Mapping
+from types import MappingProxyType
+import threading
+from orchestrator.src.tools.base import BaseTool
+from orchestrator.src.tools.git_tools import GitTool
+from orchestrator.src.tools.file_tools import FileTool
+from orchestrator.src.tools.social_tools import FacebookPostTool, LinkedInPostTool, SocialMediaMultiplexer
+from orchestrator.src.tools.web_tools import WebSearchTool, WebScraperTool
+from orchestrator.src.tools.project_tools import ProjectGeneratorTool
+from orchestrator.src.tools.content_sharder import ContentSharderTool
+from orchestrator.src.tools.media_tools import ImageGenerationTool, VideoGenerationTool
+from orchestrator.src.tools.revenue_tools import PaymentTool, ProductForgeTool, YieldAuditorTool
+from orchestrator.src.tools.seo_tools import SEOTool
+from orchestrator.src.tools.universal_tools import get_multiplexer_tool
+from orchestrator.src.validation.schemas import ToolConfig
+from orchestrator.src.core.plan_cache import PlanCache
+from orchestrator.src.core.config import settings
+
+class ToolRegistry(Mapping[str, BaseTool]):
+    """
+    Read-only tool_id -> tool map, built once and shared by every agent holding the same
+    tools. What agents used to derive per instance from their own tool dict (the plan-cache
+    scope, the tool block of the planning prompt) is computed here once.
+    """
+    __slots__ = ("_tools", "scope", "catalog")
+
+    def __init__(self, tools: List[BaseTool]):
+        self._tools: Mapping[str, BaseTool] = MappingProxyType({t.config.tool_id: t for t in tools})
+        self.scope = PlanCache.scope_of(list(self._tools))
+        self.catalog = "\n".join(f"- {t.config.tool_id}: {t.config.description}" for t in self._tools.values())
+
+    def __getitem__(self, tool_id: str) -> BaseTool:
+        return self._tools[tool_id]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._tools)
+
+    def __len__(self) -> int:
+        return len(self._tools)
+
+    def __contains__(self, tool_id: object) -> bool:
+        return tool_id in self._tools
+
+def default_tools() -> List[BaseTool]:
+    """The tools every fleet agent holds."""
+    return [
+        GitTool(ToolConfig(tool_id="git", name="Git", description="Git ops", parameters_schema={}, allowed_agents=["*"])),
+        FileTool(ToolConfig(tool_id="file", name="File", description="File system access", parameters_schema={}, allowed_agents=["*"])),
+        FacebookPostTool(ToolConfig(tool_id="facebook_post", name="Facebook Poster", description="Post content to Facebook Page", parameters_schema={"message": "string", "link": "string"}, allowed_agents=["*"])),
+        LinkedInPostTool(ToolConfig(tool_id="linkedin_post", name="LinkedIn Poster", description="Post content to LinkedIn Profile/Page", parameters_schema={"message": "string", "link": "string"}, allowed_agents=["*"])),
+        SocialMediaMultiplexer(ToolConfig(tool_id="social_multiplexer", name="Social Media Multiplexer", description="Post to all channels simultaneously", parameters_schema={"message": "string", "link": "string"}, allowed_agents=["*"])),
+        WebSearchTool(ToolConfig(tool_id="search", name="Search", description="Search web", parameters_schema={}, allowed_agents=["*"])),
+        WebScraperTool(ToolConfig(tool_id="scrape", name="Scrape", description="Scrape web", parameters_schema={"url": "string"}, allowed_agents=["*"])),
+        ProjectGeneratorTool(ToolConfig(tool_id="scaffold", name="Scaffold", description="Build companies", parameters_schema={"name": "string", "industry": "string"}, allowed_agents=["*"])),
+        ContentSharderTool(ToolConfig(tool_id="shard", name="Shard", description="Fragment content", parameters_schema={"text": "string"}, allowed_agents=["*"])),
+        ImageGenerationTool(ToolConfig(tool_id="image_gen", name="ImageGen", description="Generate images", parameters_schema={"prompt": "string"}, allowed_agents=["*"]), stability_key=settings.STABILITY_API_KEY),
+        VideoGenerationTool(ToolConfig(tool_id="video", name="Video", description="Video logic", parameters_schema={}, allowed_agents=["*"])),
+        PaymentTool(ToolConfig(tool_id="payments", name="Payments", description="Manage fiscal transmissions", parameters_schema={}, allowed_agents=["*"]), stripe_key=settings.STRIPE_API_KEY),
+        ProductForgeTool(ToolConfig(tool_id="product_forge", name="Product_Forge", description="Create new modular product slots", parameters_schema={"id": "string", "name": "string", "price": "number", "description": "string"}, allowed_agents=["GAMMA_OPS_1"])),
+        YieldAuditorTool(ToolConfig(tool_id="yield_auditor", name="Yield_Auditor", description="Audit monetization potential", parameters_schema={}, allowed_agents=["GAMMA_OPS_1"])),
+        SEOTool(ToolConfig(tool_id="seo", name="SEO_Master", description="Optimize content for organic reach", parameters_schema={}, allowed_agents=["*"])),
+        get_multiplexer_tool()
+    ]
+
+_tool_registry: Optional[ToolRegistry] = None
+_tool_registry_lock = threading.Lock()
+
+def get_tool_registry() -> ToolRegistry:
+    """Process-wide registry of default_tools(), shared by every Orchestrator and its agents."""
+    global _tool_registry
+    with _tool_registry_lock:
+        if _tool_registry is None:
+            _tool_registry = ToolRegistry(default_tools())
+        return _tool_registry
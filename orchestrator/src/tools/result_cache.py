@@ -0,0 +1,94 @@
+from typing import Dict, Any, Optional
+import json
+import hashlib
+import threading
+from orchestrator.src.core.llm_cache import ResponseCache
+from orchestrator.src.core.config import settings
+from orchestrator.src.logging.logger import get_logger
+
+logger = get_logger(__name__)
+
+def canonical_json(data: Any) -> str:
+    return json.dumps(data, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+
+class ToolResultCache:
+    """
+    Outputs of idempotent tools, keyed by tool id plus a canonical hash of input_data, in a
+    ResponseCache (bounded LRU, optional SQLite tier). Each entry stores the output with
+    its SHA-256. Every read re-checks the hash, so a corrupted or tampered entry is dropped
+    and the tool simply runs again.
+    """
+
+    def __init__(self, path: Optional[str] = None, max_items: Optional[int] = None, disk: Optional[bool] = None):
+        self.store = ResponseCache(
+            path=path or settings.TOOL_CACHE_PATH,
+            ttl=settings.TOOL_CACHE_TTL_SECONDS,
+            max_items=max_items or settings.TOOL_CACHE_MEMORY_ITEMS,
+            disk=settings.TOOL_CACHE_DISK if disk is None else disk
+        )
+        self._lock = threading.Lock()
+        self.per_tool: Dict[str, Dict[str, int]] = {}
+        self.corrupt = 0
+
+    @staticmethod
+    def make_key(tool_id: str, input_data: Dict[str, Any]) -> Optional[str]:
+        """None when the inputs have no canonical JSON form (and so can't be cached)."""
+        try:
+            payload = canonical_json([tool_id, input_data])
+        except (TypeError, ValueError):
+            return None
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _count(self, tool_id: str, outcome: str):
+        with self._lock:
+            counters = self.per_tool.setdefault(tool_id, {"hits": 0, "misses": 0, "stores": 0})
+            counters[outcome] += 1
+
+    def get(self, tool_id: str, key: str) -> Optional[Dict[str, Any]]:
+        raw = self.store.get(key)
+        if raw is not None:
+            try:
+                entry = json.loads(raw)
+                intact = hashlib.sha256(canonical_json(entry["output"]).encode("utf-8")).hexdigest() == entry["sha256"]
+            except (ValueError, KeyError, TypeError):
+                intact = False
+            if intact:
+                self._count(tool_id, "hits")
+                return entry["output"]
+            logger.warning(f"Tool cache entry for {tool_id} failed its integrity check; re-running the tool")
+            with self._lock:
+                self.corrupt += 1
+        self._count(tool_id, "misses")
+        return None
+
+    def put(self, tool_id: str, key: str, output: Dict[str, Any], ttl: int):
+        try:
+            body = canonical_json(output)
+        except (TypeError, ValueError):
+            return
+        entry = json.dumps({"output": output, "sha256": hashlib.sha256(body.encode("utf-8")).hexdigest()}, ensure_ascii=False)
+        self.store.put(key, entry, model=tool_id, ttl=ttl)
+        self._count(tool_id, "stores")
+
+    def clear(self):
+        self.store.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            tools = {
+                tool_id: {**c, "hit_rate": round(c["hits"] / (c["hits"] + c["misses"]), 4) if c["hits"] + c["misses"] else 0.0}
+                for tool_id, c in self.per_tool.items()
+            }
+            corrupt = self.corrupt
+        return {**self.store.stats(), "corrupt": corrupt, "tools": tools}
+
+_tool_cache: Optional[ToolResultCache] = None
+_tool_cache_lock = threading.Lock()
+
+def get_tool_cache() -> ToolResultCache:
+    """Process-wide cache, so every agent's copy of a tool shares results."""
+    global _tool_cache
+    with _tool_cache_lock:
+        if _tool_cache is None:
+            _tool_cache = ToolResultCache()
+        return _tool_cache
@@ -7,6 +7,8 @@ logger = get_logger(__name__)
 
 class SEOTool(BaseTool):
     """Platinum SEO Tool: Maximizes organic reach through algorithmic optimization."""
+    cacheable = True
+    cache_ttl = 86400
     def __init__(self, config: ToolConfig):
         super().__init__(config)
 
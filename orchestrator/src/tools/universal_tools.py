@@ -14,8 +14,25 @@ CAPABILITIES = {
     "Internal_Growth": ["agent_perf_log", "swarm_latency_audit", "task_bottleneck_find", "self_healing_trigger"]
 }
 
+# Actions that only read or analyse, so repeating one with the same params can reuse the
+# earlier result. Everything else (deploys, applies, refunds, invoices, flushes, ...) has side
+# effects and must run every time.
+READ_ONLY_ACTIONS = frozenset({
+    "iam_audit", "secret_scan", "dependency_audit", "ssl_verify", "pylint_audit", "regex_verify",
+    "seo_rank_check", "keyword_density_analyst", "backlink_verify", "lighthouse_score",
+    "subscription_churn_calc", "tax_nexus_verify", "json_schema_infer", "outlier_detect",
+    "trend_extrapolate", "swarm_latency_audit", "task_bottleneck_find",
+})
+
 class ActionMultiplexer(BaseTool):
     """Unified access point for 150+ agent capabilities."""
+    cacheable = True
+    cache_ttl = 86400
+
+    def should_cache(self, output: Dict[str, Any]) -> bool:
+        """Only read-only actions are cached; side-effecting ones run on every call."""
+        return super().should_cache(output) and output.get("action") in READ_ONLY_ACTIONS
+
     def execute(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
         action = input_data.get("action")
         category = "unknown"
@@ -8,6 +8,8 @@ logger = get_logger(__name__)
 
 class WebSearchTool(BaseTool):
     """Searches the web for information using a search provider (or mock)."""
+    cacheable = True
+    cache_ttl = 900
     def __init__(self, config: ToolConfig, api_key: str = None):
         super().__init__(config)
         self.api_key = api_key
@@ -27,6 +29,8 @@ class WebSearchTool(BaseTool):
 
 class WebScraperTool(BaseTool):
     """Scrapes content from a URL and extracts text."""
+    cacheable = True
+    cache_ttl = 3600
     def execute(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
         url = input_data.get("url", "")
         logger.info(f"Scraping URL: {url}")
@@ -5,17 +5,24 @@ const BACKEND_URL = import.meta.env.VITE_BACKEND_URL || "https://glowfly-sizeabl
 
 export default function Blog() {
   const [posts, setPosts] = useState([]);
+  const [cursor, setCursor] = useState(null);
 
-  useEffect(() => {
+  const loadPage = (after) => {
     const headers = { 
         'X-License-Key': import.meta.env.VITE_SOVEREIGN_LICENSE_KEY || 'mock_dev_key',
         'ngrok-skip-browser-warning': 'true'
     };
-    fetch(`${BACKEND_URL}/api/blog/posts`, { headers })
+    const query = after ? `?limit=20&cursor=${encodeURIComponent(after)}` : '?limit=20';
+    fetch(`${BACKEND_URL}/api/blog${query}`, { headers })
       .then(res => res.json())
-      .then(data => setPosts(data))
+      .then(data => {
+        setPosts(prev => after ? [...prev, ...data.posts] : data.posts);
+        setCursor(data.next_cursor);
+      })
       .catch(err => console.error("Blog Load Error:", err));
-  }, []);
+  };
+
+  useEffect(() => loadPage(null), []);
 
   return (
     <div className="max-w-4xl mx-auto py-20 px-4 font-mono">
@@ -31,6 +38,11 @@ export default function Blog() {
             </Link>
         ))}
       </div>
+      {cursor && (
+        <button onClick={() => loadPage(cursor)} className="mt-12 w-full text-primary hover:text-white text-xs uppercase tracking-widest font-black">
+          Load Older Transmissions
+        </button>
+      )}
     </div>
   );
 }
@@ -8,7 +8,7 @@ export default function BlogPost() {
   const [post, setPost] = useState(null);
 
   useEffect(() => {
-    fetch(`${BACKEND_URL}/api/blog/posts/${slug}`)
+    fetch(`${BACKEND_URL}/api/blog/${slug}`)
       .then(res => res.json())
       .then(data => setPost(data))
       .catch(err => console.error("Failed to load post", err));
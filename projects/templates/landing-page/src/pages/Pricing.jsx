@@ -78,6 +78,8 @@ export default function Pricing() {
       <div className="grid grid-cols-1 md:grid-cols-3 gap-8">
         {!loading && products.map((p, i) => {
            const price = p.prices?.[0];
+           // "pending" prices have no live Stripe id yet; checkout resolves those by product
+           const priceId = price?.stripe_price_id && price.stripe_price_id !== 'pending' ? price.stripe_price_id : price?.product_id;
            return (
             <div key={i} className="bg-black border-2 border-white/5 p-10 rounded-3xl hover:border-primary/30 transition-all flex flex-col group">
               <h3 className="text-2xl font-bold mb-2 uppercase text-white">{p.name}</h3>
@@ -87,7 +89,7 @@ export default function Pricing() {
               </div>
               <p className="text-gray-400 text-sm mb-10">{p.description}</p>
               <button 
-                onClick={() => handleCheckout(price?.stripe_price_id || price?.product_id)}
+                onClick={() => handleCheckout(priceId)}
                 className="w-full bg-white text-black py-4 rounded-xl font-black text-xs uppercase hover:bg-primary transition-colors"
               >
                 Acquire
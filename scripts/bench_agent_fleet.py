@@ -0,0 +1,116 @@
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import time
+import tracemalloc
+
+sys.path.append(os.getcwd())
+
+def rss_mb() -> float:
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+def legacy_matrix(self):
+    """_initialize_sovereign_matrix before the flyweight fleet: every unit built up front, each with its own tool dict."""
+    from orchestrator.src.agents.fleet import generate_grand_fleet
+    from orchestrator.src.core.agent_pool import AgentPool, AgentDirectory
+    from orchestrator.src.core.orchestrator import SovereignCell
+    from orchestrator.src.core.plan_cache import PlanCache
+    from orchestrator.src.tools.registry import default_tools
+
+    class LegacyAgent:
+        def __init__(self, config, tools, memory, llm_provider, plan_cache=None):
+            self.config = config
+            self.tools = {t.config.tool_id: t for t in tools}
+            self.memory = memory
+            self.llm_provider = llm_provider
+            self.plan_cache = plan_cache
+            self.plan_scope = PlanCache.scope_of(list(self.tools))
+            self.history = []
+            self.token_usage = {"calls": 0, "prompt_tokens": 0, "completion_tokens": 0, "snippets_dropped": 0, "duplicates": 0}
+
+    all_tools = default_tools()
+    fleet = generate_grand_fleet()
+    filters = {"ALPHA": ["engineering", "cybernetic"], "BETA": ["market", "force"], "GAMMA": ["strategic", "legal", "revenue", "integrity"]}
+    for key, words in filters.items():
+        agents = [LegacyAgent(c, all_tools, self.memory, self.llm_provider, self.plan_cache) for c in fleet if any(k in c.id.lower() for k in words)]
+        self.cells[key] = SovereignCell(key, AgentPool.of(agents))
+    self.agents = AgentDirectory([cell.agent_pool for cell in self.cells.values()])
+
+def child(mode: str, trace: bool):
+    os.environ["LLM_PROVIDER"] = "mock"  # keep provider/SSL setup out of the numbers
+    from orchestrator.src.core.orchestrator import Orchestrator, get_orchestrator
+
+    if mode == "legacy":
+        Orchestrator._initialize_sovereign_matrix = legacy_matrix
+    matrix = Orchestrator._initialize_sovereign_matrix
+    timings = {}
+
+    def timed_matrix(self):
+        start = time.perf_counter()
+        matrix(self)
+        timings["matrix_ms"] = (time.perf_counter() - start) * 1e3
+    Orchestrator._initialize_sovereign_matrix = timed_matrix
+
+    before = rss_mb()
+    if trace:
+        tracemalloc.start()
+    start = time.perf_counter()
+    orchestrator = get_orchestrator()
+    startup_ms = (time.perf_counter() - start) * 1e3
+    if trace:
+        # Timings under tracemalloc are inflated; traced runs only report the heap
+        print(json.dumps({"mode": mode, "python_heap_mb": round(tracemalloc.get_traced_memory()[0] / 2**20, 2)}))
+        return
+    after = rss_mb()
+
+    # What a scheduler run pays for its orchestrator: a fresh one (before) or the shared one
+    start = time.perf_counter()
+    if mode == "legacy":
+        Orchestrator()
+    else:
+        get_orchestrator()
+    scheduler_ms = (time.perf_counter() - start) * 1e3
+
+    # First task on a cold unit: a lookup (and, when lazy, the build)
+    start = time.perf_counter()
+    orchestrator.agents["agent_revenue_systems_42"]
+    first_lookup_us = (time.perf_counter() - start) * 1e6
+
+    print(json.dumps({
+        "mode": mode,
+        "agents": len(orchestrator.agents),
+        "startup_ms": round(startup_ms, 1),
+        "matrix_ms": round(timings["matrix_ms"], 1),
+        "rss_delta_mb": round(after - before, 2),
+        "scheduler_run_ms": round(scheduler_ms, 2),
+        "first_lookup_us": round(first_lookup_us, 1),
+    }))
+
+def run(mode: str, trace: bool = False) -> dict:
+    out = subprocess.run([sys.executable, __file__, "--child", mode] + (["--trace"] if trace else []), capture_output=True, text=True, check=True, env={**os.environ, "PYTHONPATH": os.getcwd()})
+    # Log lines share stdout; the result is the last JSON line
+    return json.loads([line for line in out.stdout.splitlines() if line.startswith('{"mode"')][-1])
+
+def main(args):
+    if args.child:
+        return child(args.child, args.trace)
+    results = {}
+    for mode in ("legacy", "flyweight"):
+        samples = [run(mode) for _ in range(args.runs)]
+        results[mode] = {key: sorted(s[key] for s in samples)[len(samples) // 2] if key != "mode" else mode for key in samples[0]}
+        results[mode]["python_heap_mb"] = run(mode, trace=True)["python_heap_mb"]
+    print(json.dumps(results, indent=2))
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Fleet startup time and memory: eager per-agent construction vs the flyweight fleet.")
+    parser.add_argument("--runs", type=int, default=5, help="Processes per mode; medians are reported")
+    parser.add_argument("--child", choices=["legacy", "flyweight"], help=argparse.SUPPRESS)
+    parser.add_argument("--trace", action="store_true", help=argparse.SUPPRESS)
+    main(parser.parse_args())
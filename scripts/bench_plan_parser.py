@@ -0,0 +1,89 @@
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.append(os.getcwd())
+
+from orchestrator.src.core import plan_parser
+from orchestrator.src.core.plan_parser import parse_plan, PlanParseError
+
+PLAN = {
+    "reasoning": "Research the topic, then produce the cover and the SEO metadata.",
+    "steps": [
+        {"id": "search", "tool_id": "search", "inputs": {"query": "autonomous agent swarms 2026"}, "depends_on": []},
+        {"id": "cover", "tool_id": "image_gen", "inputs": {"prompt": "Futuristic cover, neon {swarm} motif"}, "depends_on": []},
+        {"id": "meta", "tool_id": "seo", "inputs": {"action": "optimize_meta", "content": "Swarms " * 40, "keywords": ["agents", "swarms"]}, "depends_on": ["search"]},
+    ],
+}
+BODY = json.dumps(PLAN, indent=2)
+
+# Shapes LLM outputs take in practice
+CORPUS = {
+    "bare": BODY,
+    "fenced": f"```json\n{BODY}\n```",
+    "prose": f"Sure! Here is the plan:\n{BODY}\nLet me know if you need changes.",
+    "braces_in_prose": f"I'll fill the {{topic}} slot as requested.\n{BODY}",
+    "two_objects": f"{BODY}\n\nAlternative: {json.dumps({'reasoning': 'fallback', 'steps': []})}",
+    "trailing_commas": BODY.replace("\n  ]\n}", ",\n  ],\n}"),
+    "truncated": BODY[: BODY.rindex('"keywords"')] + '"keywords": ["agents", "swa',
+    "bad_step": json.dumps({"reasoning": "r", "steps": PLAN["steps"] + [{"inputs": {}}]}),
+}
+
+def legacy_parse(response_text: str):
+    """The parser Agent used before plan_parser: first '{' to last '}', then fence stripping."""
+    try:
+        start_idx = response_text.find('{')
+        end_idx = response_text.rfind('}')
+        if start_idx != -1 and end_idx != -1 and end_idx > start_idx:
+            return json.loads(response_text[start_idx : end_idx + 1])
+        if "```json" in response_text:
+            response_text = response_text.split("```json")[1].split("```")[0].strip()
+        elif "```" in response_text:
+            response_text = response_text.split("```")[1].split("```")[0].strip()
+        return json.loads(response_text)
+    except Exception:
+        return None
+
+def new_parse(response_text: str):
+    try:
+        return parse_plan(response_text)
+    except PlanParseError:
+        return None
+
+def recovered(plan) -> bool:
+    return isinstance(plan, dict) and isinstance(plan.get("steps"), list) and len(plan["steps"]) >= 2 and all(isinstance(s, dict) and "tool_id" in s for s in plan["steps"])
+
+def bench(fn, text: str, rounds: int, repeats: int = 5) -> float:
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        for _ in range(rounds):
+            fn(text)
+        best = min(best, time.perf_counter() - start)
+    return best / rounds * 1e6
+
+def main(args):
+    if args.stdlib:
+        plan_parser.orjson = None
+    rows = []
+    for name, text in CORPUS.items():
+        rows.append({
+            "case": name,
+            "legacy_us": round(bench(legacy_parse, text, args.rounds), 2),
+            "new_us": round(bench(new_parse, text, args.rounds), 2),
+            "legacy_ok": recovered(legacy_parse(text)),
+            "new_ok": recovered(new_parse(text)),
+        })
+    print(json.dumps({
+        "backend": "orjson" if plan_parser.orjson is not None else "json",
+        "cases": rows,
+        "recovered": {"legacy": sum(r["legacy_ok"] for r in rows), "new": sum(r["new_ok"] for r in rows), "of": len(rows)},
+    }, indent=2))
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare the plan parser against the old find/rfind + json.loads path.")
+    parser.add_argument("--rounds", type=int, default=2000)
+    parser.add_argument("--stdlib", action="store_true", help="Force the stdlib json backend")
+    main(parser.parse_args())
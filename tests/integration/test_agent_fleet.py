@@ -0,0 +1,96 @@
+import threading
+import unittest
+from unittest.mock import MagicMock
+from orchestrator.src.agents.fleet import fleet_manifest, generate_grand_fleet
+from orchestrator.src.core.agent import Agent
+from orchestrator.src.core.agent_pool import AgentPool
+from orchestrator.src.core.orchestrator import Orchestrator, SovereignCell, get_orchestrator
+from orchestrator.src.tools.registry import ToolRegistry, get_tool_registry
+from orchestrator.src.validation.schemas import AgentConfig
+
+class TestFlyweightFleet(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.orchestrator = Orchestrator()
+
+    def test_agents_are_built_on_first_use_and_kept(self):
+        o = Orchestrator()
+        self.assertEqual(len(o.agents), 850)
+        self.assertEqual(o.agents.materialized(), {})
+        self.assertIn("agent_global_market_force_7", o.agents)
+        self.assertNotIn("agent_visual_intelligence_1", o.agents)  # no cell takes that department
+
+        agent = o.agents["agent_global_market_force_7"]
+        self.assertEqual(agent.config.name, "Global_Market_Force Specialist Unit 7")
+        self.assertIs(o.agents["agent_global_market_force_7"], agent)
+        self.assertIs(o.cells["BETA"].agent_pool[6], agent)
+        self.assertEqual(list(o.agents.materialized()), ["agent_global_market_force_7"])
+        with self.assertRaises(KeyError):
+            o.agents["agent_unknown_1"]
+
+    def test_agents_share_one_read_only_registry(self):
+        o = self.orchestrator
+        first, second = o.cells["ALPHA"].agent_pool[0], o.cells["GAMMA"].agent_pool[-1]
+        self.assertIs(first.tools, get_tool_registry())
+        self.assertIs(first.tools, second.tools)
+        self.assertEqual(first.plan_scope, second.plan_scope)
+        self.assertIn("git", first.tools.keys())
+        with self.assertRaises(TypeError):
+            first.tools._tools["git"] = None
+        with self.assertRaises(AttributeError):
+            first.scratch = 1  # __slots__: no per-agent __dict__
+
+    def test_status_only_counts_built_agents(self):
+        o = Orchestrator()
+        o.cells["GAMMA"].agent_pool[3].token_usage["calls"] += 2
+        self.assertEqual(o.get_matrix_status()["GAMMA"]["units"], 400)
+        self.assertEqual(o.get_token_usage()["cells"]["GAMMA"]["calls"], 2)
+        self.assertEqual(list(o.get_token_usage()["agents"]), [o.cells["GAMMA"].agent_pool[3].config.id])
+        self.assertEqual(len(o.agents.materialized()), 1)
+
+    def test_manifest_matches_the_eager_fleet(self):
+        eager = generate_grand_fleet()
+        manifest = fleet_manifest()
+        self.assertEqual([e.id for e in manifest], [c.id for c in eager])
+        self.assertEqual(manifest[500].config().model_dump(exclude={"created_at", "updated_at"}), eager[500].model_dump(exclude={"created_at", "updated_at"}))
+
+    def test_shared_orchestrator(self):
+        self.assertIs(get_orchestrator(), get_orchestrator())
+
+class TestAgentPool(unittest.TestCase):
+
+    def test_concurrent_first_use_builds_once(self):
+        built = []
+        barrier = threading.Barrier(8)
+
+        def factory(entry):
+            built.append(entry.id)
+            return Agent(entry.config(), [], MagicMock(), MagicMock())
+
+        pool = AgentPool(fleet_manifest()[:4], factory)
+        seen = []
+
+        def use():
+            barrier.wait()
+            seen.append(pool[2])
+
+        threads = [threading.Thread(target=use) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(len(built), 1)
+        self.assertTrue(all(agent is seen[0] for agent in seen))
+        self.assertEqual(len(pool), 4)
+
+    def test_cells_accept_prebuilt_agents(self):
+        config = AgentConfig(id="unit_1", name="Unit", role="tester", description="d", system_prompt="You test.", allowed_tool_ids=[])
+        agent = Agent(config, [], MagicMock(), MagicMock())
+        self.assertIsInstance(agent.tools, ToolRegistry)
+        cell = SovereignCell("TEST", [agent])
+        self.assertIs(cell.agent_pool[0], agent)
+        self.assertEqual(cell.agent_pool.materialized(), [agent])
+
+if __name__ == "__main__":
+    unittest.main()
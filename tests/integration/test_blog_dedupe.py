@@ -0,0 +1,69 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+from orchestrator.src.core.blog.index import PostIndex, get_post_index
+from orchestrator.src.core.blog.dedupe import DuplicateIndex, minhash, similarity, report_substance
+from orchestrator.src.core.alchemy_engine import generate_autonomous_blog_post
+
+REASONING = (
+    "To analyze the strategic implications of Quantum Encryption for the Sovereign Network, "
+    "we will first search for relevant information on the topic, then scrape web data to gather "
+    "specific insights, and finally use this information to provide strategic implications."
+)
+
+class TestDuplicateIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.blog_dir = os.path.join(self.root, "blog")
+        os.makedirs(self.blog_dir)
+        with open(os.path.join(self.blog_dir, "quantum.md"), "w", encoding="utf-8") as f:
+            f.write(f'---\ntitle: "Q"\ndate: "2026-01-01"\n---\n# Update\n\n## Reasoning\n> {REASONING}\n\n## Footer\nBoilerplate.\n')
+
+    def tearDown(self):
+        shutil.rmtree(self.root)
+
+    def test_signatures_estimate_jaccard(self):
+        self.assertEqual(similarity(minhash(REASONING), minhash(REASONING)), 1.0)
+        self.assertLess(similarity(minhash(REASONING), minhash("Market pricing moves for the quarter ahead.")), 0.2)
+        self.assertEqual(report_substance("# T\n> quoted line\nplain\n"), "quoted line")
+
+    def test_finds_near_duplicates_only(self):
+        index = DuplicateIndex(PostIndex(self.blog_dir))
+        reworded = REASONING.replace("and finally use", "and then use")
+        self.assertEqual(index.find_duplicate(reworded)[0], "quantum")
+        self.assertIsNone(index.find_duplicate(REASONING.replace("Quantum Encryption", "Edge Intelligence"), threshold=0.95))
+        self.assertIsNone(index.find_duplicate("An unrelated report about freight routing and warehouse swarms."))
+
+        reopened = DuplicateIndex(PostIndex(self.blog_dir))
+        self.assertEqual(reopened.sync(), 0)  # sketches replayed from disk
+        self.assertIn("quantum", reopened.sketches)
+
+class TestPublishDeduplication(unittest.TestCase):
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.blog_dir = os.path.join(self.root, "blog")
+
+    def tearDown(self):
+        shutil.rmtree(self.root)
+
+    def test_skip_returns_existing_post(self):
+        first = generate_autonomous_blog_post({"agent_id": "UNIT_1", "reasoning": REASONING}, blog_dir=self.blog_dir)
+        second = generate_autonomous_blog_post({"agent_id": "UNIT_2", "reasoning": REASONING + " Again."}, blog_dir=self.blog_dir)
+        self.assertEqual(first, second)
+        self.assertEqual(len(get_post_index(self.blog_dir)), 1)
+
+    @patch("orchestrator.src.core.alchemy_engine.settings")
+    def test_merge_appends_corroboration(self, mock_settings):
+        mock_settings.BLOG_DUPLICATE_POLICY = "merge"
+        mock_settings.BLOG_DUPLICATE_THRESHOLD = 0.8
+        slug = generate_autonomous_blog_post({"agent_id": "UNIT_1", "reasoning": REASONING}, blog_dir=self.blog_dir)
+        self.assertEqual(generate_autonomous_blog_post({"agent_id": "UNIT_2", "reasoning": REASONING}, blog_dir=self.blog_dir), slug)
+        post = get_post_index(self.blog_dir).read(slug)
+        self.assertIn("**UNIT_2** independently reached the same assessment.", post["content"])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,59 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+from orchestrator.src.core.blog import export
+from orchestrator.src.core.blog.export import SiteExporter
+
+def _write_post(blog_dir, slug, date, tags='["ops"]'):
+    with open(os.path.join(blog_dir, f"{slug}.md"), "w", encoding="utf-8") as f:
+        f.write(f'---\ntitle: "{slug}"\ndate: "{date}"\nsummary: "s"\ntags: {tags}\n---\n# {slug}\n')
+
+class TestSiteExport(unittest.TestCase):
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.blog_dir = os.path.join(self.root, "blog")
+        self.out_dir = os.path.join(self.root, "site")
+        os.makedirs(self.blog_dir)
+        for i in range(3):
+            _write_post(self.blog_dir, f"p{i}", f"2026-01-0{i + 1}")
+
+    def tearDown(self):
+        shutil.rmtree(self.root)
+
+    def _export(self):
+        return SiteExporter(self.out_dir, self.blog_dir, base_url="https://example.com", workers=1).export(include_products=False)
+
+    def test_incremental_rebuild(self):
+        first = self._export()
+        self.assertEqual(first["written"], 7)  # 3 posts, index, 1 tag, rss, sitemap
+        self.assertTrue(os.path.exists(os.path.join(self.out_dir, "posts", "p0.html")))
+        self.assertEqual(self._export()["written"], 0)
+
+        _write_post(self.blog_dir, "p3", "2026-01-04", tags='["new"]')
+        second = self._export()
+        # new post, index, new tag page, rss, sitemap; existing posts and the ops tag untouched
+        self.assertEqual(second["written"], 5)
+
+        os.remove(os.path.join(self.blog_dir, "p0.md"))
+        third = self._export()
+        self.assertEqual(third["removed"], 1)
+        self.assertFalse(os.path.exists(os.path.join(self.out_dir, "posts", "p0.html")))
+
+    def test_template_bump_rewrites_post_pages(self):
+        self._export()
+        page = os.path.join(self.out_dir, "posts", "p0.html")
+        with open(page, "w", encoding="utf-8") as f:
+            f.write("old markup")
+        self.assertEqual(self._export()["written"], 0)
+
+        with patch.object(export, "TEMPLATE_VERSION", "2"):
+            bumped = self._export()
+        self.assertEqual(bumped["written"], 7)
+        with open(page, encoding="utf-8") as f:
+            self.assertIn("<article>", f.read())
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,84 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+from orchestrator.src.core.blog import incremental
+from orchestrator.src.core.blog.index import PostIndex
+from orchestrator.src.core.blog.incremental import IncrementalPostIndex, shared_index
+from orchestrator.src.core.blog.dedupe import DuplicateIndex
+from orchestrator.src.core.blog.search import SearchIndex
+
+class LengthIndex(IncrementalPostIndex):
+    """Smallest possible subclass: each post's payload is its file size in bytes."""
+    LABEL = "Length"
+    STORE_SUFFIX = "lengths"
+
+    def _reset(self):
+        super()._reset()
+        self.lengths = {}
+
+    @property
+    def records(self):
+        return self.lengths
+
+    def _snapshot_state(self):
+        return {"lengths": self.lengths}
+
+    def _restore(self, state):
+        self.lengths = state["lengths"]
+
+    def _payload(self, entry):
+        return os.path.getsize(os.path.join(self.post_index.blog_dir, entry["path"]))
+
+    def _apply_add(self, slug, stamp, payload):
+        self.lengths[slug] = {"stamp": stamp, "bytes": payload}
+
+    def _apply_remove(self, slug):
+        self.lengths.pop(slug, None)
+
+class TestIncrementalPostIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.blog_dir = os.path.join(self.root, "blog")
+        os.makedirs(self.blog_dir)
+        for slug in ("a", "b"):
+            self._write(slug, "body")
+
+    def tearDown(self):
+        shutil.rmtree(self.root)
+
+    def _write(self, slug, body):
+        with open(os.path.join(self.blog_dir, f"{slug}.md"), "w", encoding="utf-8") as f:
+            f.write(f'---\ntitle: "{slug}"\ndate: "2026-01-01"\n---\n{body}\n')
+
+    def test_sync_log_compaction_and_reload(self):
+        posts = PostIndex(self.blog_dir)
+        index = LengthIndex(posts)
+        self.assertEqual(index.sync(), 2)
+        self.assertEqual(index.sync(), 0)
+
+        self._write("a", "a longer body")
+        os.remove(os.path.join(self.blog_dir, "b.md"))
+        posts.reconcile()
+        self.assertEqual(index.sync(), 1)
+        self.assertEqual(set(index.lengths), {"a"})
+
+        # Log replay, then a snapshot after compaction, both restore the same state
+        self.assertEqual(LengthIndex(PostIndex(self.blog_dir)).lengths, index.lengths)
+        with patch.object(incremental, "COMPACT_AFTER", 1):
+            self._write("c", "new")
+            posts.upsert("c")
+            index.add_post("c")
+        self.assertEqual(os.path.getsize(index.log_path), 0)
+        self.assertEqual(LengthIndex(PostIndex(self.blog_dir)).lengths, index.lengths)
+
+    def test_one_shared_index_per_kind_and_directory(self):
+        search = shared_index(SearchIndex, self.blog_dir)
+        self.assertIs(shared_index(SearchIndex, self.blog_dir), search)
+        self.assertIsInstance(shared_index(DuplicateIndex, self.blog_dir), DuplicateIndex)
+        self.assertNotEqual(search.store_dir, shared_index(DuplicateIndex, self.blog_dir).store_dir)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,150 @@
+import os
+import asyncio
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+from orchestrator.src.core.blog.index import PostIndex, get_post_index
+from orchestrator.src.core.blog.migrate import migrate_to_shards
+from orchestrator.src.core.alchemy_engine import publish_autonomous_blog_post, _write_post_atomic
+from orchestrator.src.core.blog.frontmatter import parse_markdown_metadata, read_frontmatter
+from orchestrator.src.core.catalog.api import catalog_api
+from orchestrator.src.core.catalog.models import ProductSchema, PriceSchema
+
+def _write_post(blog_dir, slug, title, date, shard=""):
+    os.makedirs(os.path.join(blog_dir, shard), exist_ok=True)
+    with open(os.path.join(blog_dir, shard, f"{slug}.md"), "w", encoding="utf-8") as f:
+        f.write(f'---\ntitle: "{title}"\ndate: "{date}"\nsummary: "s"\n---\n# Body\n')
+
+class TestPostIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.blog_dir = os.path.join(self.root, "blog")
+        os.makedirs(self.blog_dir)
+        _write_post(self.blog_dir, "a", "Alpha", "2026-01-01")
+        _write_post(self.blog_dir, "b", "Beta", "2026-02-01")
+
+    def tearDown(self):
+        shutil.rmtree(self.root)
+
+    def test_listing_sorted_and_persisted(self):
+        index = PostIndex(self.blog_dir)
+        self.assertEqual([p["slug"] for p in index.list()], ["b", "a"])
+        self.assertEqual(index.reconcile(), 0)  # dir unchanged: no stat pass, no reads
+
+        reopened = PostIndex(self.blog_dir)
+        self.assertEqual(reopened.reconcile(), 0)
+        self.assertEqual(reopened.get("a")["title"], "Alpha")
+
+    def test_incremental_updates(self):
+        index = PostIndex(self.blog_dir)
+        index.list()
+
+        _write_post(self.blog_dir, "c", "Gamma", "2026-03-01")
+        index.upsert("c")
+        self.assertEqual(index.list()[0]["slug"], "c")
+
+        os.remove(os.path.join(self.blog_dir, "a.md"))
+        self.assertEqual(index.reconcile(force=True), 0)  # only removals, nothing re-read
+        self.assertIsNone(index.get("a"))
+        self.assertEqual(len(index), 2)
+
+    def test_cursor_pages_are_stable_across_inserts(self):
+        for i in range(5):
+            _write_post(self.blog_dir, f"r{i}", f"R{i}", f"2026-04-0{i + 1}")
+        index = PostIndex(self.blog_dir)
+
+        first = index.page(limit=3)
+        self.assertEqual([p["slug"] for p in first["posts"]], ["r4", "r3", "r2"])
+        self.assertEqual(first["total"], 7)
+
+        _write_post(self.blog_dir, "fresh", "Fresh", "2026-05-01")
+        index.upsert("fresh")
+        second = index.page(cursor=first["next_cursor"], limit=3)
+        self.assertEqual([p["slug"] for p in second["posts"]], ["r1", "r0", "b"])
+
+        third = index.page(cursor=second["next_cursor"], limit=3)
+        self.assertEqual([p["slug"] for p in third["posts"]], ["a"])
+        self.assertIsNone(third["next_cursor"])
+
+        self.assertEqual(index.page(since="2026-04-04")["total"], 3)
+        with self.assertRaises(ValueError):
+            index.page(cursor="not-a-cursor")
+
+    def test_publish_is_atomic_and_indexed(self):
+        slug = asyncio.run(publish_autonomous_blog_post({"agent_id": "UNIT_1", "reasoning": "r"}, blog_dir=self.blog_dir))
+        entry = get_post_index(self.blog_dir).list()[0]
+        self.assertEqual(entry["slug"], slug)
+        self.assertRegex(entry["path"], r"^\d{4}/\d{2}/report-")
+        self.assertFalse([f for _, _, files in os.walk(self.blog_dir) for f in files if f.endswith(".tmp")])
+
+    def test_db_products_link_without_none(self):
+        # DB products have no flat price or checkout_url: the schema carries those as None
+        product = ProductSchema(id="audit", name="Audit", category="General", prices=[PriceSchema(product_id="audit", price=999, currency="USD", interval="one_time")])
+        with patch.object(catalog_api, "get_products", return_value=[product]):
+            asyncio.run(publish_autonomous_blog_post({"agent_id": "UNIT_1", "reasoning": "r"}, blog_dir=self.blog_dir))
+        with open(os.path.join(self.blog_dir, get_post_index(self.blog_dir).list()[0]["path"]), encoding="utf-8") as f:
+            body = f.read()
+        self.assertIn("- **[Audit ($999.0)](/api/checkout/session?priceId=audit)**: \n", body)
+        self.assertNotIn("None", body)
+
+class TestShardedLayout(unittest.TestCase):
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.blog_dir = os.path.join(self.root, "blog")
+        _write_post(self.blog_dir, "old", "Old", "2025-12-03")
+        _write_post(self.blog_dir, "jan", "Jan", "2026-01-05", shard="2026/01")
+
+    def tearDown(self):
+        shutil.rmtree(self.root)
+
+    def test_index_walks_shards(self):
+        index = PostIndex(self.blog_dir)
+        self.assertEqual({p["slug"]: p["path"] for p in index.list()}, {"old": "old.md", "jan": "2026/01/jan.md"})
+
+        # Changes deep in a shard only bump that shard's mtime
+        _write_post(self.blog_dir, "feb", "Feb", "2026-02-01", shard="2026/02")
+        os.remove(os.path.join(self.blog_dir, "2026/01/jan.md"))
+        self.assertEqual([p["slug"] for p in index.list()], ["feb", "old"])
+        self.assertEqual(PostIndex(self.blog_dir).reconcile(), 0)
+
+    def test_same_second_slugs_never_collide(self):
+        index = PostIndex(self.blog_dir)
+        first = _write_post_atomic(self.blog_dir, "2026/03", "report-x", "---\ntitle: A\n---\n")
+        second = _write_post_atomic(self.blog_dir, "2026/03", "report-x", "---\ntitle: B\n---\n")
+        third = _write_post_atomic(self.blog_dir, "2026/04", "old", "---\ntitle: C\n---\n", taken=lambda s: index.get(s) is not None)
+        self.assertEqual([first[0], second[0], third[0]], ["report-x", "report-x-2", "old-2"])
+        self.assertEqual(index.get("report-x")["title"], "A")
+
+    def test_migration_moves_flat_posts(self):
+        index = get_post_index(self.blog_dir)
+        self.assertEqual(migrate_to_shards(self.blog_dir, dry_run=True)["moved"], 1)
+        self.assertTrue(os.path.exists(os.path.join(self.blog_dir, "old.md")))
+
+        stats = migrate_to_shards(self.blog_dir)
+        self.assertEqual((stats["moved"], stats["skipped"]), (1, 1))
+        self.assertEqual(index.get("old")["path"], "2025/12/old.md")
+        self.assertEqual(index.reconcile(), 0)  # the move was recorded, nothing re-read
+        self.assertEqual(migrate_to_shards(self.blog_dir)["moved"], 0)
+
+class TestFrontmatter(unittest.TestCase):
+
+    def test_lists_and_quotes(self):
+        meta = parse_markdown_metadata('---\ntitle: "A: B"\ntags: ["x", "y"]\ncats:\n  - one\n  - two\n---\nbody')
+        self.assertEqual(meta, {"title": "A: B", "tags": ["x", "y"], "cats": ["one", "two"]})
+
+    def test_body_rules_are_not_frontmatter(self):
+        self.assertEqual(parse_markdown_metadata("# Title\n---\nkey: value\n---\n"), {})
+
+    def test_reader_stops_at_closing_fence(self):
+        with tempfile.NamedTemporaryFile("w", suffix=".md", delete=False, encoding="utf-8") as f:
+            f.write('---\ntitle: "T"\n---\n' + "x" * 100000 + "\nlate: field\n")
+        try:
+            self.assertEqual(read_frontmatter(f.name), {"title": "T"})
+        finally:
+            os.remove(f.name)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,83 @@
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+from orchestrator.src.core.blog.index import PostIndex
+from orchestrator.src.core.blog.render import RenderCache, markdown_to_html
+
+class TestBlogRender(unittest.TestCase):
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.blog_dir = os.path.join(self.root, "blog")
+        os.makedirs(self.blog_dir)
+        self._write("# Title\n\n## Part One\n\nSome **bold** text.\n")
+        self.cache = RenderCache(PostIndex(self.blog_dir))
+
+    def tearDown(self):
+        shutil.rmtree(self.root)
+
+    def _write(self, body):
+        with open(os.path.join(self.blog_dir, "post.md"), "w", encoding="utf-8") as f:
+            f.write('---\ntitle: "Post"\n---\n' + body)
+
+    def test_markdown_subset(self):
+        out, toc = markdown_to_html("## A\n\n- one\n- [two](javascript:alert(1))\n\n> quote\n\n`<b>`")
+        self.assertIn('<h2 id="a">A</h2>', out)
+        self.assertIn('<a href="#">two</a>', out)
+        self.assertIn("<blockquote>", out)
+        self.assertIn("<code>&lt;b&gt;</code>", out)
+        self.assertEqual(toc, [{"level": 2, "text": "A", "id": "a"}])
+
+    def test_renders_once_per_version(self):
+        sidecar, body = self.cache.render("post")
+        self.assertIn(b"<strong>bold</strong>", body)
+        self.assertEqual([t["id"] for t in sidecar["toc"]], ["title", "part-one"])
+
+        # A fresh cache over the same files serves the stored bytes
+        again = RenderCache(PostIndex(self.blog_dir)).render("post")
+        self.assertEqual(again[0]["hash"], sidecar["hash"])
+
+        self._write("# Changed\n")
+        self.cache.index.upsert("post")
+        updated, body = self.cache.render("post")
+        self.assertNotEqual(updated["hash"], sidecar["hash"])
+        # The previous version stays for readers holding the old sidecar; older ones are pruned
+        rendered = os.listdir(os.path.join(self.blog_dir, ".rendered"))
+        self.assertEqual(sorted(rendered), sorted([f"post-{sidecar['hash']}.html", f"post-{updated['hash']}.html", "post.json"]))
+
+        self._write("# Changed again\n")
+        self.cache.index.upsert("post")
+        latest, _ = self.cache.render("post")
+        rendered = os.listdir(os.path.join(self.blog_dir, ".rendered"))
+        self.assertEqual(sorted(rendered), sorted([f"post-{updated['hash']}.html", f"post-{latest['hash']}.html", "post.json"]))
+
+    def test_concurrent_renders_of_one_slug(self):
+        # Separate caches stand in for the API and the publisher in different processes
+        caches = [RenderCache(PostIndex(self.blog_dir)) for _ in range(8)]
+        errors = []
+
+        def render(cache, barrier):
+            barrier.wait()
+            try:
+                cache.render("post")
+            except Exception as e:
+                errors.append(e)
+
+        for n in range(20):
+            self._write(f"# Version {n}\n")
+            for cache in caches:
+                cache.index.upsert("post")
+            barrier = threading.Barrier(len(caches))
+            threads = [threading.Thread(target=render, args=(c, barrier)) for c in caches]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+        self.assertEqual(errors, [])
+        self.assertEqual({c.render("post")[1] for c in caches}, {b"<h1 id=\"version-19\">Version 19</h1>"})
+        self.assertFalse([f for f in os.listdir(os.path.join(self.blog_dir, ".rendered")) if f.endswith(".tmp")])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,75 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+from orchestrator.src.core.blog.index import PostIndex
+from orchestrator.src.core.blog import search
+from orchestrator.src.core.blog.search import SearchIndex, tokenize
+
+def _write_post(blog_dir, slug, title, body):
+    with open(os.path.join(blog_dir, f"{slug}.md"), "w", encoding="utf-8") as f:
+        f.write(f'---\ntitle: "{title}"\ndate: "2026-01-01"\nsummary: "s"\n---\n{body}\n')
+
+class TestSearchIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.blog_dir = os.path.join(self.root, "blog")
+        os.makedirs(self.blog_dir)
+        _write_post(self.blog_dir, "quantum", "Quantum Encryption", "Lattice keys resist quantum attacks.")
+        _write_post(self.blog_dir, "swarm", "Swarm Logistics", "Agents route freight. A quantum aside.")
+        _write_post(self.blog_dir, "market", "Market Notes", "Pricing moves for the quarter.")
+
+    def tearDown(self):
+        shutil.rmtree(self.root)
+
+    def test_bm25_ranks_title_matches_first(self):
+        index = SearchIndex(PostIndex(self.blog_dir))
+        self.assertEqual([r["slug"] for r in index.search("quantum")], ["quantum", "swarm"])
+        self.assertEqual(index.search("the of and"), [])
+
+    def test_prefix_matches_last_term(self):
+        index = SearchIndex(PostIndex(self.blog_dir))
+        self.assertEqual([r["slug"] for r in index.search("encryp")], ["quantum"])
+        self.assertEqual(index.search("encryp", prefix=False), [])
+
+    def test_incremental_and_persisted(self):
+        posts = PostIndex(self.blog_dir)
+        index = SearchIndex(posts)
+        index.search("pricing")
+
+        _write_post(self.blog_dir, "fresh", "Fresh Pricing", "Pricing overhaul.")
+        posts.upsert("fresh")
+        index.add_post("fresh")
+        self.assertEqual(index.search("pricing")[0]["slug"], "fresh")
+
+        os.remove(os.path.join(self.blog_dir, "market.md"))
+        self.assertEqual([r["slug"] for r in index.search("pricing")], ["fresh"])
+
+        reopened = SearchIndex(PostIndex(self.blog_dir))
+        self.assertEqual(set(reopened.docs), {"quantum", "swarm", "fresh"})
+        self.assertEqual(reopened.sync(), 0)  # replayed from disk, nothing re-tokenized
+
+    def test_removed_and_edited_posts_leave_no_stale_ranking(self):
+        # "common" is in more posts than SCAN_LIMIT, so it is scored from its cached impact ranking
+        for i in range(6):
+            _write_post(self.blog_dir, f"p{i}", f"Post {i}", "common " + "filler " * (10 - i))
+        posts = PostIndex(self.blog_dir)
+        index = SearchIndex(posts)
+        with patch.object(search, "SCAN_LIMIT", 3):
+            self.assertEqual(index.search("common")[0]["slug"], "p5")
+
+            index.remove_post("p5")
+            self.assertNotIn("p5", [r["slug"] for r in index.search("common")])
+
+            _write_post(self.blog_dir, "p4", "Post 4", "common common")
+            posts.upsert("p4")
+            index.add_post("p4")
+            self.assertEqual(index.search("common")[0]["slug"], "p4")
+
+    def test_tokenize_drops_stopwords(self):
+        self.assertEqual(tokenize("The State of AI-Agents"), ["state", "ai", "agents"])
+
+if __name__ == "__main__":
+    unittest.main()
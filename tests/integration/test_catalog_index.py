@@ -0,0 +1,79 @@
+import os
+import shutil
+import tempfile
+import unittest
+from orchestrator.src.core.catalog.models import ProductSchema, PriceSchema, ProductModel, PriceModel
+from orchestrator.src.core.catalog.index import CatalogIndex, checkout_mode
+from orchestrator.src.core.catalog.api import CatalogAPI
+from orchestrator.src.memory.sql_store import SQLStore
+
+def _product(pid, category, amount, interval="one_time", stripe_id=None):
+    return ProductSchema(id=pid, name=pid, category=category, prices=[
+        PriceSchema(product_id=pid, price=amount, currency="USD", interval=interval, stripe_price_id=stripe_id)
+    ])
+
+class TestCatalogIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.index = CatalogIndex([
+            _product("starter", "Template", 49, stripe_id="price_starter"),
+            _product("platinum", "Membership", 2999, interval="month", stripe_id="price_platinum"),
+            _product("audit", "General", 999, stripe_id="pending"),
+        ])
+
+    def test_resolve_by_stripe_price_and_product_id(self):
+        product, price = self.index.resolve_price("price_platinum")
+        self.assertEqual(product.id, "platinum")
+        self.assertEqual(checkout_mode(price), "subscription")
+        product, price = self.index.resolve_price("starter")
+        self.assertEqual(checkout_mode(price), "payment")
+        self.assertIsNone(self.index.resolve_price("pending"))
+        self.assertIsNone(self.index.resolve_price("price_unknown"))
+
+    def test_range_and_category_query(self):
+        ids = [p.id for p in self.index.query(min_price=100, max_price=3000)]
+        self.assertEqual(ids, ["audit", "platinum"])
+        ids = [p.id for p in self.index.query(category="template")]
+        self.assertEqual(ids, ["starter"])
+
+    def test_flat_slot_price_is_lifted(self):
+        p = CatalogAPI._slot_to_schema({"id": "x", "name": "X", "category": "General", "price": 19, "stripe_price_id": "price_x"})
+        self.assertEqual(p.prices[0].price, 19.0)
+        self.assertEqual(p.prices[0].stripe_price_id, "price_x")
+
+class TestCatalogRefresh(unittest.TestCase):
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.api = CatalogAPI()
+        self.api.SLOT_PATH = os.path.join(self.root, "slots", "*.json")
+        self.api.store = SQLStore(f"sqlite:///{os.path.join(self.root, 'catalog.db')}")
+
+    def tearDown(self):
+        self.api.store.engine.dispose()
+        shutil.rmtree(self.root)
+
+    def _add(self, pid, amount):
+        session = self.api.store.Session()
+        try:
+            session.add(ProductModel(id=pid, name=pid, category="General", prices=[PriceModel(price=amount, currency="USD", interval="one_time")]))
+            session.commit()
+        finally:
+            session.close()
+
+    def test_db_fallback_picks_up_new_rows(self):
+        self._add("first", 10)
+        self.assertEqual([p.id for p in self.api.get_products()], ["first"])
+        self._add("second", 20)
+        self.assertEqual(sorted(p.id for p in self.api.get_products()), ["first", "second"])
+
+        # All slot files corrupt: still the DB, still watched
+        os.makedirs(os.path.join(self.root, "slots"))
+        with open(os.path.join(self.root, "slots", "bad.json"), "w") as f:
+            f.write("{not json")
+        self.assertEqual(len(self.api.get_products()), 2)
+        self._add("third", 30)
+        self.assertEqual(len(self.api.get_products()), 3)
+
+if __name__ == "__main__":
+    unittest.main()
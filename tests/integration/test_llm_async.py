@@ -0,0 +1,80 @@
+import asyncio
+import threading
+import unittest
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+from orchestrator.src.core.llm_provider import BaseLLMProvider, GroqProvider
+from orchestrator.src.core.agent import Agent
+from orchestrator.src.validation.schemas import AgentConfig, TaskSpec
+
+class SyncProvider(BaseLLMProvider):
+    def generate_response(self, messages, **kwargs):
+        return '{"reasoning": "sync plan", "steps": []}'
+
+class TestAsyncProvider(unittest.TestCase):
+
+    def test_concurrency_limits_per_model_and_global(self):
+        provider = GroqProvider(api_key="test-key", max_concurrency=3, model_concurrency={"small": 2})
+        in_flight = {"small": 0, "large": 0}
+        peak = {"small": 0, "large": 0, "total": 0}
+
+        async def fake_create(model, **kwargs):
+            in_flight[model] += 1
+            peak[model] = max(peak[model], in_flight[model])
+            peak["total"] = max(peak["total"], sum(in_flight.values()))
+            await asyncio.sleep(0.01)
+            in_flight[model] -= 1
+            return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=model))])
+
+        async def run():
+            provider._pool().client.chat.completions.create = fake_create
+            calls = [provider.agenerate_response([{"role": "user", "content": "x"}], model=m) for m in ["small"] * 6 + ["large"] * 6]
+            out = await asyncio.gather(*calls)
+            await provider.aclose()
+            return out
+
+        out = asyncio.run(run())
+        self.assertEqual(out, ["small"] * 6 + ["large"] * 6)
+        self.assertEqual(peak["small"], 2)
+        self.assertLessEqual(peak["total"], 3)
+
+    def test_pool_is_per_event_loop(self):
+        provider = GroqProvider(api_key="test-key")
+
+        async def pool():
+            return provider._pool()
+
+        self.assertIsNot(asyncio.run(pool()), asyncio.run(pool()))
+
+    def test_mock_mode_stays_on_the_loop(self):
+        provider = GroqProvider(api_key="placeholder")
+        main = threading.get_ident()
+
+        def fail(*args, **kwargs):
+            raise AssertionError("sync path used")
+
+        provider.generate_response = fail
+        text = asyncio.run(provider.agenerate_response([{"role": "user", "content": "analyze the market"}]))
+        self.assertIn("reasoning", text)
+        self.assertEqual(threading.get_ident(), main)
+
+    def test_sync_providers_get_a_threaded_default(self):
+        text = asyncio.run(SyncProvider().agenerate_response([{"role": "user", "content": "x"}], model="m"))
+        self.assertIn("sync plan", text)
+
+class TestAgentAsync(unittest.TestCase):
+
+    def test_aprocess_task_matches_sync_pipeline(self):
+        memory = MagicMock()
+        memory.search.return_value = []
+        config = AgentConfig(id="unit_1", name="Unit", role="tester", description="d", system_prompt="You test.", allowed_tool_ids=[])
+        agent = Agent(config, [], memory, SyncProvider())
+        task = TaskSpec(project_id="p", description="analyze")
+
+        result = asyncio.run(agent.aprocess_task(task))
+        self.assertEqual(result["status"], "completed")
+        self.assertEqual(result["reasoning"], "sync plan")
+        self.assertEqual(agent.process_task(task)["reasoning"], result["reasoning"])
+
+if __name__ == "__main__":
+    unittest.main()
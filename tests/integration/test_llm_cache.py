@@ -0,0 +1,96 @@
+import os
+import asyncio
+import shutil
+import tempfile
+import threading
+import unittest
+from orchestrator.src.core.llm_provider import BaseLLMProvider, MockResponse
+from orchestrator.src.core.llm_cache import CachedLLMProvider, ResponseCache
+from orchestrator.src.core.llm_resilience import Bulkhead, BulkheadLLMProvider
+
+MESSAGES = [{"role": "user", "content": "Write the launch copy."}]
+
+class CountingProvider(BaseLLMProvider):
+    default_model = "m"
+
+    def __init__(self, mock: bool = False):
+        self.calls = 0
+        self.mock = mock
+
+    def generate_response(self, messages, model=None, temperature=0.7, max_tokens=None):
+        self.calls += 1
+        text = f"answer {self.calls}"
+        return MockResponse(text) if self.mock else text
+
+class TestResponseCache(unittest.TestCase):
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.path = os.path.join(self.root, "cache.sqlite3")
+
+    def tearDown(self):
+        shutil.rmtree(self.root)
+
+    def test_memory_then_disk_tier(self):
+        inner = CountingProvider()
+        provider = CachedLLMProvider(inner, ResponseCache(self.path))
+        self.assertEqual(provider.generate_response(MESSAGES), "answer 1")
+        self.assertEqual(provider.generate_response(MESSAGES), "answer 1")
+        self.assertEqual(provider.generate_response(MESSAGES, temperature=0.2), "answer 2")  # temperature is part of the key
+
+        restarted = CachedLLMProvider(inner, ResponseCache(self.path))
+        self.assertEqual(asyncio.run(restarted.agenerate_response(MESSAGES)), "answer 1")
+        self.assertEqual(inner.calls, 2)
+        self.assertEqual(restarted.stats()["cache"]["disk_hits"], 1)
+        self.assertEqual(provider.stats()["cache"]["hit_rate"], round(1 / 3, 4))
+
+    def test_opt_out_ttl_and_mock_output(self):
+        inner = CountingProvider()
+        provider = CachedLLMProvider(inner, ResponseCache(self.path))
+        provider.generate_response(MESSAGES)
+        self.assertEqual(provider.generate_response(MESSAGES, cache=False), "answer 2")
+        self.assertEqual(provider.cache.stats()["bypassed"], 1)
+
+        expired = CachedLLMProvider(inner, ResponseCache(os.path.join(self.root, "ttl.sqlite3"), ttl=0))
+        expired.generate_response(MESSAGES)
+        self.assertEqual(expired.generate_response(MESSAGES), "answer 4")
+
+        mock = CachedLLMProvider(CountingProvider(mock=True), ResponseCache(os.path.join(self.root, "mock.sqlite3")))
+        mock.generate_response(MESSAGES)
+        self.assertEqual(mock.generate_response(MESSAGES), "answer 2")
+        self.assertEqual(mock.cache.stats()["stores"], 0)
+
+    def test_opt_out_through_the_cell_bulkhead(self):
+        inner = CountingProvider()
+        cell = BulkheadLLMProvider(CachedLLMProvider(inner, ResponseCache(self.path)), Bulkhead("ALPHA", 1))
+        cell.generate_response(MESSAGES)
+        self.assertEqual(cell.generate_response(MESSAGES, cache=False), "answer 2")
+        self.assertEqual(asyncio.run(cell.agenerate_response(MESSAGES, cache=False)), "answer 3")
+        self.assertEqual(cell.stats()["cache"]["bypassed"], 2)
+
+        # With the cache disabled the opt-out is a no-op, not a TypeError
+        uncached = BulkheadLLMProvider(CountingProvider(), Bulkhead("BETA", 1))
+        self.assertEqual(uncached.generate_response(MESSAGES, cache=False), "answer 1")
+
+    def test_async_disk_tier_runs_off_the_event_loop(self):
+        cache = ResponseCache(self.path)
+        threads = []
+        disk_get, disk_put = cache._disk_get, cache._disk_put
+        cache._disk_get = lambda *args: threads.append(threading.get_ident()) or disk_get(*args)
+        cache._disk_put = lambda *args: threads.append(threading.get_ident()) or disk_put(*args)
+        provider = CachedLLMProvider(CountingProvider(), cache)
+
+        async def run():
+            loop_thread = threading.get_ident()
+            first = await provider.agenerate_response(MESSAGES)  # disk miss, then disk write
+            cache._memory.clear()
+            second = await provider.agenerate_response(MESSAGES)  # disk hit
+            return loop_thread, first, second
+
+        loop_thread, first, second = asyncio.run(run())
+        self.assertEqual((first, second), ("answer 1", "answer 1"))
+        self.assertEqual(len(threads), 3)
+        self.assertNotIn(loop_thread, threads)
+
+if __name__ == "__main__":
+    unittest.main()
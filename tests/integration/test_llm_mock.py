@@ -0,0 +1,116 @@
+import time
+import asyncio
+import unittest
+from orchestrator.src.core.llm_mock import MockLLMProvider, MockLLMError
+from orchestrator.src.core.llm_ratelimit import RateLimiter, LLMThrottledError
+from orchestrator.src.core.llm_router import LLMRouter
+from orchestrator.src.core.model_tiers import MeteredLLMProvider
+from orchestrator.src.core.tokenizer import count_tokens, count_message_tokens
+
+def prompt(n):
+    return [{"role": "user", "content": f"Summarize ticket {n}"}]
+
+def unlimited():
+    return RateLimiter(requests_per_minute=0, tokens_per_minute=0)
+
+def percentile(values, q):
+    return sorted(values)[int(q * len(values))]
+
+class TestMockLLMProvider(unittest.TestCase):
+
+    def test_runs_are_reproducible_regardless_of_call_order(self):
+        def outcomes(provider, order):
+            result = {}
+            for n in order:
+                plan = provider._plan(prompt(n), None)
+                result[n] = (plan["delay"], plan["failed"])
+            return result
+
+        a = outcomes(MockLLMProvider(seed=7, error_rate=0.3), range(50))
+        b = outcomes(MockLLMProvider(seed=7, error_rate=0.3), reversed(range(50)))
+        c = outcomes(MockLLMProvider(seed=8, error_rate=0.3), range(50))
+        self.assertEqual(a, b)
+        self.assertNotEqual(a, c)
+
+    def test_latency_distributions(self):
+        fixed = MockLLMProvider(distribution="fixed", latency_ms=250)
+        self.assertEqual(set(fixed.sample_latencies(10)), {0.25})
+
+        body = MockLLMProvider(distribution="lognormal", latency_ms=200, sigma=0.5).sample_latencies(4000)
+        self.assertAlmostEqual(percentile(body, 0.5), 0.2, delta=0.02)
+        tail = MockLLMProvider(distribution="longtail", latency_ms=200, sigma=0.5, tail_probability=0.05, tail_multiplier=20).sample_latencies(4000)
+        self.assertAlmostEqual(percentile(tail, 0.5), 0.2, delta=0.03)
+        self.assertGreater(percentile(tail, 0.99), 3 * percentile(body, 0.99))
+
+    def test_error_injection(self):
+        provider = MockLLMProvider(latency_ms=0, error_rate=0.25, limiter=unlimited())
+        errors = 0
+        for n in range(400):
+            try:
+                provider.generate_response(prompt(n))
+            except MockLLMError:
+                errors += 1
+        self.assertTrue(70 <= errors <= 130)
+        self.assertEqual(provider.stats()["mock"]["errors"], errors)
+
+        with self.assertRaises(LLMThrottledError):
+            MockLLMProvider(latency_ms=0, error_rate=1.0, error_kind="throttle", limiter=unlimited()).generate_response(prompt(0))
+
+    def test_token_rate_and_concurrency(self):
+        provider = MockLLMProvider(distribution="fixed", latency_ms=50, tokens_per_second=2000, limiter=unlimited())
+        text = provider.generate_response(prompt("x"))
+        expected = 0.05 + count_tokens(text) / 2000
+
+        async def run():
+            start = time.monotonic()
+            await asyncio.gather(*(provider.agenerate_response(prompt(n)) for n in range(20)))
+            together = time.monotonic() - start
+
+            start = time.monotonic()
+            pieces = [piece async for piece in provider.astream_response(prompt("stream"))]
+            return together, time.monotonic() - start, pieces
+
+        together, streamed, pieces = asyncio.run(run())
+        # 20 concurrent calls take about as long as one: nothing blocks the loop
+        self.assertLess(together, expected * 3)
+        self.assertGreater(len(pieces), 1)
+        self.assertGreaterEqual(streamed, 0.05)
+
+    def test_calls_go_through_the_rate_limiter(self):
+        # An exhausted 600/min budget: one request every 100ms
+        limiter = RateLimiter(requests_per_minute=600, tokens_per_minute=0)
+        limiter.requests.level = 0
+        provider = MockLLMProvider(distribution="fixed", latency_ms=0, limiter=limiter)
+
+        async def run():
+            start = time.monotonic()
+            await asyncio.gather(*(provider.agenerate_response(prompt(n)) for n in range(3)))
+            return time.monotonic() - start
+
+        self.assertGreaterEqual(asyncio.run(run()), 0.29)
+        rate_limit = provider.stats()["rate_limit"]
+        self.assertEqual((rate_limit["admitted"], rate_limit["delayed"]), (3, 3))
+
+        # Usage is settled at the simulated prompt + completion tokens
+        tokens = RateLimiter(requests_per_minute=0, tokens_per_minute=6000)
+        provider = MockLLMProvider(latency_ms=0, limiter=tokens)
+        text = provider.generate_response(prompt("t"), max_tokens=1000)
+        used = count_message_tokens(prompt("t")) + count_tokens(text)
+        self.assertAlmostEqual(tokens.tokens.level, 6000 - used, delta=1)
+
+        throttled = RateLimiter(requests_per_minute=0, tokens_per_minute=0)
+        with self.assertRaises(LLMThrottledError):
+            MockLLMProvider(latency_ms=0, error_rate=1.0, error_kind="throttle", limiter=throttled).generate_response(prompt(0))
+        self.assertEqual(throttled.stats()["throttled"], 1)
+
+    def test_mock_backends_are_never_priced(self):
+        direct = MeteredLLMProvider(MockLLMProvider(latency_ms=0, limiter=unlimited()))
+        routed = MeteredLLMProvider(LLMRouter([MockLLMProvider(latency_ms=0, limiter=unlimited())]))
+        for provider in (direct, routed):
+            provider.generate_response(prompt(1), model="llama-3.3-70b-versatile")
+            asyncio.run(provider.agenerate_response(prompt(2), model="llama-3.3-70b-versatile"))
+            tier = provider.stats()["tiers"]["large"]
+            self.assertEqual((tier["calls"], tier["mock"], tier["cost_usd"], tier["baseline_cost_usd"]), (2, 2, 0, 0))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,116 @@
+import asyncio
+import unittest
+from types import SimpleNamespace
+from unittest.mock import patch
+import httpx
+from groq import RateLimitError
+from orchestrator.src.core.config import settings
+from orchestrator.src.core.llm_provider import GroqProvider, MockResponse
+from orchestrator.src.core.llm_ratelimit import RateLimiter, LLMThrottledError, parse_duration
+
+MESSAGES = [{"role": "user", "content": "Draft the weekly summary."}]
+
+def rate_limited(retry_after: str = "0.01") -> RateLimitError:
+    response = httpx.Response(429, headers={"retry-after": retry_after}, request=httpx.Request("POST", "https://api.groq.com"))
+    return RateLimitError("rate limited", response=response, body=None)
+
+def completion(text: str, total_tokens: int = 50):
+    return SimpleNamespace(
+        choices=[SimpleNamespace(message=SimpleNamespace(content=text))],
+        usage=SimpleNamespace(total_tokens=total_tokens),
+    )
+
+class TestRateLimiter(unittest.TestCase):
+
+    def test_callers_are_queued_in_arrival_order(self):
+        limiter = RateLimiter(requests_per_minute=60, tokens_per_minute=0, max_wait=100)
+        waits = [limiter.reserve(10) for _ in range(63)]
+        self.assertEqual(waits[:60], [0.0] * 60)
+        # 1 request/s refill: each queued caller waits about a second longer than the one before
+        for n, wait in enumerate(waits[60:], start=1):
+            self.assertAlmostEqual(wait, n, delta=0.05)
+        self.assertEqual(limiter.stats()["delayed"], 3)
+
+    def test_waits_beyond_max_wait_are_rejected(self):
+        limiter = RateLimiter(requests_per_minute=0, tokens_per_minute=600, max_wait=0.5)
+        limiter.reserve(600)
+        with self.assertRaises(LLMThrottledError) as ctx:
+            limiter.reserve(100)
+        self.assertGreater(ctx.exception.retry_after, 0.5)
+        self.assertEqual(limiter.stats()["rejected"], 1)
+        # The rejected call reserved nothing
+        limiter.settle(600, 0)
+        self.assertEqual(limiter.reserve(100), 0.0)
+
+    def test_adapts_to_headers_and_429s(self):
+        limiter = RateLimiter(requests_per_minute=0, tokens_per_minute=6000, max_wait=100)
+        limiter.observe({"x-ratelimit-limit-tokens": "12000", "x-ratelimit-remaining-tokens": "100"})
+        self.assertEqual(limiter.stats()["tokens_per_minute"], 12000)
+        self.assertAlmostEqual(limiter.reserve(300), 1.0, delta=0.05)  # 200 short at 200 tokens/s
+
+        self.assertEqual(limiter.penalize({"retry-after": "2"}), 2.0)
+        self.assertEqual(limiter.stats()["throttle"], 0.5)
+        self.assertGreaterEqual(limiter.reserve(1), 1.9)
+        for attempt in range(4):
+            delay = limiter.backoff(attempt)
+            ceiling = min(settings.LLM_BACKOFF_MAX_SECONDS, settings.LLM_BACKOFF_BASE_SECONDS * 2 ** attempt)
+            self.assertTrue(ceiling / 2 <= delay <= ceiling)
+        self.assertEqual(limiter.backoff(0, retry_after=5), 5)
+
+    def test_parse_duration(self):
+        self.assertEqual(parse_duration("12"), 12.0)
+        self.assertAlmostEqual(parse_duration("2m59.56s"), 179.56)
+        self.assertAlmostEqual(parse_duration("120ms"), 0.12)
+        self.assertIsNone(parse_duration("soon"))
+
+@patch.object(settings, "LLM_BACKOFF_BASE_SECONDS", 0.01)
+class TestThrottledProvider(unittest.TestCase):
+
+    def make_provider(self, outcomes, **kwargs):
+        provider = GroqProvider(api_key="test-key", limiter=RateLimiter(600, 100000, max_wait=5), **kwargs)
+        calls = iter(outcomes)
+
+        def create(**_):
+            outcome = next(calls)
+            if isinstance(outcome, Exception):
+                raise outcome
+            return outcome
+
+        provider.client.chat.completions.create = create
+        return provider
+
+    def test_retries_429_with_backoff(self):
+        provider = self.make_provider([rate_limited(), rate_limited(), completion("done")], max_retries=2, mock_fallback=False)
+        self.assertEqual(provider.generate_response(MESSAGES), "done")
+        stats = provider.stats()["rate_limit"]
+        self.assertEqual((stats["throttled"], stats["retries"]), (2, 2))
+
+    def test_strict_mode_surfaces_throttling(self):
+        provider = self.make_provider([rate_limited()] * 2, max_retries=1, mock_fallback=False)
+        with self.assertRaises(LLMThrottledError):
+            provider.generate_response(MESSAGES)
+
+        lenient = self.make_provider([rate_limited()] * 2, max_retries=1, mock_fallback=True)
+        self.assertIsInstance(lenient.generate_response(MESSAGES), MockResponse)
+
+    def test_async_path_shares_the_limiter(self):
+        provider = self.make_provider([], max_retries=1, mock_fallback=False)
+        outcomes = iter([rate_limited(), completion("async done")])
+
+        async def run():
+            async def create(**_):
+                outcome = next(outcomes)
+                if isinstance(outcome, Exception):
+                    raise outcome
+                return outcome
+            provider._pool().client.chat.completions.create = create
+            try:
+                return await provider.agenerate_response(MESSAGES)
+            finally:
+                await provider.aclose()
+
+        self.assertEqual(asyncio.run(run()), "async done")
+        self.assertEqual(provider.stats()["rate_limit"]["throttled"], 1)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,167 @@
+import time
+import asyncio
+import threading
+import unittest
+from orchestrator.src.core.llm_provider import BaseLLMProvider, FallbackResponse
+from orchestrator.src.core.llm_resilience import (
+    CircuitBreaker, CircuitBreakerProvider, CircuitOpenError, Bulkhead, BulkheadLLMProvider, BulkheadFullError,
+    CLOSED, OPEN, HALF_OPEN
+)
+
+MESSAGES = [{"role": "user", "content": "Stay up."}]
+
+class FlakyProvider(BaseLLMProvider):
+    """Fails (by raising, or with fallback text) while `down` is set."""
+
+    def __init__(self, fallback: bool = False, latency: float = 0.0):
+        self.down = True
+        self.fallback = fallback
+        self.latency = latency
+        self.calls = 0
+        self.active = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    def _answer(self) -> str:
+        if not self.down:
+            return "ok"
+        if self.fallback:
+            return FallbackResponse("fallback")
+        raise ConnectionError("backend down")
+
+    def generate_response(self, messages, model=None, temperature=0.7, max_tokens=None):
+        with self._lock:
+            self.calls += 1
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        time.sleep(self.latency)
+        with self._lock:
+            self.active -= 1
+        return self._answer()
+
+    async def agenerate_response(self, messages, model=None, temperature=0.7, max_tokens=None):
+        with self._lock:
+            self.calls += 1
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        await asyncio.sleep(self.latency)
+        with self._lock:
+            self.active -= 1
+        return self._answer()
+
+class TestCircuitBreaker(unittest.TestCase):
+
+    def test_state_transitions(self):
+        breaker = CircuitBreaker("stub", failure_threshold=3, reset_timeout=0.05, half_open_calls=1)
+        for _ in range(2):
+            breaker.allow()
+            breaker.record_failure()
+        self.assertEqual(breaker.state, CLOSED)
+        breaker.allow()
+        breaker.record_failure()
+        self.assertEqual(breaker.state, OPEN)
+        with self.assertRaises(CircuitOpenError) as ctx:
+            breaker.allow()
+        self.assertGreater(ctx.exception.retry_after, 0)
+
+        time.sleep(0.06)
+        breaker.allow()  # the trial call
+        self.assertEqual(breaker.state, HALF_OPEN)
+        with self.assertRaises(CircuitOpenError):
+            breaker.allow()  # only one trial at a time
+        breaker.record_failure()
+        self.assertEqual(breaker.state, OPEN)
+
+        time.sleep(0.06)
+        breaker.allow()
+        breaker.record_success()
+        self.assertEqual(breaker.state, CLOSED)
+        self.assertEqual(breaker.stats()["opened"], 2)
+
+    def test_open_circuit_fails_fast(self):
+        backend = FlakyProvider()
+        strict = CircuitBreakerProvider(backend, CircuitBreaker("stub", failure_threshold=2, reset_timeout=60), mock_fallback=False)
+        for _ in range(2):
+            with self.assertRaises(ConnectionError):
+                strict.generate_response(MESSAGES)
+        with self.assertRaises(CircuitOpenError):
+            strict.generate_response(MESSAGES)
+        self.assertEqual(backend.calls, 2)
+
+        lenient = CircuitBreakerProvider(FlakyProvider(fallback=True), CircuitBreaker("stub", failure_threshold=2, reset_timeout=60), mock_fallback=True)
+        for _ in range(5):
+            self.assertIsInstance(lenient.generate_response(MESSAGES), FallbackResponse)
+        self.assertEqual(lenient.inner.calls, 2)
+        self.assertEqual(lenient.stats()["breaker"]["rejected"], 3)
+
+    def test_recovers_through_half_open(self):
+        backend = FlakyProvider()
+        provider = CircuitBreakerProvider(backend, CircuitBreaker("stub", failure_threshold=1, reset_timeout=0.05), mock_fallback=False)
+
+        async def run():
+            with self.assertRaises(ConnectionError):
+                await provider.agenerate_response(MESSAGES)
+            with self.assertRaises(CircuitOpenError):
+                await provider.agenerate_response(MESSAGES)
+            backend.down = False
+            await asyncio.sleep(0.06)
+            return await provider.agenerate_response(MESSAGES)
+
+        self.assertEqual(asyncio.run(run()), "ok")
+        self.assertEqual(provider.breaker.state, CLOSED)
+
+class TestBulkhead(unittest.TestCase):
+
+    def test_caps_threads_and_tasks_together(self):
+        backend = FlakyProvider(latency=0.02)
+        backend.down = False
+        provider = BulkheadLLMProvider(backend, Bulkhead("cell", 3, timeout=5))
+
+        threads = [threading.Thread(target=provider.generate_response, args=(MESSAGES,)) for _ in range(6)]
+        for t in threads:
+            t.start()
+
+        async def burst():
+            await asyncio.gather(*(provider.agenerate_response(MESSAGES) for _ in range(6)))
+
+        asyncio.run(burst())
+        for t in threads:
+            t.join()
+        self.assertEqual(backend.calls, 12)
+        self.assertLessEqual(backend.peak, 3)
+        stats = provider.stats()["bulkhead"]
+        self.assertEqual((stats["active"], stats["waiting"], stats["admitted"]), (0, 0, 12))
+
+    def test_slots_are_handed_out_in_arrival_order(self):
+        bulkhead = Bulkhead("cell", 1, timeout=5)
+        order = []
+
+        async def one(n):
+            await bulkhead.aacquire()
+            order.append(n)
+            await asyncio.sleep(0.005)
+            bulkhead.release()
+
+        async def run():
+            await asyncio.gather(*(one(n) for n in range(5)))
+
+        asyncio.run(run())
+        self.assertEqual(order, list(range(5)))
+
+    def test_times_out_when_full(self):
+        bulkhead = Bulkhead("cell", 1, timeout=0.02)
+        bulkhead.acquire()
+        with self.assertRaises(BulkheadFullError):
+            bulkhead.acquire()
+
+        async def run():
+            with self.assertRaises(BulkheadFullError):
+                await bulkhead.aacquire()
+
+        asyncio.run(run())
+        bulkhead.release()
+        self.assertEqual(bulkhead.stats()["rejected"], 2)
+        bulkhead.acquire()  # the abandoned waiters did not keep the slot
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,126 @@
+import time
+import asyncio
+import unittest
+from orchestrator.src.core.llm_provider import BaseLLMProvider, MockResponse
+from orchestrator.src.core.llm_router import LLMRouter
+from orchestrator.src.core.model_tiers import tier_model
+
+MESSAGES = [{"role": "user", "content": "Route me."}]
+
+class StubProvider(BaseLLMProvider):
+    """Local backend with a scripted latency and failure mode."""
+
+    def __init__(self, label: str, latency: float = 0.0, fail: bool = False, mock: bool = False, provider: str = None, default_model: str = None):
+        self.label = label
+        self.latency = latency
+        self.fail = fail
+        self.mock = mock
+        self.provider = provider
+        self.default_model = default_model
+        self.calls = 0
+        self.cancelled = 0
+        self.models = []
+
+    @property
+    def name(self) -> str:
+        return self.provider or super().name
+
+    def _answer(self) -> str:
+        if self.fail:
+            raise ConnectionError(f"{self.label} down")
+        return MockResponse(f"mock from {self.label}") if self.mock else f"answer from {self.label}"
+
+    def generate_response(self, messages, model=None, temperature=0.7, max_tokens=None):
+        self.calls += 1
+        self.models.append(model)
+        time.sleep(self.latency)
+        return self._answer()
+
+    async def agenerate_response(self, messages, model=None, temperature=0.7, max_tokens=None):
+        self.calls += 1
+        self.models.append(model)
+        try:
+            await asyncio.sleep(self.latency)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        return self._answer()
+
+def run_many(router, n):
+    async def run():
+        return [await router.agenerate_response(MESSAGES) for _ in range(n)]
+    return asyncio.run(run())
+
+class TestLLMRouter(unittest.TestCase):
+
+    def test_prefers_the_fastest_backend(self):
+        slow, fast = StubProvider("slow", 0.02), StubProvider("fast", 0.002)
+        router = LLMRouter([slow, fast], hedge=False)
+        out = run_many(router, 20)
+        # Each backend is measured once, then the fast one takes everything
+        self.assertEqual(slow.calls, 1)
+        self.assertEqual(out[-1], "answer from fast")
+        stats = router.stats()["router"]["backends"]
+        self.assertLess(stats["StubProvider'"]["p50_ms"], stats["StubProvider"]["p50_ms"])
+
+    def test_failing_backend_is_benched(self):
+        broken, healthy = StubProvider("broken", fail=True), StubProvider("healthy", 0.001)
+        router = LLMRouter([broken, healthy], hedge=False, cooldown=60)
+        for _ in range(30):
+            self.assertEqual(router.generate_response(MESSAGES), "answer from healthy")
+        self.assertLess(broken.calls, 30)
+        self.assertFalse(router.stats()["router"]["backends"]["StubProvider"]["healthy"])
+        self.assertGreater(router.stats()["router"]["failovers"], 0)
+
+    def test_mock_output_counts_as_failure_but_is_the_last_resort(self):
+        placeholder = StubProvider("placeholder", mock=True)
+        self.assertEqual(run_many(LLMRouter([placeholder, StubProvider("real")], hedge=False), 1), ["answer from real"])
+        self.assertEqual(LLMRouter([placeholder, StubProvider("down", fail=True)]).generate_response(MESSAGES), "mock from placeholder")
+        with self.assertRaises(ConnectionError):
+            LLMRouter([StubProvider("down", fail=True)]).generate_response(MESSAGES)
+
+    def test_hedges_past_p95_and_cancels_the_loser(self):
+        primary, backup = StubProvider("primary", 0.005), StubProvider("backup", 0.02)
+        router = LLMRouter([primary, backup], hedge=True)
+        run_many(router, 12)  # primary wins the ranking and builds its latency window
+        backup_calls = backup.calls
+
+        primary.latency = 1.0  # stalls
+        start = time.monotonic()
+        self.assertEqual(run_many(router, 1), ["answer from backup"])
+        self.assertLess(time.monotonic() - start, 0.5)
+        self.assertEqual(backup.calls, backup_calls + 1)
+        self.assertEqual(primary.cancelled, 1)
+        counters = router.stats()["router"]
+        self.assertEqual((counters["hedged"], counters["hedge_wins"]), (1, 1))
+
+    def test_stream_fails_over_before_first_token(self):
+        router = LLMRouter([StubProvider("down", fail=True), StubProvider("up")], hedge=False)
+
+        async def collect():
+            return [delta async for delta in router.astream_response(MESSAGES)]
+
+        self.assertEqual(asyncio.run(collect()), ["answer from up"])
+
+    def test_tiered_calls_keep_every_backend(self):
+        groq = StubProvider("groq", fail=True, provider="GroqProvider", default_model=tier_model("small"))
+        openai = StubProvider("openai", provider="OpenAIProvider", default_model="gpt-4o-mini")
+        other = StubProvider("other", provider="LocalProvider")
+        router = LLMRouter([groq, openai, other], hedge=False)
+
+        # Groq and OpenAI each get their own large model; the unmapped backend follows on its default
+        self.assertEqual(router._ranked(tier_model("large")), [(0, tier_model("large")), (1, "gpt-4o"), (2, None)])
+        self.assertEqual(router.generate_response(MESSAGES, model=tier_model("large")), "answer from openai")
+        self.assertEqual((groq.models, openai.models), ([tier_model("large")], ["gpt-4o"]))
+
+        async def small():
+            return await router.agenerate_response(MESSAGES, model=tier_model("small"))
+        self.assertEqual(asyncio.run(small()), "answer from openai")
+        self.assertEqual(openai.models[-1], "gpt-4o-mini")
+
+        openai.fail = True
+        self.assertEqual(router.generate_response(MESSAGES, model=tier_model("large")), "answer from other")
+        self.assertEqual(other.models, [None])
+
+if __name__ == "__main__":
+    unittest.main()
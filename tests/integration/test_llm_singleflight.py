@@ -0,0 +1,95 @@
+import asyncio
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from orchestrator.src.core.llm_provider import BaseLLMProvider
+from orchestrator.src.core.llm_singleflight import CoalescingLLMProvider
+
+MESSAGES = [{"role": "user", "content": "Summarize the quarter."}]
+
+class SlowProvider(BaseLLMProvider):
+    default_model = "m"
+
+    def __init__(self, fail: bool = False):
+        self.calls = 0
+        self.fail = fail
+        self._lock = threading.Lock()
+
+    def generate_response(self, messages, model=None, temperature=0.7, max_tokens=None):
+        with self._lock:
+            self.calls += 1
+        time.sleep(0.05)
+        if self.fail:
+            raise RuntimeError("upstream down")
+        return f"answer for {messages[-1]['content']}"
+
+    async def agenerate_response(self, messages, model=None, temperature=0.7, max_tokens=None):
+        self.calls += 1
+        await asyncio.sleep(0.05)
+        if self.fail:
+            raise RuntimeError("upstream down")
+        return f"answer for {messages[-1]['content']}"
+
+class TestSingleFlight(unittest.TestCase):
+
+    def test_thread_callers_share_one_call(self):
+        inner = SlowProvider()
+        provider = CoalescingLLMProvider(inner)
+        with ThreadPoolExecutor(8) as pool:
+            out = list(pool.map(lambda _: provider.generate_response(MESSAGES), range(8)))
+        self.assertEqual(set(out), {"answer for Summarize the quarter."})
+        self.assertEqual(inner.calls, 1)
+        stats = provider.stats()["singleflight"]
+        self.assertEqual((stats["leaders"], stats["coalesced"], stats["in_flight"]), (1, 7, 0))
+
+        # Different parameters are different requests
+        provider.generate_response(MESSAGES, temperature=0.1)
+        self.assertEqual(inner.calls, 2)
+
+    def test_async_callers_share_one_call(self):
+        inner = SlowProvider()
+        provider = CoalescingLLMProvider(inner)
+
+        async def run():
+            return await asyncio.gather(*[provider.agenerate_response(MESSAGES) for _ in range(10)])
+
+        self.assertEqual(len(set(asyncio.run(run()))), 1)
+        self.assertEqual(inner.calls, 1)
+        self.assertEqual(provider.stats()["singleflight"]["coalesced"], 9)
+
+    def test_errors_reach_every_waiter(self):
+        inner = SlowProvider(fail=True)
+        provider = CoalescingLLMProvider(inner)
+
+        def call(_):
+            try:
+                provider.generate_response(MESSAGES)
+            except RuntimeError as e:
+                return str(e)
+
+        with ThreadPoolExecutor(4) as pool:
+            self.assertEqual(list(pool.map(call, range(4))), ["upstream down"] * 4)
+
+        async def run():
+            return await asyncio.gather(*[provider.agenerate_response(MESSAGES) for _ in range(3)], return_exceptions=True)
+
+        self.assertTrue(all(isinstance(e, RuntimeError) for e in asyncio.run(run())))
+        self.assertEqual(inner.calls, 2)
+
+    def test_cancelled_waiter_leaves_shared_call_running(self):
+        inner = SlowProvider()
+        provider = CoalescingLLMProvider(inner)
+
+        async def run():
+            first = asyncio.create_task(provider.agenerate_response(MESSAGES))
+            second = asyncio.create_task(provider.agenerate_response(MESSAGES))
+            await asyncio.sleep(0.01)
+            first.cancel()
+            return await second
+
+        self.assertEqual(asyncio.run(run()), "answer for Summarize the quarter.")
+        self.assertEqual(inner.calls, 1)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,109 @@
+import os
+import json
+import asyncio
+import shutil
+import tempfile
+import unittest
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+from fastapi.testclient import TestClient
+from orchestrator.src.core.api import app
+from orchestrator.src.core.agent import Agent
+from orchestrator.src.core.llm_cache import CachedLLMProvider, ResponseCache
+from orchestrator.src.core.llm_provider import BaseLLMProvider, GroqProvider, MockResponse
+from orchestrator.src.core.llm_ratelimit import RateLimiter
+from orchestrator.src.validation.schemas import AgentConfig, TaskSpec
+
+MESSAGES = [{"role": "user", "content": "Plan the launch."}]
+PLAN = '{"reasoning": "streamed plan", "steps": []}'
+
+class ChunkedProvider(BaseLLMProvider):
+    default_model = "m"
+
+    def __init__(self):
+        self.calls = 0
+
+    def generate_response(self, messages, model=None, temperature=0.7, max_tokens=None):
+        return PLAN
+
+    async def astream_response(self, messages, model=None, temperature=0.7, max_tokens=None):
+        self.calls += 1
+        for i in range(0, len(PLAN), 8):
+            yield PLAN[i:i + 8]
+
+def chunk(text, usage=None):
+    return SimpleNamespace(
+        choices=[SimpleNamespace(delta=SimpleNamespace(content=text))],
+        x_groq=SimpleNamespace(usage=usage) if usage else None,
+    )
+
+async def collect(stream):
+    return [piece async for piece in stream]
+
+class TestStreaming(unittest.TestCase):
+
+    def test_groq_streams_deltas(self):
+        provider = GroqProvider(api_key="test-key", limiter=RateLimiter(600, 100000))
+        seen = {}
+
+        async def run():
+            async def create(**kwargs):
+                seen.update(kwargs)
+
+                async def chunks():
+                    for piece in ["Hel", "lo", None]:
+                        yield chunk(piece)
+                    yield SimpleNamespace(choices=[], x_groq=SimpleNamespace(usage=SimpleNamespace(total_tokens=12)))
+                return chunks()
+
+            provider._pool().client.chat.completions.create = create
+            try:
+                return await collect(provider.astream_response(MESSAGES))
+            finally:
+                await provider.aclose()
+
+        self.assertEqual(asyncio.run(run()), ["Hel", "lo"])
+        self.assertTrue(seen["stream"])
+
+    def test_mock_mode_streams_in_pieces(self):
+        pieces = asyncio.run(collect(GroqProvider(api_key="placeholder").astream_response([{"role": "user", "content": "analyze x"}])))
+        self.assertGreater(len(pieces), 5)
+        self.assertTrue(all(isinstance(p, MockResponse) for p in pieces))
+        self.assertIn("reasoning", json.loads("".join(pieces)))
+
+    def test_cache_replays_a_finished_stream(self):
+        root = tempfile.mkdtemp()
+        try:
+            inner = ChunkedProvider()
+            provider = CachedLLMProvider(inner, ResponseCache(os.path.join(root, "cache.sqlite3")))
+            first = asyncio.run(collect(provider.astream_response(MESSAGES)))
+            second = asyncio.run(collect(provider.astream_response(MESSAGES)))
+            self.assertGreater(len(first), 1)
+            self.assertEqual(second, [PLAN])
+            self.assertEqual(inner.calls, 1)
+        finally:
+            shutil.rmtree(root)
+
+    def test_agent_emits_tokens_before_result(self):
+        memory = MagicMock()
+        memory.search.return_value = []
+        config = AgentConfig(id="unit_1", name="Unit", role="tester", description="d", system_prompt="You test.", allowed_tool_ids=[])
+        agent = Agent(config, [], memory, ChunkedProvider())
+
+        events = asyncio.run(collect(agent.astream_task(TaskSpec(project_id="p", description="plan"))))
+        statuses = [e["status"] for e in events]
+        self.assertEqual(statuses[-2:], ["executing", "result"])
+        self.assertEqual("".join(e["delta"] for e in events if e["status"] == "token"), PLAN)
+        self.assertEqual(events[-1]["result"]["reasoning"], "streamed plan")
+
+    def test_sse_endpoint(self):
+        with TestClient(app).stream("GET", "/api/tasks/stream", params={"description": "Summarize the roadmap"}) as response:
+            self.assertEqual(response.status_code, 200)
+            self.assertTrue(response.headers["content-type"].startswith("text/event-stream"))
+            events = [line[len("event: "):] for line in response.iter_lines() if line.startswith("event: ")]
+        self.assertEqual(events[0], "routing")
+        self.assertIn("token", events)
+        self.assertEqual(events[-1], "completed")
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,131 @@
+import asyncio
+import unittest
+from unittest.mock import MagicMock, patch
+from orchestrator.src.core.agent import Agent
+from orchestrator.src.core.config import settings
+from orchestrator.src.core.llm_provider import BaseLLMProvider, MockResponse
+from orchestrator.src.core.llm_router import LLMRouter
+from orchestrator.src.core.model_tiers import TaskClassifier, MeteredLLMProvider, SIMPLE, COMPLEX, call_cost, tier_model
+from orchestrator.src.core.tokenizer import count_tokens, count_message_tokens
+from orchestrator.src.validation.schemas import AgentConfig, TaskSpec
+
+PLAN = '{"reasoning": "ok", "steps": []}'
+
+class RecordingProvider(BaseLLMProvider):
+    default_model = "llama-3.1-8b-instant"
+
+    def __init__(self, answer: str = PLAN):
+        self.answer = answer
+        self.models = []
+
+    def generate_response(self, messages, model=None, temperature=0.7, max_tokens=None):
+        self.models.append(model)
+        return self.answer
+
+class TestTaskClassifier(unittest.TestCase):
+
+    def test_routes_by_keyword_score(self):
+        classifier = TaskClassifier()
+        self.assertEqual(classifier.route("Build project Chimera"), ("ALPHA", 1.0))
+        self.assertEqual(classifier.route("Post to socials")[0], "BETA")
+        self.assertEqual(classifier.route("Review the quarterly numbers"), ("GAMMA", 0.0))
+        # Scores, not first match: two marketing hits outweigh one engineering hit
+        cell, confidence = classifier.route("Build a social campaign")
+        self.assertEqual(cell, "BETA")
+        self.assertAlmostEqual(confidence, 0.5)
+        # Word prefixes, not substrings: "prefix" is not a fix
+        self.assertEqual(classifier.route("Rename the prefix")[0], "GAMMA")
+
+    def test_llm_mode_only_consults_the_model_when_unsure(self):
+        provider = RecordingProvider("BETA")
+        classifier = TaskClassifier(provider, mode="llm", min_confidence=0.5)
+        self.assertEqual(asyncio.run(classifier.aroute("Build the API")), ("ALPHA", 1.0))
+        self.assertEqual(provider.models, [])
+        self.assertEqual(asyncio.run(classifier.aroute("Tell customers about the launch")), ("BETA", 1.0))
+        self.assertEqual(provider.models, [tier_model("small")])
+
+        mock = TaskClassifier(RecordingProvider(MockResponse("BETA")), mode="llm")
+        self.assertEqual(asyncio.run(mock.aroute("Tell customers about the launch")), ("GAMMA", 0.0))
+
+    @patch.object(settings, "LLM_TIERING_ENABLED", True)
+    def test_triage_and_cell_tiers(self):
+        classifier = TaskClassifier()
+        self.assertEqual(classifier.triage("Build project Chimera"), SIMPLE)
+        self.assertEqual(classifier.triage("Analyze the strategic implications of AI"), COMPLEX)
+        self.assertEqual(classifier.triage("Scaffold the repo, then add CI and deploy it"), COMPLEX)
+
+        self.assertEqual(classifier.plan_model("ALPHA", "Build project Chimera"), ("small", tier_model("small")))
+        self.assertEqual(classifier.plan_model("GAMMA", "Analyze the pricing strategy"), ("large", tier_model("large")))
+        with patch.object(settings, "LLM_CELL_TIERS", {"GAMMA": {"complex": "small"}}):
+            self.assertEqual(classifier.plan_model("GAMMA", "Analyze the pricing strategy")[0], "small")
+        with patch.object(settings, "LLM_TIERING_ENABLED", False):
+            self.assertEqual(classifier.plan_model("GAMMA", "Analyze the pricing strategy"), ("default", None))
+        self.assertEqual(classifier.stats()[COMPLEX], 4)
+
+    def test_small_tier_follows_groq_model_and_tiering_ships_off(self):
+        self.assertFalse(type(settings)().LLM_TIERING_ENABLED)
+        self.assertEqual(TaskClassifier().plan_model("GAMMA", "Analyze the pricing strategy"), ("default", None))
+        with patch.object(settings, "GROQ_MODEL", "llama-3.1-70b-custom"):
+            self.assertEqual(tier_model("small"), "llama-3.1-70b-custom")
+
+class TestMeteredLLMProvider(unittest.TestCase):
+
+    def test_reports_cost_and_savings_per_tier(self):
+        provider = MeteredLLMProvider(RecordingProvider())
+        messages = [{"role": "user", "content": "Plan it."}]
+        provider.generate_response(messages, model=tier_model("small"))
+        provider.generate_response(messages, model=tier_model("large"))
+        provider.generate_response(messages)  # backend default is the small model
+
+        prompt, completion = count_message_tokens(messages), count_tokens(PLAN)
+        tiers = provider.stats()["tiers"]
+        self.assertEqual(tiers["small"]["calls"], 2)
+        self.assertEqual(tiers["small"]["prompt_tokens"], 2 * prompt)
+        self.assertAlmostEqual(tiers["small"]["cost_usd"], round(2 * call_cost(tier_model("small"), prompt, completion), 6))
+        # Baseline is the pre-tiering default (GROQ_MODEL): the small tier saves nothing, the large one costs more
+        self.assertEqual(tiers["small"]["savings_usd"], 0)
+        self.assertLess(tiers["large"]["savings_usd"], 0)
+        self.assertAlmostEqual(tiers["large"]["baseline_cost_usd"], round(call_cost(settings.GROQ_MODEL, prompt, completion), 6))
+        self.assertIsNotNone(tiers["large"]["p50_ms"])
+
+    def test_mock_output_is_counted_but_not_priced(self):
+        provider = MeteredLLMProvider(RecordingProvider(MockResponse(PLAN)))
+        provider.generate_response([{"role": "user", "content": "Plan it."}], model=tier_model("large"))
+        large = provider.stats()["tiers"]["large"]
+        self.assertEqual((large["calls"], large["mock"], large["cost_usd"]), (1, 1, 0))
+
+    def test_failover_is_priced_at_the_serving_backend(self):
+        class GroqProvider(RecordingProvider):
+            name = "GroqProvider"
+
+            def generate_response(self, messages, model=None, temperature=0.7, max_tokens=None):
+                raise RuntimeError("groq down")
+
+        class OpenAIProvider(RecordingProvider):
+            name = "OpenAIProvider"
+            default_model = "gpt-4o-mini"
+
+        openai = OpenAIProvider()
+        provider = MeteredLLMProvider(LLMRouter([GroqProvider(), openai], hedge=False))
+        messages = [{"role": "user", "content": "Plan it."}]
+        provider.generate_response(messages, model=tier_model("large"))
+        asyncio.run(provider.agenerate_response(messages, model=tier_model("small")))
+
+        self.assertEqual(openai.models, ["gpt-4o", "gpt-4o-mini"])
+        prompt, completion = count_message_tokens(messages), count_tokens(PLAN)
+        tiers = provider.stats()["tiers"]
+        self.assertAlmostEqual(tiers["large"]["cost_usd"], round(call_cost("gpt-4o", prompt, completion), 6))
+        self.assertAlmostEqual(tiers["small"]["cost_usd"], round(call_cost("gpt-4o-mini", prompt, completion), 6))
+
+    def test_agent_plans_with_the_chosen_model(self):
+        memory = MagicMock()
+        memory.search.return_value = []
+        config = AgentConfig(id="unit_1", name="Unit", role="tester", description="d", system_prompt="You test.", allowed_tool_ids=[])
+        provider = RecordingProvider()
+        agent = Agent(config, [], memory, provider)
+        agent.process_task(TaskSpec(project_id="p", description="go"), tier_model("large"))
+        asyncio.run(agent.aprocess_task(TaskSpec(project_id="p", description="go")))
+        self.assertEqual(provider.models, [tier_model("large"), None])
+
+if __name__ == "__main__":
+    unittest.main()
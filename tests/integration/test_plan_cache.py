@@ -0,0 +1,89 @@
+import json
+import asyncio
+import unittest
+from unittest.mock import MagicMock
+from orchestrator.src.core.agent import Agent
+from orchestrator.src.core.llm_provider import BaseLLMProvider, MockResponse
+from orchestrator.src.core.plan_cache import PlanCache
+from orchestrator.src.validation.schemas import AgentConfig, TaskSpec
+
+def cover(topic):
+    return f"Generate a futuristic cover image for a blog post about {topic}"
+
+def cover_plan(topic):
+    return {
+        "reasoning": f"A cover for the {topic} post",
+        "steps": [{"tool_id": "image_gen", "inputs": {"prompt": f"Futuristic blog cover about {topic}"}}],
+    }
+
+class PlanningProvider(BaseLLMProvider):
+    """Writes the cover plan for whatever topic the task names."""
+
+    def __init__(self, mock: bool = False):
+        self.calls = 0
+        self.mock = mock
+
+    def generate_response(self, messages, model=None, temperature=0.7, max_tokens=None):
+        self.calls += 1
+        topic = messages[-1]["content"].rsplit("about ", 1)[-1]
+        text = json.dumps(cover_plan(topic))
+        return MockResponse(text) if self.mock else text
+
+class TestPlanCache(unittest.TestCase):
+
+    def setUp(self):
+        self.cache = PlanCache(min_similarity=0.8, max_params=3, max_items=16, ttl=60)
+        self.cache.put("tools", cover("AI agents"), cover_plan("AI agents"))
+
+    def test_similar_task_gets_substituted_plan(self):
+        plan = self.cache.get("tools", cover("quantum computing"))
+        self.assertEqual(plan, cover_plan("quantum computing"))
+        self.assertEqual(self.cache.stats()["similar_hits"], 1)
+        # Same template, other tool set: no reuse
+        self.assertIsNone(self.cache.get("other tools", cover("quantum computing")))
+
+    def test_literal_slots_substitute_numbers_and_quotes(self):
+        self.cache.put("tools", 'Design 3 logos for "Acme"', {"steps": [{"tool_id": "image_gen", "inputs": {"count": 3, "prompt": "Logo for Acme"}}]})
+        plan = self.cache.get("tools", 'Design 5 logos for "Globex Corp"')
+        self.assertEqual(plan["steps"][0]["inputs"], {"count": 5, "prompt": "Logo for Globex Corp"})
+        self.assertEqual(self.cache.stats()["exact_hits"], 1)
+
+    def test_unsafe_matches_are_refused(self):
+        # Too different
+        self.assertIsNone(self.cache.get("tools", "Summarize the quarterly revenue report"))
+        # Structure changed (a word inserted), not a parameter swapped
+        self.assertIsNone(self.cache.get("tools", "Generate a futuristic cover image for a blog post not about AI agents"))
+        # The differing word chose the tool
+        self.cache.put("tools", "Post the launch announcement to LinkedIn", {"steps": [{"tool_id": "linkedin_post", "inputs": {"message": "We launched"}}]})
+        self.assertIsNone(self.cache.get("tools", "Post the launch announcement to Facebook"))
+        # The plan never mentions the old value, so it cannot be rewritten
+        self.cache.put("tools", "Write the weekly digest for the sales team", {"steps": [{"tool_id": "file", "inputs": {"path": "digest.md"}}]})
+        self.assertIsNone(self.cache.get("tools", "Write the weekly digest for the legal team"))
+        self.assertEqual(self.cache.stats()["similar_hits"], 0)
+
+class TestAgentPlanReuse(unittest.TestCase):
+
+    def agent(self, provider, cache):
+        memory = MagicMock()
+        memory.search.return_value = []
+        config = AgentConfig(id="unit_1", name="Unit", role="tester", description="d", system_prompt="You test.", allowed_tool_ids=[])
+        return Agent(config, [], memory, provider, cache)
+
+    def test_recurring_task_skips_the_llm(self):
+        provider, cache = PlanningProvider(), PlanCache(min_similarity=0.8)
+        agent = self.agent(provider, cache)
+        agent.process_task(TaskSpec(project_id="p", description=cover("AI agents")))
+        result = asyncio.run(agent.aprocess_task(TaskSpec(project_id="p", description=cover("edge computing"))))
+        self.assertEqual(provider.calls, 1)
+        self.assertEqual(result["reasoning"], "A cover for the edge computing post")
+
+    def test_mock_plans_are_not_cached(self):
+        provider, cache = PlanningProvider(mock=True), PlanCache(min_similarity=0.8)
+        agent = self.agent(provider, cache)
+        for _ in range(2):
+            agent.process_task(TaskSpec(project_id="p", description=cover("AI agents")))
+        self.assertEqual(provider.calls, 2)
+        self.assertEqual(cache.stats()["stores"], 0)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,97 @@
+import time
+import threading
+import unittest
+from unittest.mock import MagicMock
+from orchestrator.src.core.agent import Agent
+from orchestrator.src.core.plan_dag import step_dependencies, execute_steps
+from orchestrator.src.tools.base import BaseTool
+from orchestrator.src.validation.schemas import AgentConfig, ToolConfig
+
+class SleepTool(BaseTool):
+    """Sleeps for inputs["seconds"]; fails when inputs["fail"] is set."""
+
+    def __init__(self, tool_id: str):
+        super().__init__(ToolConfig(tool_id=tool_id, name=tool_id, description="sleeps", parameters_schema={}, allowed_agents=["*"]))
+        self.threads = set()
+
+    def execute(self, inputs):
+        self.threads.add(threading.get_ident())
+        time.sleep(inputs.get("seconds", 0))
+        if inputs.get("fail"):
+            raise RuntimeError("tool broke")
+        return {"slept": inputs.get("seconds", 0)}
+
+def make_agent(*tools):
+    config = AgentConfig(id="unit_1", name="Unit", role="tester", description="d", system_prompt="You test.", allowed_tool_ids=[])
+    return Agent(config, list(tools), MagicMock(), MagicMock())
+
+class TestStepDependencies(unittest.TestCase):
+
+    def test_parses_ids_and_rejects_bad_graphs(self):
+        self.assertIsNone(step_dependencies([{"tool_id": "a"}, {"tool_id": "b"}]))
+        steps = [{"id": "search"}, {"id": "image"}, {"id": "seo", "depends_on": ["search", "image"]}, {"depends_on": "seo"}]
+        self.assertEqual(step_dependencies(steps), [[], [], [0, 1], [2]])
+        with self.assertRaises(ValueError):
+            step_dependencies([{"id": "a", "depends_on": ["b"]}, {"id": "b", "depends_on": ["a"]}])
+        with self.assertRaises(ValueError):
+            step_dependencies([{"id": "a", "depends_on": ["missing"]}])
+        with self.assertRaises(ValueError):
+            step_dependencies([{"id": "a"}, {"id": "a", "depends_on": []}])
+
+class TestParallelPlans(unittest.TestCase):
+
+    def test_independent_steps_overlap_and_keep_plan_order(self):
+        search, image, seo = SleepTool("search"), SleepTool("image_gen"), SleepTool("seo")
+        agent = make_agent(search, image, seo)
+        plan = {"steps": [
+            {"id": "search", "tool_id": "search", "inputs": {"seconds": 0.1}, "depends_on": []},
+            {"id": "image", "tool_id": "image_gen", "inputs": {"seconds": 0.1}, "depends_on": []},
+            {"id": "seo", "tool_id": "seo", "inputs": {"seconds": 0.02}, "depends_on": ["search", "image"]},
+        ]}
+        results, timings = agent._execute_plan(plan)
+
+        self.assertEqual([r["tool_id"] for r in results], ["search", "image_gen", "seo"])
+        self.assertTrue(all(r["status"] == "success" and r["integrity_hash"] for r in results))
+        self.assertTrue(timings["parallel"])
+        self.assertLess(timings["wall_ms"], 190)
+        self.assertGreaterEqual(timings["serial_ms"], 220)
+        by_step = {t["step"]: t for t in timings["steps"]}
+        self.assertLess(by_step["image"]["start_ms"], by_step["search"]["start_ms"] + by_step["search"]["duration_ms"])
+        for dep in ("search", "image"):
+            self.assertGreaterEqual(by_step["seo"]["start_ms"], by_step[dep]["start_ms"] + by_step[dep]["duration_ms"] - 1)
+
+    def test_dependents_of_a_failed_step_are_skipped(self):
+        agent = make_agent(SleepTool("scrape"), SleepTool("shard"), SleepTool("search"))
+        plan = {"steps": [
+            {"id": "scrape", "tool_id": "scrape", "inputs": {"fail": True}, "depends_on": []},
+            {"id": "shard", "tool_id": "shard", "inputs": {}, "depends_on": ["scrape"]},
+            {"id": "search", "tool_id": "search", "inputs": {}, "depends_on": []},
+        ]}
+        results, _ = agent._execute_plan(plan)
+        self.assertEqual([r["status"] for r in results], ["failure", "failure", "success"])
+        self.assertIn("scrape", results[1]["error_message"])
+
+    def test_plans_without_dependencies_run_in_order_on_the_caller(self):
+        tool = SleepTool("file")
+        agent = make_agent(tool)
+        plan = {"steps": [{"tool_id": "file", "inputs": {}}, {"tool_id": "missing"}, {"tool_id": "file", "inputs": {}}]}
+        results, timings = agent._execute_plan(plan)
+        self.assertEqual(len(results), 2)
+        self.assertFalse(timings["parallel"])
+        self.assertEqual(tool.threads, {threading.get_ident()})
+        self.assertEqual([t["status"] for t in timings["steps"]], ["success", "skipped", "success"])
+
+    def test_runner_sees_steps_in_dependency_order(self):
+        order = []
+        steps = [{"id": str(i), "depends_on": [str(i - 1)] if i else []} for i in range(5)]
+
+        def run(step, failed):
+            order.append(step["id"])
+            return {"status": "success"}
+
+        results, _ = execute_steps(list(reversed(steps)), run)
+        self.assertEqual(order, ["0", "1", "2", "3", "4"])
+        self.assertEqual(len(results), 5)
+
+if __name__ == "__main__":
+    unittest.main()
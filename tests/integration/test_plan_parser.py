@@ -0,0 +1,100 @@
+import json
+import unittest
+from unittest.mock import patch, MagicMock
+from orchestrator.src.core import plan_parser
+from orchestrator.src.core.agent import Agent
+from orchestrator.src.core.plan_parser import parse_plan, validate_plan, validate_step, PlanParseError, PlanValidationError
+from orchestrator.src.validation.schemas import AgentConfig
+
+PLAN = {
+    "reasoning": "search then optimize",
+    "steps": [
+        {"id": "search", "tool_id": "search", "inputs": {"query": "use {braces} and \"quotes\""}},
+        {"id": "seo", "tool_id": "seo", "inputs": {"content": "x"}, "depends_on": ["search"]},
+    ],
+}
+BODY = json.dumps(PLAN, indent=2)
+
+class TestPlanExtraction(unittest.TestCase):
+
+    def test_common_wrappings(self):
+        for text in (
+            BODY,
+            f"```json\n{BODY}\n```",
+            f"Here is the plan:\n{BODY}\nHope this helps!",
+            f"I'll replace the {{topic}} placeholder.\n{BODY}",
+            f"{BODY}\nOr, more cautiously: {json.dumps({'reasoning': 'other', 'steps': []})}",
+            f'{{"note": "not a plan"}} {BODY}',
+        ):
+            with self.subTest(text=text[:40]):
+                self.assertEqual(parse_plan(text), PLAN)
+
+    def test_repairs_trailing_commas_and_truncation(self):
+        self.assertEqual(parse_plan(BODY.replace("\n  ]\n}", ",\n  ],\n}")), PLAN)
+
+        cut = BODY[: BODY.index('"seo"', BODY.index('"id": "seo"') + 12) + 3]  # ends inside the seo tool_id
+        plan = parse_plan("Plan: " + cut)
+        self.assertEqual(plan["steps"][0], PLAN["steps"][0])
+        self.assertEqual(plan["steps"][1]["tool_id"], "se")
+
+        # Cut off right after an escape character: the dangling backslash is dropped
+        plan = parse_plan('{"reasoning": "a \\')
+        self.assertEqual(plan, {"reasoning": "a ", "steps": []})
+
+    def test_unreadable_output_raises(self):
+        for text in ("no json here", "{not json at all}", '{"answer": 42}', "[1, 2, 3]"):
+            with self.subTest(text=text):
+                with self.assertRaises(PlanParseError):
+                    parse_plan(text)
+
+    def test_stdlib_backend_gives_the_same_plans(self):
+        with patch.object(plan_parser, "orjson", None):
+            self.assertEqual(parse_plan(f"```json\n{BODY}\n```"), PLAN)
+            self.assertEqual(parse_plan(BODY[:-1] + ",}"), PLAN)
+
+class TestPlanValidation(unittest.TestCase):
+
+    def test_normalizes_and_drops_invalid_steps(self):
+        plan = parse_plan(json.dumps({"reasoning": 7, "steps": [
+            {"id": 1, "tool_id": "search", "depends_on": 0},
+            {"inputs": {"query": "no tool"}},
+            "not a step",
+            {"tool_id": "seo", "inputs": None, "depends_on": [1, "search"]},
+            {"tool_id": ["bad"]},
+        ]}))
+        self.assertEqual(plan, {"reasoning": "7", "steps": [
+            {"id": "1", "tool_id": "search", "inputs": {}, "depends_on": ["0"]},
+            {"tool_id": "seo", "inputs": {}, "depends_on": ["1", "search"]},
+        ]})
+        self.assertEqual(parse_plan('{"reasoning": "nothing to do"}'), {"reasoning": "nothing to do", "steps": []})
+
+    def test_errors_name_the_offending_field(self):
+        with self.assertRaises(PlanValidationError) as ctx:
+            validate_step({"tool_id": "b", "depends_on": [{"x": 1}]}, "plan.steps[1]")
+        self.assertEqual(ctx.exception.path, "plan.steps[1].depends_on[0]")
+        with self.assertRaises(PlanValidationError) as ctx:
+            validate_plan({"steps": "search"})
+        self.assertEqual(str(ctx.exception), "plan.steps: expected a list, got str")
+
+        with self.assertLogs(plan_parser.logger, "WARNING") as logs:
+            plan = validate_plan({"steps": [{"tool_id": "a"}, {"id": "x"}, {"tool_id": 3}]})
+        self.assertEqual(plan["steps"], [{"tool_id": "a", "inputs": {}}])
+        self.assertEqual(len(logs.records), 1)
+        self.assertIn("plan.steps[1].tool_id: required; plan.steps[2].tool_id: expected a string, got int", logs.output[0])
+
+    def test_valid_plans_are_not_copied(self):
+        plan = {"steps": [{"tool_id": "a", "inputs": {}, "depends_on": ["b"]}]}
+        steps = plan["steps"]
+        self.assertIs(validate_plan(plan), plan)
+        self.assertIs(plan["steps"], steps)
+
+class TestAgentPlanParsing(unittest.TestCase):
+
+    def test_agent_uses_parser_and_falls_back_to_empty_plan(self):
+        config = AgentConfig(id="unit_1", name="Unit", role="tester", description="d", system_prompt="You test.", allowed_tool_ids=[])
+        agent = Agent(config, [], MagicMock(), MagicMock())
+        self.assertEqual(agent._parse_plan(f"Sure! {{draft}}\n{BODY}"), PLAN)
+        self.assertEqual(agent._parse_plan("I cannot help with that."), {"steps": [], "reasoning": "Failed to parse plan."})
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,77 @@
+import unittest
+from unittest.mock import MagicMock
+from orchestrator.src.core.agent import Agent
+from orchestrator.src.core.llm_provider import BaseLLMProvider
+from orchestrator.src.core.orchestrator import SovereignCell
+from orchestrator.src.core.prompt_builder import PromptBuilder, dedupe_snippets
+from orchestrator.src.core.tokenizer import count_tokens, count_message_tokens
+from orchestrator.src.validation.schemas import AgentConfig, TaskSpec
+
+class PlanProvider(BaseLLMProvider):
+    default_model = "m"
+
+    def __init__(self):
+        self.messages = None
+
+    def generate_response(self, messages, model=None, temperature=0.7, max_tokens=None):
+        self.messages = messages
+        return '{"reasoning": "ok", "steps": []}'
+
+class TestTokenizer(unittest.TestCase):
+
+    def test_counts_bpe_like_pieces(self):
+        self.assertEqual(count_tokens(""), 0)
+        self.assertEqual(count_tokens("Hello, world!"), 4)
+        self.assertEqual(count_tokens("internationalization"), 2)
+        self.assertEqual(count_tokens("1234567"), 3)
+        self.assertEqual(count_message_tokens([{"role": "user", "content": "Hello, world!"}]), 4 + 4 + 3)
+
+class TestPromptBuilder(unittest.TestCase):
+
+    def test_dedupes_ignoring_case_whitespace_and_containment(self):
+        kept, dropped = dedupe_snippets(["Task: launch the store", "task:  LAUNCH the store", "launch the store", "Revenue report"])
+        self.assertEqual(kept, ["Task: launch the store", "Revenue report"])
+        self.assertEqual(dropped, 2)
+
+    def test_trims_lowest_ranked_context_first(self):
+        snippets = [f"snippet {i} " + "word " * 40 for i in range(5)]
+        builder = PromptBuilder(budget=10000, context_budget=100)
+        messages, report = builder.build("You plan.", "Task: go", snippets)
+        system = messages[0]["content"]
+        self.assertIn("snippet 0", system)
+        self.assertIn("snippet 1", system)
+        self.assertNotIn("snippet 3", system)
+        self.assertLessEqual(report["context_tokens"], 100)
+        self.assertEqual(report["snippets_kept"] + report["snippets_dropped"], 5)
+        self.assertEqual(report["prompt_tokens"], count_message_tokens(messages))
+
+        # The whole prompt budget binds too, not only the context cap
+        _, tight = PromptBuilder(budget=60, context_budget=1000).build("You plan.", "Task: go", snippets)
+        self.assertLessEqual(tight["prompt_tokens"], 60)
+
+    def test_empty_context(self):
+        messages, report = PromptBuilder().build("You plan.", "Task: go", [])
+        self.assertTrue(messages[0]["content"].endswith("No specific context found."))
+        self.assertEqual(report["snippets_kept"], 0)
+
+class TestTokenAccounting(unittest.TestCase):
+
+    def test_agent_and_cell_totals(self):
+        memory = MagicMock()
+        memory.search.return_value = [{"text": "Task: audit revenue"}] * 4 + [{"text": "Ledger verified"}]
+        config = AgentConfig(id="unit_1", name="Unit", role="tester", description="d", system_prompt="You test.", allowed_tool_ids=[])
+        provider = PlanProvider()
+        agent = Agent(config, [], memory, provider)
+        cell = SovereignCell("TEST", [agent])
+
+        for _ in range(2):
+            self.assertEqual(agent.process_task(TaskSpec(project_id="p", description="audit revenue"))["status"], "completed")
+        self.assertEqual(provider.messages[0]["content"].count("Task: audit revenue"), 1)
+        usage = cell.token_usage()
+        self.assertEqual(usage["calls"], 2)
+        self.assertEqual(usage["duplicates"], 6)
+        self.assertEqual(usage["prompt_tokens"], 2 * count_message_tokens(provider.messages))
+        self.assertEqual(usage["completion_tokens"], 2 * count_tokens('{"reasoning": "ok", "steps": []}'))
+
+if __name__ == "__main__":
+    unittest.main()
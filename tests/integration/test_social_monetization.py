@@ -5,6 +5,7 @@ import json
 from orchestrator.src.tools.social_tools import FacebookPostTool, LinkedInPostTool, SocialMediaMultiplexer
 from orchestrator.src.tools.marketing_check import check_marketing_readiness
 from orchestrator.src.core.alchemy_engine import generate_autonomous_blog_post
+from orchestrator.src.core.blog.index import get_post_index
 
 class TestSocialMonetization(unittest.TestCase):
     
@@ -76,7 +77,7 @@ class TestSocialMonetization(unittest.TestCase):
         slug = generate_autonomous_blog_post({"agent_id": "TEST_AGENT", "reasoning": "Test reasoning"})
         
         # Read the file
-        with open(f"data/blog/{slug}.md", "r") as f:
+        with open(os.path.join("data/blog", get_post_index().get(slug)["path"]), "r") as f:
             content = f.read()
             
         # Verify links exist
@@ -0,0 +1,101 @@
+import os
+import sqlite3
+import tempfile
+import unittest
+from orchestrator.src.tools.base import BaseTool
+from orchestrator.src.tools.result_cache import ToolResultCache
+from orchestrator.src.tools.universal_tools import get_multiplexer_tool
+from orchestrator.src.validation.schemas import ToolConfig, ToolInvocation
+
+class CountingTool(BaseTool):
+    cacheable = True
+
+    def __init__(self, tool_id="lookup", cache=None, cacheable=True):
+        super().__init__(ToolConfig(tool_id=tool_id, name=tool_id, description="counts", parameters_schema={}, allowed_agents=["*"]))
+        self.result_cache = cache
+        self.cacheable = cacheable
+        self.executions = 0
+
+    def execute(self, input_data):
+        self.executions += 1
+        if input_data.get("broken"):
+            return {"error": "upstream down"}
+        return {"answer": f"result for {input_data.get('query')}", "n": self.executions}
+
+def run(tool, **inputs):
+    return tool.run(ToolInvocation(tool_id=tool.config.tool_id, agent_id="unit_1", input_data=inputs))
+
+class TestToolResultCache(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.dir.name, "tools.sqlite3")
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def test_identical_inputs_reuse_the_output(self):
+        tool = CountingTool(cache=ToolResultCache(self.path, disk=False))
+        first = run(tool, query="ai", filters={"a": 1, "b": 2})
+        second = run(tool, filters={"b": 2, "a": 1}, query="ai")  # same inputs, other key order
+        self.assertEqual(tool.executions, 1)
+        self.assertEqual(second.status, "success")
+        self.assertEqual(second.output_data, first.output_data)
+        run(tool, query="quantum")
+        self.assertEqual(tool.executions, 2)
+
+        stats = tool.result_cache.stats()["tools"]["lookup"]
+        self.assertEqual((stats["hits"], stats["misses"], stats["stores"]), (1, 2, 2))
+        self.assertAlmostEqual(stats["hit_rate"], 1 / 3, places=3)
+
+    def test_errors_and_uncacheable_tools_always_run(self):
+        cache = ToolResultCache(self.path, disk=False)
+        tool = CountingTool(cache=cache)
+        run(tool, broken=True)
+        run(tool, broken=True)
+        self.assertEqual(tool.executions, 2)
+
+        plain = CountingTool("post", cache=cache, cacheable=False)
+        run(plain, query="x")
+        run(plain, query="x")
+        self.assertEqual(plain.executions, 2)
+
+    def test_multiplexer_caches_only_read_only_actions(self):
+        tool = get_multiplexer_tool()
+        tool.result_cache = ToolResultCache(self.path, disk=False)
+        for action in ("ssl_verify", "deploy_k8s", "refund_process"):
+            run(tool, action=action, params={"target": "prod"})
+            run(tool, action=action, params={"target": "prod"})
+        stats = tool.result_cache.stats()["tools"]["universal_action_multiplexer"]
+        self.assertEqual((stats["hits"], stats["stores"]), (1, 1))
+
+    def test_bounded_lru_and_ttl(self):
+        tool = CountingTool(cache=ToolResultCache(self.path, max_items=2, disk=False))
+        for query in ("a", "b", "c", "a"):
+            run(tool, query=query)
+        self.assertEqual(tool.executions, 4)  # "a" was evicted by "c"
+
+        tool.cache_ttl = 0
+        run(tool, query="fresh")
+        run(tool, query="fresh")
+        self.assertEqual(tool.executions, 6)
+
+    def test_disk_tier_survives_restart_and_rejects_tampering(self):
+        tool = CountingTool(cache=ToolResultCache(self.path, disk=True))
+        original = run(tool, query="ai").output_data
+
+        restarted = CountingTool(cache=ToolResultCache(self.path, disk=True))
+        self.assertEqual(run(restarted, query="ai").output_data, original)
+        self.assertEqual(restarted.executions, 0)
+
+        db = sqlite3.connect(self.path)
+        db.execute("UPDATE responses SET response = replace(response, 'result for ai', 'forged')")
+        db.commit()
+        db.close()
+        tampered = CountingTool(cache=ToolResultCache(self.path, disk=True))
+        self.assertEqual(run(tampered, query="ai").output_data["answer"], "result for ai")
+        self.assertEqual(tampered.executions, 1)
+        self.assertEqual(tampered.result_cache.stats()["corrupt"], 1)
+
+if __name__ == "__main__":
+    unittest.main()